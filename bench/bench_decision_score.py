@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+"""
+Benchmark: loop vs matrix (NumPy) scoring engine in arch_decision_score, plus the Pareto sort.
+
+Generates N synthetic options around the sample profile (cluster sizes / regions / brokers
+show up as metric spreads), scores them with both engines and checks the rankings match.
+
+Usage:
+  python bench/bench_decision_score.py [--n 100000] [--top-k 10] [--pareto]
+"""
+import argparse, pathlib, random, sys, time
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "tools"))
+import arch_decision_score as ads
+from req_io import load_yaml
+from synth import synth_options
+
+def timed(fn):
+    t0 = time.perf_counter(); out = fn(); return out, time.perf_counter() - t0
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=100_000)
+    ap.add_argument("--top-k", type=int, default=10)
+    ap.add_argument("--pareto", action="store_true", help="also time non-dominated sorting + crowding")
+    a = ap.parse_args()
+    prof = load_yaml(ROOT / "samples" / "decision" / "nfr_profile.yaml")
+    opts = synth_options(a.n, random.Random(42))
+    loop, t_loop = timed(lambda: ads.score_options(prof, opts))
+    full, t_mat = timed(lambda: ads.score_options_matrix(prof, opts))
+    top, t_top = timed(lambda: ads.score_options_matrix(prof, opts, a.top_k))
+    assert full == loop and top == loop[:a.top_k], "engines disagree"
+    print(f"{a.n} options × {len(prof['weights'])} metrics")
+    print(f"  loop engine          {t_loop:7.3f} s")
+    print(f"  matrix engine (all)  {t_mat:7.3f} s   ({t_loop / t_mat:.1f}x)")
+    print(f"  matrix engine top-{a.top_k:<3}{t_top:7.3f} s   ({t_loop / t_top:.1f}x)")
+    if a.pareto:
+        (par, _), t_par = timed(lambda: ads.pareto(prof, opts))
+        fronts = [p["pareto_front"] for p in par if p["pareto_front"]]
+        print(f"  pareto fronts        {t_par:7.3f} s   ({len(fronts)} feasible, {max(fronts, default=0)} fronts, "
+              f"{fronts.count(1)} non-dominated)")
+
+if __name__ == "__main__":
+    main()
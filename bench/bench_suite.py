@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+"""
+Benchmark suite: throughput and peak memory of every tool's CLI on synthetic corpora (see synth.py).
+
+Each (tool, size) runs in a fresh worker process, so peak RSS is the tool's own (interpreter and
+imports included). The best of --repeat runs is kept. Results are compared with bench/baselines.json:
+a case fails when its throughput drops, or its peak memory grows, beyond the thresholds.
+Throughput is compared after scaling by a CPU calibration loop (interleaved with the cases, best
+round kept), so baselines recorded on one machine stay usable on a faster or slower one; re-record
+with --update after an intended change.
+
+Usage:
+  python bench/bench_suite.py                                   # default sizes, compare with baselines
+  python bench/bench_suite.py --cases req_lint a2a_transform --sizes 100 10000 1000000
+  python bench/bench_suite.py --update                          # (re)record baselines for what ran
+"""
+import argparse, json, os, pathlib, runpy, subprocess, sys, tempfile, time
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+TOOLS = ROOT / "tools"
+BASELINES = ROOT / "bench" / "baselines.json"
+PROFILE = ROOT / "samples" / "decision" / "nfr_profile.yaml"
+
+# case -> (corpus kind, input suffix, argv for the tool given input path and a scratch dir)
+CASES = {
+    "req_extract": ("requirements", ".md", lambda p, d: [p, "--out", f"{d}/out.jsonl"]),
+    "req_validate": ("requirements", ".jsonl", lambda p, d: [p, "--schema", str(TOOLS / "req_schema.json")]),
+    "req_lint": ("requirements", ".jsonl", lambda p, d: [p, "--format", "json", "--output", f"{d}/lint.json"]),
+    "generate_mermaid_er": ("requirements", ".jsonl", lambda p, d: [p, "--out", f"{d}/er.mmd"]),
+    "arch_decision_score": ("options", ".yaml", lambda p, d: ["--profile", str(PROFILE), "--options", p, "--outdir", d]),
+    "adr_from_score": ("scores", ".jsonl", lambda p, d: ["--scores", p, "--outdir", d]),
+    "a2a_transform": ("brief", ".yaml", lambda p, d: [p, "--target-style", "microservices", "--outdir", d]),
+}
+DEFAULT_SIZES = [100, 1000, 10000]
+
+def worker(case, inp, scratch):
+    """Run one tool CLI in this process; print {"seconds", "peak_rss_mb", "exit"} as JSON."""
+    sys.path.insert(0, str(TOOLS))
+    from instrument import peak_rss_mb
+    sys.argv = [f"{case}.py", *CASES[case][2](inp, scratch)]
+    code = 0
+    t0 = time.perf_counter()
+    with open(os.devnull, "w") as null:
+        out, sys.stdout = sys.stdout, null
+        try:
+            runpy.run_path(str(TOOLS / f"{case}.py"), run_name="__main__")
+        except SystemExit as e:  # validators / linters exit non-zero when they find problems
+            code = e.code if isinstance(e.code, int) else 1
+        finally:
+            sys.stdout = out
+    print(json.dumps({"seconds": time.perf_counter() - t0, "peak_rss_mb": peak_rss_mb(), "exit": code}))
+
+def calibrate(rounds=3):
+    """Operations per second of a fixed pure-Python workload (best of rounds)."""
+    best = 0.0
+    for _ in range(rounds):
+        t0 = time.perf_counter(); d = {}
+        for i in range(200_000):
+            d[str(i % 5000)] = d.get(str(i % 5000), 0) + i
+        sorted(d.items(), key=lambda kv: kv[1])
+        best = max(best, 200_000 / (time.perf_counter() - t0))
+    return best
+
+def measure(case, size, inp, repeat):
+    runs = []
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as scratch:
+            out = subprocess.run([sys.executable, __file__, "--worker", case, str(inp), scratch],
+                                 capture_output=True, text=True, cwd=ROOT)
+            if out.returncode:
+                raise RuntimeError(f"{case} @ {size}: worker failed\n{out.stderr[-2000:]}")
+            runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    best = min(runs, key=lambda r: r["seconds"])
+    return {"seconds": round(best["seconds"], 4), "items_per_s": round(size / best["seconds"], 1),
+            "peak_rss_mb": round(min(r["peak_rss_mb"] for r in runs), 1)}
+
+def compare(cur, base, scale, threshold, mem_threshold, slack_s=0.05, slack_mb=2.0):
+    """(status, throughput ratio vs the scaled baseline) for one case/size. The absolute slacks keep
+    tiny corpora (dominated by interpreter start-up and imports) from flagging noise."""
+    if not base:
+        return "new", None
+    ratio = cur["items_per_s"] / (base["items_per_s"] * scale)
+    if ratio < 1 - threshold and cur["seconds"] - base["seconds"] / scale > slack_s:
+        return "SLOWER", ratio
+    if cur["peak_rss_mb"] > base["peak_rss_mb"] * (1 + mem_threshold) + slack_mb:
+        return "MORE MEMORY", ratio
+    return "ok", ratio
+
+def main():
+    ap = argparse.ArgumentParser(description="Throughput / peak-memory benchmarks for every tool")
+    ap.add_argument("--worker", nargs=3, metavar=("CASE", "INPUT", "SCRATCH"), help=argparse.SUPPRESS)
+    ap.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    ap.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES, help="corpus sizes (requirements / options / services)")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--threshold", type=float, default=0.4, help="fail when throughput drops by more than this fraction")
+    ap.add_argument("--mem-threshold", type=float, default=0.25, help="fail when peak RSS grows by more than this fraction")
+    ap.add_argument("--baselines", default=str(BASELINES))
+    ap.add_argument("--update", action="store_true", help="record the results as the new baselines")
+    a = ap.parse_args()
+    if a.worker:
+        return worker(*a.worker)
+
+    sys.path.insert(0, str(ROOT / "bench"))
+    import synth
+    bpath = pathlib.Path(a.baselines)
+    baselines = json.loads(bpath.read_text(encoding="utf-8")) if bpath.exists() else {"calibration": None, "results": {}}
+    results, cals = {}, []
+    with tempfile.TemporaryDirectory() as corpora:
+        inputs = {}
+        for case in a.cases:
+            kind, suffix, _ = CASES[case]
+            for n in a.sizes:
+                key = (kind, suffix, n)
+                if key not in inputs:
+                    inputs[key] = synth.WRITERS[kind](n, pathlib.Path(corpora) / f"{kind}-{n}{suffix}")
+                print(f"{case} @ {n:,} ...", file=sys.stderr, flush=True)
+                cals.append(calibrate())  # interleaved: the best of all rounds is the machine's speed
+                results.setdefault(case, {})[str(n)] = measure(case, n, inputs[key], a.repeat)
+
+    cal = max(cals)
+    scale = cal / baselines["calibration"] if baselines.get("calibration") else 1.0
+    print(f"calibration {cal:,.0f} ops/s" + (f" ({scale:.2f}x the baseline machine)" if baselines.get("calibration") else ""))
+    print(f"{'case':<22}{'size':>9}{'seconds':>10}{'items/s':>12}{'peak MB':>9}{'vs base':>9}  status")
+    failed = []
+    for case, sizes in results.items():
+        for n, cur in sizes.items():
+            status, ratio = compare(cur, baselines["results"].get(case, {}).get(n), scale, a.threshold, a.mem_threshold)
+            if status not in ("ok", "new"):
+                failed.append(f"{case} @ {n}")
+            print(f"{case:<22}{int(n):>9}{cur['seconds']:>10.3f}{cur['items_per_s']:>12,.0f}{cur['peak_rss_mb']:>9.1f}"
+                  f"{'' if ratio is None else f'{ratio:.2f}x':>9}  {status}")
+
+    if a.update:
+        if baselines.get("calibration"):  # keep one reference machine: rescale new numbers onto it
+            for sizes in results.values():
+                for r in sizes.values():
+                    r["items_per_s"] = round(r["items_per_s"] / scale, 1); r["seconds"] = round(r["seconds"] * scale, 4)
+        else:
+            baselines["calibration"] = round(cal)
+        for case, sizes in results.items():
+            baselines["results"].setdefault(case, {}).update(sizes)
+        bpath.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"Wrote {bpath}")
+    elif failed:
+        sys.exit(f"Regression beyond threshold: {', '.join(failed)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+"""
+Benchmark: vague-term lint cost per requirement vs lexicon size.
+
+Compares the compiled VagueMatcher (one pass, trie-shaped regex) with the old
+per-term substring scan. The matcher's per-requirement time should stay roughly
+flat as the lexicon grows; the substring scan grows linearly.
+
+Usage:
+  python bench/bench_vague_matcher.py [--reqs 2000] [--sizes 16,256,1024,4096,8192]
+"""
+import argparse, pathlib, random, string, sys, time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "tools"))
+import req_lint as rl
+
+def synth_lexicon(n, rng):
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10))) for _ in range(n)]
+    return [w if rng.random() < .7 else f"{w} {rng.choice(words)}" for w in words]
+
+def synth_reqs(n, rng):
+    vocab = ("the system must respond within 300 ms p95 for checkout availability 99.9% "
+             "users can search products orders payments encrypted at rest fast reliable").split()
+    return [" ".join(rng.choices(vocab, k=rng.randint(12, 40))) for _ in range(n)]
+
+def naive(terms, text):
+    t = text.lower()
+    return [w for w in terms if w in t]
+
+def per_req_us(fn, reqs):
+    t0 = time.perf_counter()
+    for r in reqs: fn(r)
+    return (time.perf_counter() - t0) / len(reqs) * 1e6
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--reqs", type=int, default=2000)
+    ap.add_argument("--sizes", default="16,256,1024,4096,8192")
+    a = ap.parse_args()
+    rng = random.Random(7)
+    reqs = synth_reqs(a.reqs, rng)
+    print(f"{'lexicon':>8} {'build ms':>9} {'matcher us/req':>15} {'substring us/req':>17}")
+    for n in [int(x) for x in a.sizes.split(",")]:
+        terms = sorted(set(synth_lexicon(n, rng)) | rl.VAGUE_WORDS)
+        t0 = time.perf_counter(); m = rl.VagueMatcher(terms); build = (time.perf_counter() - t0) * 1e3
+        fast = per_req_us(lambda r: list(m.finditer(r)), reqs)
+        slow = per_req_us(lambda r: naive(terms, r), reqs)
+        print(f"{len(m):>8} {build:>9.1f} {fast:>15.1f} {slow:>17.1f}")
+
+if __name__ == "__main__":
+    main()
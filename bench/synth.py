@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+"""
+Synthetic corpora for the benchmarks: requirement Markdown / packages, NFR profiles + options,
+decision scores and architecture briefs, at any size. Seeded, so a size always gives the same corpus.
+
+Usage:
+  python bench/synth.py requirements 100000 --out /tmp/reqs.md      # .md, .jsonl or .yaml by suffix
+  python bench/synth.py options 10000 --out /tmp/options.yaml
+  python bench/synth.py brief 500 --out /tmp/brief.yaml
+"""
+import argparse, json, pathlib, random, sys, yaml
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "tools"))
+
+ENTITIES = ["customer", "order", "product", "invoice", "payment", "shipment", "account", "catalog",
+            "warehouse", "supplier", "coupon", "review", "cart", "refund", "subscription", "report"]
+FLOWS = ["checkout", "search", "login", "export", "payment capture", "order history", "catalog sync"]
+VAGUE = ["fast", "reliable", "user-friendly", "scalable", "secure", "robust", "as soon as possible"]
+
+def requirement_text(i, rng):
+    e1, e2 = rng.sample(ENTITIES, 2); flow = rng.choice(FLOWS)
+    k = i % 8
+    if k == 0: return f"As a {e1} manager, I want to view {e2}s within {rng.randint(50, 900)} ms (p95) so I can decide quickly."
+    if k == 1: return f"The {flow} service must sustain {rng.randint(1, 50) * 100:,} RPS with {rng.choice(['99.5', '99.9', '99.95'])}% availability."
+    if k == 2: return f"{flow.capitalize()} p95 latency < {rng.randint(100, 1500)} ms for {e1} {e2}s"
+    if k == 3: return f"The {flow} should be {rng.choice(VAGUE)} and {rng.choice(VAGUE)}."
+    if k == 4: return f"As a {e1}, I want to export my {e2}s as CSV so I can reconcile them."
+    if k == 5: return f"RPO {rng.randint(1, 60)} minutes and RTO {rng.randint(1, 8)} hours for the {e2} store."
+    if k == 6: return f"All {e1} PII encrypted at rest and in transit for {flow}."
+    return f"Each {e1} places many {e2}s; {flow} handles {rng.randint(10, 500)} requests per second."
+
+def iter_requirements(n, seed=0):
+    """Requirement dicts shaped like req_extract output."""
+    rng = random.Random(seed)
+    for i in range(n):
+        t = requirement_text(i, rng)
+        yield {"id": f"R{i + 1:03}", "type": "func" if "As a" in t else "nfr", "text": t,
+               "priority": "HML"[i % 3], "category": None, "acceptance": []}
+
+def write_requirements(n, p, seed=0):
+    """Markdown (one requirement per line), JSONL or YAML package, by suffix."""
+    p = pathlib.Path(p)
+    with open(p, "w", encoding="utf-8") as f:
+        if p.suffix == ".md":
+            f.write("# Synthetic requirements\n\n")
+            f.writelines(r["text"] + "\n" for r in iter_requirements(n, seed))
+        elif p.suffix == ".jsonl":
+            f.writelines(json.dumps(r) + "\n" for r in iter_requirements(n, seed))
+        else:
+            yaml.safe_dump({"requirements": list(iter_requirements(n, seed))}, f, sort_keys=False)
+    return p
+
+def synth_options(n, rng):
+    kinds = ["monolith", "microservices", "event-driven"]
+    return [{"name": f"opt-{i}", "kind": rng.choice(kinds), "metrics": {
+        "performance_p95_ms": rng.randint(150, 1200),
+        "availability_pct": round(rng.uniform(99.0, 99.99), 2),
+        "cost_monthly_usd": rng.randint(800, 30000),
+        "operability_score": rng.randint(1, 5),
+        "scalability_score": rng.randint(1, 5),
+        "security_score": rng.randint(1, 5),
+        "time_to_market_weeks": rng.randint(2, 30),
+    }} for i in range(n)]
+
+def write_options(n, p, seed=0):
+    with open(p, "w", encoding="utf-8") as f:
+        yaml.safe_dump({"options": synth_options(n, random.Random(seed))}, f, sort_keys=False)
+    return pathlib.Path(p)
+
+def write_scores(n, p, seed=0):
+    """decision_scores.jsonl for n synthetic options, scored against the sample profile."""
+    import arch_decision_score as ads, req_io
+    prof = req_io.load_yaml(ROOT / "samples" / "decision" / "nfr_profile.yaml")
+    scored = ads.score_options(prof, synth_options(n, random.Random(seed)))
+    req_io.dump_scores({"profile": prof, "scored": scored}, p)
+    return pathlib.Path(p)
+
+def synth_brief(n, seed=0):
+    """An architecture brief with n services in ~n/25 domains, with calls, datastores and integrations."""
+    rng = random.Random(seed)
+    domains = [f"Domain {i}" for i in range(max(1, n // 25))]
+    svcs = [{"name": f"svc-{i}", "domain": rng.choice(domains)} for i in range(n)]
+    for s in svcs:
+        s["calls"] = sorted({f"svc-{rng.randrange(n)}" for _ in range(rng.randint(0, 3))} - {s["name"]})
+        s["datastores"] = [f"db-{rng.randrange(n // 5 + 1)}"]
+        if rng.random() < .1:
+            s["integrations"] = [f"ext-{rng.randrange(10)}"]
+    return {"system": f"Synthetic {n}", "domains": domains, "services": svcs,
+            "quality_attributes": {"availability": "99.9%", "latency_p95_ms": 300},
+            "pain_points": ["tight coupling", "slow releases"]}
+
+def write_brief(n, p, seed=0):
+    with open(p, "w", encoding="utf-8") as f:
+        yaml.safe_dump(synth_brief(n, seed), f, sort_keys=False)
+    return pathlib.Path(p)
+
+WRITERS = {"requirements": write_requirements, "options": write_options, "scores": write_scores, "brief": write_brief}
+
+def main():
+    ap = argparse.ArgumentParser(description="Write a synthetic corpus")
+    ap.add_argument("kind", choices=list(WRITERS))
+    ap.add_argument("n", type=int)
+    ap.add_argument("--out", required=True)
+    ap.add_argument("--seed", type=int, default=0)
+    a = ap.parse_args()
+    print(f"Wrote {WRITERS[a.kind](a.n, a.out, a.seed)}")
+
+if __name__ == "__main__":
+    main()
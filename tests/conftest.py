@@ -0,0 +1,3 @@
+import sys, pathlib
+# tools/ is a directory of scripts, not a package; make them importable in tests
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "tools"))
@@ -0,0 +1,31 @@
+import pathlib
+import yaml
+import a2a_batch
+from a2a_transform import load_source, transform
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+
+def test_batch_renders_per_system_and_skips_unchanged(tmp_path):
+    src = yaml.safe_load((ROOT / "samples" / "source_architecture.yaml").read_text(encoding="utf-8"))
+    briefs = tmp_path / "briefs"; briefs.mkdir()
+    for name in ("orders", "billing"):
+        (briefs / f"{name}.yaml").write_text(yaml.safe_dump(dict(src, system=name.title())), encoding="utf-8")
+    (briefs / "broken.yaml").write_text("services: [", encoding="utf-8")
+    out = tmp_path / "out"
+    jobs = a2a_batch.plan(a2a_batch.expand_briefs([briefs]), ["microservices", "medallion"], out)
+
+    first = {pathlib.Path(r["source"]).stem: r for r in a2a_batch.run_batch(jobs, workers=2)}
+    assert "error" in first["broken"] and first["orders"]["written"] == first["orders"]["files"] == 8
+    expected = transform(load_source(briefs / "orders.yaml"), "medallion")
+    assert all((out / "orders" / "medallion" / rel).read_text(encoding="utf-8") == text for rel, text in expected.items())
+
+    (briefs / "billing.yaml").write_text(yaml.safe_dump(dict(src, system="Billing", pain_points=["slow month-end"])), encoding="utf-8")
+    second = {pathlib.Path(r["source"]).stem: r for r in a2a_batch.run_batch(jobs, workers=1)}
+    assert second["orders"]["written"] == 0
+    assert second["billing"]["written"] == 2  # only the two ADRs mention pain points
+
+def test_adr_date_alone_is_not_a_change(tmp_path):
+    p = tmp_path / "ADR.md"
+    assert a2a_batch.write_if_content_changed(p, "# ADR\n- **Date**: 2024-01-01\nbody\n")
+    assert not a2a_batch.write_if_content_changed(p, "# ADR\n- **Date**: 2024-02-02\nbody\n")
+    assert a2a_batch.write_if_content_changed(p, "# ADR\n- **Date**: 2024-02-02\nnew body\n")
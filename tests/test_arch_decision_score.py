@@ -0,0 +1,81 @@
+import pathlib, random, subprocess, sys
+import pytest
+import arch_decision_score as ads
+from req_io import load_yaml
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+
+def test_matrix_engine_matches_loop_engine():
+    pytest.importorskip("numpy")
+    prof = load_yaml(ROOT / "samples" / "decision" / "nfr_profile.yaml")
+    opts = load_yaml(ROOT / "samples" / "decision" / "options.yaml")["options"]
+    assert ads.score_options_matrix(prof, opts) == ads.score_options(prof, opts)
+
+    rng = random.Random(3)  # coarse values -> plenty of ties at the top-k boundary
+    many = [{"name": f"o{i}", "metrics": {k: rng.choice([lo, hi, (lo + hi) / 2]) for k, (lo, hi) in prof["bounds"].items()}}
+            for i in range(500)]
+    loop = ads.score_options(prof, many)
+    assert ads.score_options_matrix(prof, many) == loop
+    assert ads.score_options_matrix(prof, many, top_k=25) == loop[:25]
+
+def test_sensitivity_probabilities_and_job_independence():
+    pytest.importorskip("numpy")
+    prof = load_yaml(ROOT / "samples" / "decision" / "nfr_profile.yaml")
+    opts = load_yaml(ROOT / "samples" / "decision" / "options.yaml")["options"]
+    sens = ads.sensitivity(prof, opts, samples=1200, chunk=400, seed=1)
+    assert abs(sum(s["p_first"] for s in sens) - 1.0) < 1e-6
+    assert all(abs(sum(s["rank_dist"].values()) - 1.0) < 1e-3 for s in sens)
+    assert sens == ads.sensitivity(prof, opts, samples=1200, chunk=400, seed=1, jobs=2)
+
+    # triangular(99.0, 99.5, 99.7): P(availability < 99.5 floor) = 0.5 / 0.7
+    risky = dict(opts[0], uncertainty={"availability_pct": [99.0, 99.7]}, metrics=dict(opts[0]["metrics"], availability_pct=99.5))
+    p = ads.sensitivity(prof, [risky] + opts[1:], samples=2000)[0]["p_violation"]
+    assert abs(p - 5 / 7) < 0.05
+
+def _brute_fronts(X):
+    dominated_by = [{j for j, q in enumerate(X) if all(a >= b for a, b in zip(q, p)) and q != p} for p in X]
+    fronts, left, k = [0] * len(X), set(range(len(X))), 0
+    while left:
+        k += 1
+        layer = {i for i in left if not dominated_by[i] & left}
+        for i in layer: fronts[i] = k
+        left -= layer
+    return fronts
+
+def test_pareto_ranks_match_brute_force():
+    pytest.importorskip("numpy")
+    rng = random.Random(5)
+    for m in (2, 4, 7):
+        X = [tuple(rng.randint(0, 4) for _ in range(m)) for _ in range(300)]  # many ties and duplicates
+        assert ads.pareto_ranks(X, block=37, rows=50).tolist() == _brute_fronts(X)
+        assert ads.pareto_ranks(X).tolist() == _brute_fronts(X)
+
+    cd = ads.crowding_distance([[0, 4], [1, 3], [3, 1], [4, 0]], [1, 1, 1, 1]).tolist()
+    assert cd[0] == cd[3] == float("inf") and cd[1] == pytest.approx(3 / 4 + 3 / 4) and cd[2] == pytest.approx(1.5)
+
+def test_pareto_skips_disqualified_options():
+    pytest.importorskip("numpy")
+    prof = load_yaml(ROOT / "samples" / "decision" / "nfr_profile.yaml")
+    opts = load_yaml(ROOT / "samples" / "decision" / "options.yaml")["options"]
+    worse = {"name": "worse", "metrics": dict(opts[0]["metrics"], cost_monthly_usd=opts[0]["metrics"]["cost_monthly_usd"] + 1)}
+    bad = {"name": "bad", "metrics": dict(opts[0]["metrics"], security_score=1)}
+    par, _ = ads.pareto(prof, opts + [worse, bad])
+    assert par[-1] == {"pareto_front": None, "crowding": None}
+    assert par[-2]["pareto_front"] == par[0]["pareto_front"] + 1
+    assert [r["name"] for r in ads.first_front(prof, opts + [worse, bad], par)][0] == ads.score_options(prof, opts)[0]["name"]
+
+def test_per_option_results_join_by_index_not_metrics_identity():
+    prof = load_yaml(ROOT / "samples" / "decision" / "nfr_profile.yaml")
+    opts = load_yaml(ROOT / "samples" / "decision" / "options.yaml")["options"]
+    opts = opts + [{"name": "alias", "metrics": opts[0]["metrics"]}]  # a YAML alias shares the dict
+    for engine in (ads.score_options, ads.score_options_matrix):
+        scored, index = engine(prof, opts, with_index=True)
+        ads._attach(scored, index, "source", [o["name"] for o in opts])
+        assert [r["source"] for r in scored] == [r["name"] for r in scored]
+
+def test_top_k_below_one_is_rejected(tmp_path):
+    run = subprocess.run([sys.executable, str(ROOT / "tools" / "arch_decision_score.py"),
+                          "--profile", str(ROOT / "samples" / "decision" / "nfr_profile.yaml"),
+                          "--options", str(ROOT / "samples" / "decision" / "options.yaml"),
+                          "--outdir", str(tmp_path), "--top-k", "0"], capture_output=True, text=True)
+    assert run.returncode == 2 and "--top-k: must be at least 1" in run.stderr
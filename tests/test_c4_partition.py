@@ -0,0 +1,45 @@
+import pathlib, re
+import c4_partition
+from a2a_transform import load_source, transform
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+
+def size(text):
+    nodes = len(re.findall(r"^\s*(?:Person|System|System_Ext|Container|ContainerDb|ContainerDb_Ext|ContainerQueue)\(", text, re.M))
+    return nodes, len(re.findall(r"^Rel\(", text, re.M))
+
+def estate(n, clusters, domains=False):
+    """n services in `clusters` call rings sharing one datastore each, bridged by a single call."""
+    svcs = []
+    for i in range(n):
+        c = i % clusters
+        ring = [j for j in range(n) if j % clusters == c]
+        nxt = ring[(ring.index(i) + 1) % len(ring)]
+        svcs.append({"name": f"svc{i}", "calls": [f"svc{nxt}"], "datastores": [f"db{c}"]}
+                    | ({"domain": f"D{c}"} if domains else {}))
+    svcs[0]["calls"].append("svc1")
+    return {"system": "Estate", "services": svcs}
+
+def test_small_brief_keeps_flat_diagrams():
+    data = load_source(ROOT / "samples" / "source_architecture.yaml")
+    assert c4_partition.render(data, "microservices", "X") is None
+    assert set(transform(data, "event-driven")) == set(transform(data, "event-driven", partition="off"))
+
+def test_community_detection_finds_clusters():
+    est = c4_partition.Estate(estate(40, 2))
+    groups = sorted(sorted(m) for m in c4_partition.communities(est).values())
+    assert groups == sorted(sorted(f"svc{i}" for i in range(40) if i % 2 == c) for c in range(2))
+
+def test_domain_partitions_fit_budget_and_collapse_neighbours():
+    out = transform(estate(120, 3, domains=True), "event-driven", partition="domain", max_nodes=20, max_edges=30)
+    parts = {k: v for k, v in out.items() if k.startswith("c4/partitions/")}
+    assert len(parts) > 3 and all(k.startswith("c4/partitions/d") for k in parts)
+    for rel in ["c4/context.mmd", "c4/containers.mmd", *parts]:
+        n, e = size(out[rel])
+        assert n <= 20 and e <= 30, rel
+    assert not any("omitted" in t for t in parts.values())
+    # each piece names its neighbours by partition, and links to their diagrams
+    linked = set(re.findall(r"see (c4/partitions/[\w-]+\.mmd)", "".join(parts.values())))
+    assert linked and linked <= set(parts)
+    members = [s for t in parts.values() for s in re.findall(r'Container\(s\d+, "(svc\d+)"', t)]
+    assert sorted(members) == sorted(f"svc{i}" for i in range(120))
@@ -0,0 +1,35 @@
+import json
+import generate_mermaid_er as er
+
+REQS = [{"text": t} for t in [
+    "Each customer places many customer orders",
+    "A customer order contains order lines",
+    "Customer orders are paid with invoices",
+    "Invoices are emailed to the customer",
+]]
+
+def test_phrases_relations_and_cardinality():
+    mmd = er.render_er(REQS, k=4)
+    assert "  CustomerOrder {" in mmd and "  Order {" not in mmd  # the phrase absorbs its words
+    assert '  Customer ||--o{ CustomerOrder : "places"' in mmd
+    assert '  CustomerOrder ||--o{ Line : "contains"' in mmd
+    assert "Contain {" not in mmd and "User {" not in mmd
+
+def test_streams_file_with_bounded_counters(tmp_path):
+    p = tmp_path / "reqs.jsonl"
+    with open(p, "w", encoding="utf-8") as f:
+        for i in range(3000):
+            noise = "".join(chr(97 + int(d)) for d in f"{i:05d}")  # a new word on every line
+            f.write(json.dumps({"id": f"R{i}", "text": f"Each warehouse holds products {noise}"}) + "\n")
+    uni, bi = er.count_terms(er.Requirements(p), capacity=100)
+    assert len(uni) <= 100 and uni["warehouse"] == uni["product"] == 3000
+    mmd = er.render_er(er.Requirements(p), k=2, capacity=100)
+    assert '  Warehouse ||--o{ Product : "holds"' in mmd
+
+def test_bigram_outlives_its_pruned_words():
+    noise = " the ".join(w for w in ["gamma", "delta", "epsilon", "zeta", "theta"] for _ in range(3))
+    reqs = [{"text": "alpha beta"}] * 2 + [{"text": noise}]
+    uni, bi = er.count_terms(reqs, capacity=4)
+    assert "alpha" not in uni and bi[("alpha", "beta")] == 2
+    mmd = er.render_er(reqs, k=4, capacity=4)
+    assert "AlphaBeta" not in mmd and "Gamma {" in mmd
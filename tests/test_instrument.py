@@ -0,0 +1,37 @@
+import json, pathlib, subprocess, sys
+import instrument
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+
+def test_disabled_timings_record_nothing():
+    tm = instrument.Timings("x")
+    with tm.stage("a"):
+        pass
+    tm.record("b", 1.0)
+    assert tm.stage("a") is tm.stage("b") and not tm.stages
+
+# a fixed package: samples/requirements.yaml is regenerated by the pipeline test
+PACKAGE = [
+    {"id": "R1", "type": "nfr", "text": "System should be fast and reliable"},
+    {"id": "R2", "type": "nfr", "text": "Availability must be high"},
+    {"id": "R3", "type": "func", "text": "User can search products", "acceptance": []},
+    {"id": "R4", "type": "nfr", "text": "Encrypt customer data"},
+    {"id": "R5", "type": "nfr", "text": "p95 latency < 300 ms for product search"},
+]
+
+def test_req_lint_timings_and_profile(tmp_path):
+    out, prof, pkg = tmp_path / "t.json", tmp_path / "run.prof", tmp_path / "reqs.jsonl"
+    pkg.write_text("".join(json.dumps(r) + "\n" for r in PACKAGE), encoding="utf-8")
+    run = subprocess.run([sys.executable, str(ROOT / "tools" / "req_lint.py"), str(pkg),
+                          "--output", str(tmp_path / "lint.txt"), "--timings", str(out), "--profile-out", str(prof)],
+                         capture_output=True, text=True)
+    assert run.returncode == 1  # the package has lint issues; the report is still written on exit
+    rep = json.loads(out.read_text(encoding="utf-8"))
+    assert [s["name"] for s in rep["stages"]] == ["read", "parse", "lint", "conflicts", "render", "write"]
+    assert all(s["calls"] == 1 and s["peak_rss_mb"] > 0 for s in rep["stages"])
+    rules = {r["rule"]: r for r in rep["rules"]}
+    assert rules["nfr-measurable"]["calls"] == 4  # no trigger event: every nfr
+    assert rules["vague-wording"] == {**rules["vague-wording"], "calls": 1, "hits": 1}  # only where a vague term was scanned
+    assert rules["func-acceptance"] == {**rules["func-acceptance"], "calls": 1, "hits": 1}
+    import pstats
+    assert pstats.Stats(str(prof)).total_calls > 0
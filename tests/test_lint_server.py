@@ -0,0 +1,64 @@
+import json, pathlib, socket, subprocess, sys, time
+import pytest
+import lint_server, req_lint
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+TOOLS = ROOT / "tools"
+
+def rpc(svc, method, params=None, rid=1):
+    return svc.handle({"jsonrpc": "2.0", "id": rid, "method": method, "params": params or {}})
+
+def test_lint_methods_match_req_lint(tmp_path):
+    svc = lint_server.LintService()
+    r = {"id": "R9", "type": "nfr", "text": "Search should be fast and reliable."}
+    res = rpc(svc, "lint", {"requirement": r})["result"]
+    assert res["id"] == "R9" and [i["message"] for i in res["issues"]] == req_lint.lint_req(r)
+    assert rpc(svc, "lint", {"text": "p95 latency < 300 ms", "type": "nfr"})["result"]["issues"] == []
+    reqs = [{"id": "A", "type": "nfr", "text": "Availability 99.9%"}, {"id": "B", "type": "nfr", "text": "Availability 95%"}]
+    many = rpc(svc, "lint_many", {"requirements": reqs})["result"]
+    assert not many["ok"] and many["results"] == [] and len(many["conflicts"]) == 1
+    pkg = tmp_path / "reqs.jsonl"
+    pkg.write_text("".join(json.dumps(r) + "\n" for r in reqs), encoding="utf-8")
+    for _ in range(2):
+        text = rpc(svc, "lint_file", {"path": str(pkg), "format": "text"})["result"]
+    assert text["report"] == req_lint.render_text([("A", []), ("B", [])], many["conflicts"])
+    assert rpc(svc, "stats")["result"]["cache"] == {"files": 1, "hits": 1, "misses": 1}
+
+def test_rpc_errors():
+    svc = lint_server.LintService()
+    assert rpc(svc, "nope")["error"]["code"] == lint_server.METHOD_NOT_FOUND
+    assert rpc(svc, "lint", {"bogus": 1})["error"]["code"] == lint_server.INVALID_PARAMS
+    assert rpc(svc, "lint_file", {"path": "/no/such/file.yaml"})["error"]["code"] == lint_server.INVALID_PARAMS
+    assert svc.handle({"id": 1, "method": "ping"})["error"]["code"] == lint_server.INVALID_REQUEST
+    assert svc.handle({"jsonrpc": "2.0", "method": "ping"}) is None  # notification
+    assert svc.handle([{"jsonrpc": "2.0", "id": 1, "method": "ping"}]) == [{"jsonrpc": "2.0", "id": 1, "result": "pong"}]
+
+def test_stdio_server():
+    lines = [{"jsonrpc": "2.0", "id": 1, "method": "lint", "params": {"text": "should be fast", "type": "nfr"}},
+             {"jsonrpc": "2.0", "id": 2, "method": "shutdown"}, {"jsonrpc": "2.0", "id": 3, "method": "ping"}]
+    out = subprocess.run([sys.executable, str(TOOLS / "lint_server.py")], input="".join(json.dumps(l) + "\n" for l in lines) + "{oops\n",
+                         capture_output=True, text=True, timeout=60)
+    replies = [json.loads(l) for l in out.stdout.splitlines()]
+    assert [r["id"] for r in replies] == [1, 2]  # nothing is read after shutdown
+    assert replies[0]["result"]["issues"][0]["rule"] == "vague-wording"
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets only")
+def test_socket_check_matches_cli(tmp_path):
+    sock, pkg = tmp_path / "lint.sock", str(ROOT / "samples" / "requirements.yaml")
+    cli = subprocess.run([sys.executable, str(TOOLS / "req_lint.py"), pkg, "--format", "json"], capture_output=True, text=True)
+    check = [sys.executable, str(TOOLS / "lint_server.py"), "--socket", str(sock), "--check", pkg, "--format", "json"]
+    offline = subprocess.run(check, capture_output=True, text=True)  # no server yet: lints in-process
+    srv = subprocess.Popen([sys.executable, str(TOOLS / "lint_server.py"), "--socket", str(sock)], stderr=subprocess.PIPE)
+    try:
+        deadline = time.time() + 30
+        while not sock.exists() and time.time() < deadline:
+            time.sleep(0.05)
+        online = subprocess.run(check, capture_output=True, text=True)
+        assert lint_server.call(sock, "stats")["calls"] == {"lint_file": 1, "stats": 1}
+        assert lint_server.call(sock, "shutdown") == "bye"
+        srv.wait(timeout=30)
+    finally:
+        srv.kill()
+    assert cli.returncode == offline.returncode == online.returncode == 1
+    assert cli.stdout == offline.stdout == online.stdout
+    assert not sock.exists()
@@ -0,0 +1,43 @@
+import pathlib, random
+import pytest
+import arch_decision_score as ads
+from option_search import ComponentSpace, search
+from req_io import load_yaml
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+PROFILE = load_yaml(ROOT / "samples" / "decision" / "nfr_profile.yaml")
+
+def random_space(rng, sizes):
+    slots = {}
+    for s, n in enumerate(sizes):
+        slots[f"slot{s}"] = [{"name": f"s{s}c{i}", "metrics": {
+            "performance_p95_ms": rng.choice([20, 60, 150, 400]),
+            "availability_pct": rng.choice([99.9, 99.95, 99.99]),
+            "cost_monthly_usd": rng.choice([0, 500, 1500, 4000]),
+            "operability_score": rng.randint(2, 5), "scalability_score": rng.randint(2, 5),
+            "security_score": rng.randint(2, 5), "time_to_market_weeks": rng.choice([2, 6, 12]),
+        }} for i in range(n)]
+    return ComponentSpace({"slots": slots})
+
+def test_search_matches_exhaustive_scoring():
+    rng = random.Random(7)
+    for sizes in ([4, 3, 5], [6, 2, 3, 4], [1, 7]):
+        space = random_space(rng, sizes)
+        every = [s for s in ads.score_options(PROFILE, space.options()) if s["ok"]]
+        for k in (1, 5, 40):
+            opts, stats = search(space, PROFILE, k)
+            assert ads.score_options(PROFILE, opts) == every[:k]
+            assert stats["combinations"] == len(space.options())
+
+def test_search_prunes_and_validates():
+    space = ComponentSpace(load_yaml(ROOT / "samples" / "decision" / "components.yaml"))
+    opts, stats = search(space, PROFILE, 3)
+    assert len(opts) == 3 and stats["scored"] < stats["combinations"]
+    assert set(opts[0]["components"]) == {"compute", "datastore", "broker", "region"}
+
+    no_security = {k: 1 for k in PROFILE["weights"] if k != "security_score"}
+    with pytest.raises(ValueError, match="security_score"):  # only some combinations would have it
+        search(ComponentSpace({"slots": {"a": [{"name": "x", "metrics": no_security}],
+                                         "b": [{"name": "y", "metrics": {"security_score": 4}}, {"name": "z"}]}}), PROFILE, 1)
+    with pytest.raises(ValueError, match="unknown combine rule"):
+        ComponentSpace({"combine": {"cost_monthly_usd": "avg"}, "slots": {"a": [{"name": "x"}]}})
@@ -9,3 +9,22 @@ def test_end_to_end():
         run([sys.executable, "tools/req_lint.py", "samples/requirements.yaml"])
     except subprocess.CalledProcessError:
         pass
+
+def test_in_process_pipeline_reruns_only_invalidated_stages(tmp_path):
+    sys.path.insert(0, str(ROOT / "tools"))
+    import pipeline
+    from sqlite_cache import SqliteCache
+    md = tmp_path / "reqs.md"
+    md.write_text((ROOT / "samples" / "requirements_sample.md").read_text(encoding="utf-8"), encoding="utf-8")
+    cfg = {k: str(ROOT / v) for k, v in pipeline.DEFAULTS.items() if k in {"schema", "profile", "options", "a2a_source"}}
+    cfg.update(requirements_md=[str(md)], requirements_out=str(tmp_path / "reqs.yaml"), er_out=str(tmp_path / "er.mmd"),
+               decisions_outdir=str(tmp_path / "decisions"), a2a_outdir=str(tmp_path / "a2a"))
+    with SqliteCache(tmp_path / "cache.sqlite") as cache:
+        first = pipeline.run_pipeline(cfg, cache=cache)
+        assert not any(r["cached"] for r in first.values()) and first["validate"]["output"] == []
+        second = pipeline.run_pipeline(cfg, cache=cache)
+        assert all(r["cached"] and not r["written"] for r in second.values())
+        md.write_text(md.read_text(encoding="utf-8") + "Checkout p95 latency under 900 ms\n", encoding="utf-8")
+        third = pipeline.run_pipeline(cfg, cache=cache)
+    assert {n for n, r in third.items() if not r["cached"]} == {"extract", "validate", "lint", "er"}
+    assert len(third["extract"]["output"]["requirements"]) == 5
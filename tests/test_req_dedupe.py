@@ -0,0 +1,60 @@
+import json, pathlib, subprocess, sys
+import req_dedupe
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+
+REQS = [
+    {"id": "A", "type": "nfr", "text": "The checkout service must sustain 1,000 RPS with 99.9% availability."},
+    {"id": "B", "type": "nfr", "text": "Search results are ranked by relevance and recency."},
+    {"id": "C", "type": "nfr", "text": "The Checkout service must sustain 2,500 RPS with 99.95% availability!"},
+    {"id": "D", "type": "nfr", "text": "The search service must sustain 1,000 RPS with 99.9% availability."},
+    {"id": "E", "type": "func", "text": ""},
+]
+
+def test_clusters_copies_with_changed_numbers():
+    dups = req_dedupe.find_duplicates(REQS)
+    assert dups == [{"ids": ["A", "C"], "similarity": [1.0, 1.0], "numbers_differ": True}]  # D names another service
+    assert req_dedupe.describe(dups[0]) == "near-duplicate requirements → A ≈ C:1.00 (numbers differ)"
+    a, b = req_dedupe.MinHasher(), req_dedupe.MinHasher()
+    assert (a.signatures(["same text"])[0] == b.signatures(["same text"])[0]).all()  # seeded: stable across instances
+
+def test_empty_and_blank_packages(tmp_path):
+    assert req_dedupe.find_duplicates([]) == []
+    assert req_dedupe.find_duplicates([{"id": "A", "text": ""}, {"id": "B", "text": "  !"}]) == []
+    pkg = tmp_path / "empty.jsonl"
+    pkg.write_text(json.dumps({"id": "A", "type": "nfr", "text": ""}) + "\n", encoding="utf-8")
+    run = subprocess.run([sys.executable, str(ROOT / "tools" / "req_dedupe.py"), str(pkg)], capture_output=True, text=True)
+    assert run.returncode == 0 and run.stdout == "Near-duplicates: none\n"
+
+def test_large_buckets_stay_one_cluster():
+    reqs = [{"id": f"R{i}", "text": f"Export job {i} must finish within {i} minutes."} for i in range(3000)]
+    dups = req_dedupe.find_duplicates(reqs + [{"id": "X", "text": "Users can reset their password by email."}])
+    assert len(dups) == 1 and dups[0]["ids"] == [f"R{i}" for i in range(3000)]
+
+def test_index_upsert_and_query(tmp_path):
+    db = tmp_path / "dedupe.sqlite"
+    with req_dedupe.DedupeIndex(db) as idx:
+        assert idx.upsert(REQS) == 4 and len(idx) == 4  # the empty text is skipped
+    new = [{"id": "N", "text": "The checkout service must sustain 5,000 RPS with 99.99% availability."},
+           {"id": "A", "text": REQS[0]["text"]}]  # its own id never matches itself
+    with req_dedupe.DedupeIndex(db) as idx:
+        assert idx.query(new) == {"N": [("A", 1.0, True), ("C", 1.0, True)], "A": [("C", 1.0, True)]}
+        idx.upsert([{"id": "C", "text": "Audit logs are retained for seven years."}])  # replaces C by id
+        assert idx.query(new)["N"] == [("A", 1.0, True)] and len(idx) == 4
+        idx.upsert([{"id": "A", "text": ""}])  # a cleared text drops its signature
+        assert "N" not in idx.query(new) and len(idx) == 3
+
+def test_req_lint_dedupe_report(tmp_path):
+    pkg = tmp_path / "reqs.jsonl"
+    pkg.write_text("".join(json.dumps(r) + "\n" for r in REQS[:3]), encoding="utf-8")
+    lint = [sys.executable, str(ROOT / "tools" / "req_lint.py"), str(pkg), "--dedupe"]
+    text = subprocess.run(lint, capture_output=True, text=True)
+    assert "NEAR-DUPLICATE REQUIREMENTS:\n  • near-duplicate requirements → A ≈ C:1.00 (numbers differ)" in text.stdout
+    rep = json.loads(subprocess.run(lint + ["--format", "json"], capture_output=True, text=True).stdout)
+    assert rep["duplicates"][0]["ids"] == ["A", "C"] and not rep["ok"]
+    plain = json.loads(subprocess.run(lint[:-1] + ["--format", "json"], capture_output=True, text=True).stdout)
+    assert "duplicates" not in plain
+
+def test_version_follows_hash_parameters():
+    assert req_dedupe.version() == req_dedupe.version(req_dedupe.MinHasher())
+    assert req_dedupe.version(req_dedupe.MinHasher(bands=32)) != req_dedupe.version()
@@ -0,0 +1,27 @@
+import pytest, yaml
+import req_extract as rx
+
+def test_stream_multi_file_ids(tmp_path):
+    (tmp_path / "a.md").write_text("# A\nAs a user, I want X\nLatency p95 < 300 ms\n", encoding="utf-8")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "b.md").write_text("Availability 99.9%\n", encoding="utf-8")
+    paths = rx.expand_inputs([str(tmp_path)])
+    assert [p.name for p in paths] == ["a.md", "b.md"]
+    assert [r["id"] for r in rx.iter_requirements(paths)] == ["R001", "R002", "R003"]
+    assert [r["id"] for r in rx.iter_requirements(paths, "file")] == ["a-R001", "a-R002", "b-R001"]
+
+    out = tmp_path / "out.yaml"
+    with open(out, "w", encoding="utf-8") as fh:
+        rx.write_yaml_stream(rx.iter_requirements(paths), fh)
+    assert yaml.safe_load(out.read_text()) == rx.parse_markdown(
+        "As a user, I want X\nLatency p95 < 300 ms\nAvailability 99.9%\n")
+
+def test_file_ids_tell_same_named_files_apart(tmp_path):
+    for d in ("a", "b"):
+        (tmp_path / d).mkdir()
+        (tmp_path / d / "reqs.md").write_text("Availability 99.9%\n", encoding="utf-8")
+    paths = rx.expand_inputs([str(tmp_path)])
+    assert [r["id"] for r in rx.iter_requirements(paths, "file")] == ["a-reqs-R001", "b-reqs-R001"]
+    (tmp_path / "a-reqs.md").write_text("Latency p95 < 300 ms\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="a-reqs-"):
+        list(rx.iter_requirements(rx.expand_inputs([str(tmp_path)]), "file"))
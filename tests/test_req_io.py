@@ -0,0 +1,26 @@
+import req_io
+
+def test_jsonl_package_roundtrip_and_index(tmp_path):
+    data = req_io.load_package("samples/requirements.yaml")
+    out = tmp_path / "pkg.jsonl"
+    req_io.dump_package(data, out, index=True)
+    assert req_io.load_package(out) == {"requirements": data["requirements"]}
+    assert list(req_io.iter_package(out)) == data["requirements"]
+    with req_io.JsonlPackage(out) as pkg:
+        assert len(pkg) == len(data["requirements"])
+        assert pkg[-1] == data["requirements"][-1]
+
+def test_scores_jsonl_reads_only_the_top_rows(tmp_path):
+    doc = {"profile": {"system": "S"}, "scored": [{"name": f"o{i}", "overall": 1 - i / 100} for i in range(50)],
+           "pareto": {"fronts": 2}}
+    p = tmp_path / "decision_scores.jsonl"
+    req_io.dump_scores(doc, p)
+    assert req_io.load_scores(p) == {**doc, "count": 50}
+    with open(p, "a", encoding="utf-8") as f:
+        f.write("{not json\n")  # never reached when only the top rows are read
+    top = req_io.load_scores(p, top_k=3)
+    assert top["count"] == 50 and top["pareto"] == {"fronts": 2} and [r["name"] for r in top["scored"]] == ["o0", "o1", "o2"]
+
+    pretty = tmp_path / "decision_scores.json"
+    req_io.dump_scores(doc, pretty)
+    assert req_io.load_scores(pretty, top_k=3) == top
@@ -0,0 +1,129 @@
+from collections import defaultdict
+import pytest
+import req_lint as rl
+from sqlite_cache import SqliteCache
+
+def test_vague_matcher_word_boundaries_and_positions():
+    m = rl.VagueMatcher(["fast", "easy", "user friendly", "best-effort"])
+    text = "Breakfast is uneasy; make it FAST and user  friendly, best-effort."
+    assert list(m.finditer(text)) == [("fast", 29, 33), ("user friendly", 38, 52), ("best-effort", 54, 65)]
+
+def test_external_lexicon(tmp_path):
+    lex = tmp_path / "bu.txt"
+    lex.write_text("# comment\nseamless\nreal-time  # trailing comment\n", encoding="utf-8")
+    try:
+        rl.use_lexicon([lex])
+        assert rl.contains_vague("A seamless, real-time and fast checkout") == ["fast", "real-time", "seamless"]
+        rl.use_lexicon([lex], replace=True)
+        assert rl.contains_vague("A seamless and fast checkout") == ["seamless"]
+    finally:
+        rl.use_lexicon()
+
+def test_parallel_lint_matches_serial():
+    texts = ["System should be fast", "p95 latency < 300 ms", "As a user I can search", "Encrypt data"]
+    reqs = [{"id": f"R{i:03}", "type": "func" if i % 3 == 0 else "nfr", "text": texts[i % 4]} for i in range(40)]
+    serial = rl.lint_all(reqs)
+    assert rl.lint_all(reqs, jobs=2, min_chunk=5) == serial
+    assert [rid for rid, _ in serial] == [r["id"] for r in reqs]
+
+def test_lint_cache_reuses_unchanged_requirements(tmp_path, monkeypatch):
+    from sqlite_cache import SqliteCache
+    reqs = [{"id": "R1", "type": "nfr", "text": "System should be fast"},
+            {"id": "R2", "type": "nfr", "text": "p95 latency < 300 ms"}]
+    with SqliteCache(tmp_path / "c.sqlite") as cache:
+        cold = rl.lint_cached(reqs, cache)
+        assert (cache.hits, cache.misses) == (0, 2)
+    calls = []
+    monkeypatch.setattr(rl, "lint_req", lambda r: calls.append(r["id"]) or [])
+    reqs[1] = dict(reqs[1], text="p95 latency < 250 ms")
+    with SqliteCache(tmp_path / "c.sqlite", max_entries=2) as cache:
+        warm = rl.lint_cached(reqs, cache)
+        assert (cache.hits, cache.misses) == (1, 1)
+    assert calls == ["R2"] and warm[0] == cold[0]
+    with SqliteCache(tmp_path / "c.sqlite") as cache:
+        assert len(cache) == 2  # LRU evicted the stale R2 entry
+
+def test_conflicts_are_scoped_and_clustered():
+    reqs = [
+        {"id": "A", "category": "checkout", "text": "Checkout p95 latency < 200 ms"},
+        {"id": "B", "category": "checkout", "text": "Checkout p95 latency under 220 ms"},
+        {"id": "C", "category": "checkout", "text": "Checkout p95 latency of 800 ms"},
+        {"id": "D", "category": "search", "text": "Search p95 latency of 800 ms"},
+        {"id": "E", "text": "Availability 99.9%"},
+        {"id": "F", "text": "Uptime 99.95 %"},
+        {"id": "G", "text": "Handle 1,000 RPS"},
+        {"id": "H", "text": "Handle 2k rps"},
+        {"id": "I", "text": "RTO 15 min, RPO 5 min"},
+        {"id": "J", "text": "RTO: 1 hour"},
+    ]
+    assert rl.detect_conflicts(reqs) == [
+        "conflicting latency p95 targets in checkout → A:200ms, B:220ms vs C:800ms",
+        "conflicting rto targets across requirements → I:15min vs J:60min",
+        "conflicting throughput targets across requirements → G:1000rps vs H:2000rps",
+    ]
+
+def test_plural_latency_terms():
+    assert "latency/response-time mentioned without a number + unit (e.g., 300 ms)" in rl.lint_req(
+        {"type": "nfr", "text": "Response times should be low"})
+    reqs = [{"id": "A", "text": "Response times p95 < 200 ms"}, {"id": "B", "text": "Checkout latencies p95 < 900 ms"}]
+    assert rl.detect_conflicts(reqs) == ["conflicting latency p95 targets across requirements → A:200ms vs B:900ms"]
+
+def test_equal_zero_targets_agree():
+    reqs = [{"id": "A", "text": "RPO: 0 min, error rate 0%"}, {"id": "B", "text": "RPO 0 min and error rate of 0 %"},
+            {"id": "C", "text": "p95 latency 0 ms"}, {"id": "D", "text": "p95 latency 0 ms"}]
+    assert rl.detect_conflicts(reqs) == []
+    assert rl.detect_conflicts(reqs + [{"id": "E", "text": "RPO 5 min"}]) == [
+        "conflicting rpo targets across requirements → A:0min, B:0min vs E:5min"]
+
+def test_rule_ids_come_from_the_rule_not_the_message(tmp_path):
+    pack = tmp_path / "team.yaml"
+    pack.write_text(
+        "terms:\n  pci: [cardholder data]\n"
+        "rules:\n"
+        "  - {id: pci-scope, when: [pci], message: '{pci} mentioned without encryption controls'}\n"
+        "  - {id: owner, missing: owner, message: requirement has no owner}\n", encoding="utf-8")
+    r = {"id": "R1", "type": "nfr", "text": "Store cardholder data. p95 < 300 ms"}
+    try:
+        rl.use_rules([pack])
+        assert [rl.rule_id(i) for i in rl.lint_req(r)] == ["pci-scope", "owner"]
+        assert [rl.rule_id(i) for _, issues in rl.lint_all([r] * 600, jobs=2, rules=[pack]) for i in issues][-2:] == ["pci-scope", "owner"]
+        cache = SqliteCache(tmp_path / "cache.sqlite")
+        rl.lint_cached([r], cache)
+        [(_, issues)] = rl.lint_cached([r], cache)  # served from the cache
+        assert [rl.rule_id(i) for i in issues] == ["pci-scope", "owner"]
+        cache.close()
+    finally:
+        rl.use_rules()
+
+def test_rule_pack_adds_and_replaces_rules(tmp_path):
+    pack = tmp_path / "team.yaml"
+    pack.write_text(
+        "terms:\n  pci: [cardholder data, PAN]\n"
+        "rules:\n"
+        "  - {id: pci-scope, types: [nfr], when: [pci], unless: [encryption, [control, encryption-scope]],\n"
+        "     message: 'cardholder data mentioned ({pci}) without encryption controls'}\n"
+        "  - {id: owner, missing: owner, message: requirement has no owner}\n"
+        "  - {id: vague-wording, when: [vague], message: 'wording too vague: {vague}'}\n", encoding="utf-8")
+    try:
+        rl.use_rules([pack])
+        r = {"id": "R1", "type": "nfr", "text": "Store  cardholder   data and the PAN; checkout must be fast. p95 < 300 ms"}
+        assert rl.lint_req(r) == ["wording too vague: fast",
+                                  "cardholder data mentioned (cardholder data, pan) without encryption controls",
+                                  "requirement has no owner"]
+        assert rl.lint_req(dict(r, owner="payments", text="PAN over TLS, encrypted in transit, p95 < 300 ms")) == []
+        assert [rl.rule_id(i) for i in rl.lint_req(r)] == ["vague-wording", "pci-scope", "owner"]
+        bad = tmp_path / "bad.json"
+        bad.write_text('{"rules": [{"id": "x", "when": ["no-such-event"], "message": "m"}]}', encoding="utf-8")
+        with pytest.raises(ValueError, match="no-such-event"):
+            rl.use_rules([bad])
+    finally:
+        rl.use_rules()
+
+def test_one_scan_feeds_rules_and_conflicts():
+    reqs = [{"id": "A", "type": "nfr", "text": "Export report p95 latency < 200 ms, RTO: 1 hour"},
+            {"id": "B", "type": "nfr", "text": "Report p95 latency of 900 ms; error rate 0.5%; RTO 15 min"}]
+    index = defaultdict(list)
+    assert [rl.lint_req(r, index) for r in reqs] == [[], []]  # 'export' / 'report' are not latency mentions ('rt')
+    assert rl.conflicts_from_index(index) == rl.detect_conflicts(reqs) == [
+        "conflicting latency p95 targets across requirements → A:200ms vs B:900ms",
+        "conflicting rto targets across requirements → B:15min vs A:60min"]
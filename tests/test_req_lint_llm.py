@@ -0,0 +1,117 @@
+import json, random, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import req_lint_llm as rll
+
+class StubOpenAI(BaseHTTPRequestHandler):
+    """Minimal OpenAI-compatible /chat/completions: echoes the requirement text, answers
+    every third call with 429 first, and replies after a random delay. Batch prompts get a
+    JSON array that leaves out the last requirement of the batch."""
+    calls = batches = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with StubOpenAI.lock:
+            StubOpenAI.calls += 1
+            n = StubOpenAI.calls
+        if n % 3 == 0:
+            return self._send(429, {"error": {"message": "slow down", "type": "rate_limit"}}, {"retry-after": "0.01"})
+        time.sleep(random.random() * 0.05)
+        user = body["messages"][-1]["content"]
+        if "\nRequirements:\n" in user:
+            StubOpenAI.batches += 1
+            items = [dict(l.split(": ", 1) for l in block.splitlines())
+                     for block in user.split("\nRequirements:\n\n")[1].split("\n\n")]
+            content = "```json\n" + json.dumps([{"id": it["ID"], "requirement": f"{it['Text']} (rewritten)"}
+                                                for it in items[:-1]]) + "\n```"
+        else:
+            text = user.split("Original requirement:")[1].split("Type:")[0].strip()
+            content = f"Requirement: {text} (rewritten)"
+        self._send(200, {"id": "x", "object": "chat.completion", "created": 0, "model": body["model"],
+                         "choices": [{"index": 0, "finish_reason": "stop",
+                                      "message": {"role": "assistant", "content": content}}]})
+
+    def _send(self, code, payload, headers=None):
+        data = json.dumps(payload).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *a):
+        pass
+
+@pytest.fixture
+def stub_server(monkeypatch):
+    pytest.importorskip("openai")
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), StubOpenAI)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setenv("OPENAI_BASE_URL", f"http://127.0.0.1:{srv.server_port}/v1")
+    StubOpenAI.calls = StubOpenAI.batches = 0
+    yield srv
+    srv.shutdown()
+
+def test_concurrent_advice_keeps_order_and_retries_429(stub_server):
+    failing = [(f"R{i}", {"id": f"R{i}", "type": "nfr", "text": f"System {i} should be fast"}, ["vague wording: fast"])
+               for i in range(12)]
+    out = rll.advise_all(rll.llm_client(), "stub", failing, concurrency=6,
+                         limiter=rll.RateLimiter(rpm=1000), max_retries=3)
+    assert out == [f"Requirement: System {i} should be fast (rewritten)" for i in range(12)]
+    assert StubOpenAI.calls > 12  # some calls were 429'd and retried
+
+def test_rate_limiter_waits_for_window():
+    now = [0.0]; slept = []
+    lim = rll.RateLimiter(rpm=2, clock=lambda: now[0], sleep=lambda s: (slept.append(s), now.__setitem__(0, now[0] + s)))
+    for _ in range(3):
+        lim.acquire()
+    assert slept == [60.0]
+
+def test_response_cache_skips_network_on_rerun(stub_server, tmp_path):
+    from sqlite_cache import SqliteCache
+    failing = [(f"R{i}", {"id": f"R{i}", "type": "nfr", "text": f"Service {i} must be robust"}, ["vague wording: robust"])
+               for i in range(4)]
+    client = rll.llm_client()
+    with SqliteCache(tmp_path / "llm.sqlite") as cache:
+        first = rll.advise_all(client, "stub", failing, concurrency=2, max_retries=3, cache=cache)
+        assert (cache.hits, cache.misses) == (0, 4)
+    calls = StubOpenAI.calls
+    with SqliteCache(tmp_path / "llm.sqlite") as cache:
+        assert rll.advise_all(client, "stub", failing, concurrency=2, cache=cache) == first
+        assert (cache.hits, cache.misses) == (4, 0)
+        changed = failing[:1] + [("R9", {"type": "nfr", "text": "Other text"}, ["x"])]
+        assert rll.advise_all(None, "stub", changed, cache=cache, cache_only=True) == [first[0], None]
+    assert StubOpenAI.calls == calls
+
+def test_batched_prompts_split_and_retry_missing(stub_server):
+    failing = [(f"R{i}", {"id": f"R{i}", "type": "nfr", "text": f"Queue {i} should be scalable"}, ["vague wording: scalable"])
+               for i in range(10)]
+    out = rll.advise_all(rll.llm_client(), "stub", failing, concurrency=3, max_retries=3, batch_size=4)
+    assert out == [f"Requirement: Queue {i} should be scalable (rewritten)" for i in range(10)]
+    assert StubOpenAI.batches == 3  # 4 + 4 + 2; the last id of each batch was re-asked singly
+
+def test_batched_replies_do_not_mix_up_repeated_ids(stub_server):
+    failing = [(rid, {"type": "nfr", "text": f"Cache {i} should be fast"}, ["vague wording: fast"])
+               for i, rid in enumerate(["R1", "R1", "?", "?"])]
+    out = rll.advise_all(rll.llm_client(), "stub", failing, max_retries=3, batch_size=4)
+    assert out == [f"Requirement: Cache {i} should be fast (rewritten)" for i in range(4)]
+
+def test_make_batches_respects_token_budget():
+    items = [(f"R{i}", {"type": "nfr", "text": "x" * 400}, ["vague"]) for i in range(10)]
+    sizes = [len(b) for b in rll.make_batches(items, 50, rll.estimate_tokens(rll.SYSTEM_PROMPT, rll.BATCH_INSTRUCTIONS) + 1000)]
+    assert sum(sizes) == 10 and max(sizes) < 10
+
+def test_batched_answers_cached_under_their_own_prompt(stub_server, tmp_path, monkeypatch):
+    from sqlite_cache import SqliteCache
+    failing = [(f"R{i}", {"type": "nfr", "text": f"Index {i} should be quick"}, ["vague wording: quick"]) for i in range(3)]
+    with SqliteCache(tmp_path / "llm.sqlite") as cache:
+        out = rll.advise_all(rll.llm_client(), "stub", failing, max_retries=3, cache=cache, batch_size=3)
+        # R0 and R1 came from the batch prompt, R2 was re-asked with the single prompt
+        assert rll.advise_all(None, "stub", failing, cache=cache, cache_only=True) == [None, None, out[2]]
+        assert rll.advise_all(None, "stub", failing, cache=cache, cache_only=True, batch_size=3) == out
+        monkeypatch.setattr(rll, "BATCH_INSTRUCTIONS", rll.BATCH_INSTRUCTIONS + "\nBe brief.")
+        assert rll.advise_all(None, "stub", failing, cache=cache, cache_only=True, batch_size=3) == [None, None, out[2]]
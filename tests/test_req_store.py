@@ -0,0 +1,61 @@
+import json, pathlib, subprocess, sys
+import generate_mermaid_er, req_io, req_lint
+from req_store import RequirementStore
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+SAMPLE = ROOT / "samples" / "requirements.yaml"
+
+REQS = [
+    {"id": "P1", "type": "nfr", "priority": "H", "category": "performance", "text": "Payments p95 latency < 150 ms"},
+    {"id": "P2", "type": "nfr", "priority": "M", "category": "performance", "text": "Payment capture p95 latency < 400 ms"},
+    {"id": "F1", "type": "func", "priority": "H", "text": "User can refund a payment", "acceptance": ["Refund appears within a day"]},
+    {"id": "F2", "type": "func", "priority": "L", "text": "User can export invoices", "acceptance": []},
+]
+
+def ids(rows):
+    return [r["id"] for r in rows]
+
+def test_upsert_and_query(tmp_path):
+    with RequirementStore(tmp_path / "reqs.sqlite") as st:
+        assert st.upsert(REQS) == {"added": 4, "updated": 0, "unchanged": 0}
+        before = st.fingerprint()
+        assert ids(st.query(match="payment", type="nfr", metrics=[("latency p95", "<", 200)])) == ["P1"]  # stemmed: Payments
+        assert ids(st.query(type="func", missing=["acceptance"])) == ["F2"]
+        assert st.count(missing=["category"]) == 2 and st.count(priority="H", category="performance") == 1
+        changed = {**REQS[0], "text": "Checkout p95 latency < 900 ms"}
+        assert st.upsert([changed, REQS[1]]) == {"added": 0, "updated": 1, "unchanged": 1}
+        assert st.fingerprint() != before
+        assert ids(st.query(match="payment")) == ["P2", "F1"] and ids(st.query(match="checkout")) == ["P1"]
+        assert st.count(metrics=[("latency p95", "<", 200)]) == 0
+        assert ids(st.query()) == ["P1", "P2", "F1", "F2"]  # updates keep their position
+
+def test_metrics_reparsed_when_req_lint_changes(tmp_path, monkeypatch):
+    with RequirementStore(tmp_path / "reqs.sqlite") as st:
+        st.upsert(REQS)
+        monkeypatch.setattr(req_lint, "metric_targets", lambda r, scan=None: iter([("latency p95", 1.0)]))
+        assert st.upsert(REQS) == {"added": 0, "updated": 0, "unchanged": 4}
+        assert st.count(metrics=[("latency p95", "<", 2)]) == 0  # same req_lint: rows kept as parsed
+        before = st.fingerprint()
+        monkeypatch.setattr(req_lint, "ruleset_hash", lambda: "changed")
+        assert st.upsert([]) == {"added": 0, "updated": 0, "unchanged": 0}
+        assert st.count(metrics=[("latency p95", "<", 2)]) == 4 and st.fingerprint() != before
+
+def test_tools_read_a_store(tmp_path):
+    store = tmp_path / "reqs.sqlite"
+    req_io.dump_package(req_io.load_package(SAMPLE), store)
+    assert list(req_io.iter_package(store)) == req_io.load_package(SAMPLE)["requirements"]
+    lint = lambda p: subprocess.run([sys.executable, str(ROOT / "tools" / "req_lint.py"), str(p)], capture_output=True, text=True)
+    assert lint(store).stdout == lint(SAMPLE).stdout
+    er = lambda p: generate_mermaid_er.render_er(generate_mermaid_er.Requirements(p))
+    assert er(store) == er(SAMPLE)
+
+def test_query_cli(tmp_path):
+    store = tmp_path / "reqs.sqlite"
+    with RequirementStore(store) as st:
+        st.upsert(REQS)
+    q = lambda *args: subprocess.run([sys.executable, str(ROOT / "tools" / "req_query.py"), str(store), *args], capture_output=True, text=True)
+    assert q("--type", "nfr", "--metric", "latency p95 <= 400", "--count").stdout == "2\n"
+    assert q("--match", "refund").stdout == "F1 [func/H] User can refund a payment\n"
+    assert [json.loads(l)["id"] for l in q("--priority", "H", "--format", "jsonl").stdout.splitlines()] == ["P1", "F1"]
+    bad = q("--metric", "latency ~ 3")
+    assert bad.returncode == 1 and "bad --metric" in bad.stderr
@@ -0,0 +1,30 @@
+import json, pathlib, subprocess, sys
+import req_validate as rv
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+SCHEMA = json.loads((ROOT / "tools" / "req_schema.json").read_text())
+
+def test_reports_every_error_with_path_and_streams_records(tmp_path):
+    pkg = tmp_path / "pkg.jsonl"
+    pkg.write_text('{"id":"R1","type":"nfr","text":"p95 < 300 ms","priority":"X"}\n'
+                   '{"id":"R2","type":"bogus","text":"abc","priority":"M"}\n'
+                   '{"id":"R3","type":"func","text":"User can log in","priority":"M"}\n', encoding="utf-8")
+    seen = []
+    errors = list(rv.validate_package(pkg, SCHEMA, on_record=lambda r: seen.append(r["id"])))
+    assert errors == [
+        ("/requirements/0/priority", "'X' is not one of ['H', 'M', 'L']"),
+        ("/requirements/1/text", "'abc' is too short"),
+        ("/requirements/1/type", "'bogus' is not one of ['func', 'nfr']"),
+    ]
+    assert seen == ["R3"]  # only records that passed the schema
+
+def test_lint_skips_records_that_failed_the_schema(tmp_path):
+    pkg = tmp_path / "pkg.jsonl"
+    pkg.write_text('{"id":"R1","type":"nfr","text":null,"priority":"H"}\n'
+                   '{"id":"R2","type":"nfr","text":["p95 < 300 ms"],"priority":"H"}\n'
+                   '{"id":"R3","type":"nfr","text":"The system should be fast","priority":"H"}\n', encoding="utf-8")
+    run = subprocess.run([sys.executable, str(ROOT / "tools" / "req_validate.py"), str(pkg), "--schema",
+                          str(ROOT / "tools" / "req_schema.json"), "--lint"], capture_output=True, text=True)
+    assert run.returncode == 1 and "Traceback" not in run.stderr
+    assert "- /requirements/0/text: None is not of type 'string'" in run.stdout
+    assert "R3" in run.stdout and "R1:" not in run.stdout
@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+"""
+Batch A→A: render many architecture briefs × target styles in a process pool.
+
+Briefs come from files, directories (searched recursively for *.yaml/*.yml/*.md), globs, or a manifest:
+  briefs:
+    - source: briefs/payments.yaml
+      system_name: Payments      # optional: overrides the brief's system name
+      styles: [event-driven]     # optional: overrides --styles
+      outdir: payments           # optional: subdirectory (default: the brief's file stem)
+      adr_id: "0007"
+Artifacts go to <outdir>/<system>/<style>/... . Files are rewritten only when their content changes
+(an ADR that differs only in its Date line counts as unchanged), so re-runs don't churn mtimes or diffs.
+
+Usage:
+  python tools/a2a_batch.py briefs/ --styles microservices event-driven medallion --outdir docs/a2a/systems --jobs 8
+  python tools/a2a_batch.py --manifest briefs.yaml --outdir docs/a2a/systems
+"""
+import argparse, glob, os, pathlib, re, sys, time
+from concurrent.futures import ProcessPoolExecutor
+from a2a_transform import load_source, transform, infer_system_name
+from req_io import load_yaml
+
+STYLES = ["microservices", "event-driven", "medallion"]
+BRIEF_SUFFIXES = {".yaml", ".yml", ".md"}
+_DATE = re.compile(r"^- \*\*Date\*\*: .*$", re.M)
+
+def expand_briefs(specs):
+    out = set()
+    for s in specs:
+        p = pathlib.Path(s)
+        if p.is_dir():
+            out.update(x for x in p.rglob("*") if x.is_file() and x.suffix.lower() in BRIEF_SUFFIXES)
+        elif p.is_file():
+            out.add(p)
+        else:
+            out.update(pathlib.Path(x) for x in glob.glob(s, recursive=True) if pathlib.Path(x).is_file())
+    return sorted(out)
+
+def plan(briefs, styles, outdir, adr_id="0001", c4=None):
+    """One job per brief; briefs are dicts (manifest entries) or paths. c4: transform() diagram options."""
+    jobs, seen = [], {}
+    for b in briefs:
+        b = b if isinstance(b, dict) else {"source": str(b)}
+        sub = b.get("outdir") or pathlib.Path(b["source"]).stem
+        if sub in seen:
+            raise ValueError(f"{b['source']} and {seen[sub]} would both write to {sub}/ (set `outdir` in a manifest)")
+        seen[sub] = b["source"]
+        jobs.append({"source": b["source"], "system_name": b.get("system_name"), "styles": list(b.get("styles") or styles),
+                     "adr_id": str(b.get("adr_id", adr_id)), "outdir": str(pathlib.Path(outdir) / sub), "c4": c4 or {}})
+    return jobs
+
+def write_if_content_changed(p, text):
+    """Write unless the file already holds this text, ignoring an ADR's Date line; True if written."""
+    p = pathlib.Path(p)
+    try:
+        old = p.read_text(encoding="utf-8")
+        if old == text or _DATE.sub("", old) == _DATE.sub("", text):
+            return False
+    except FileNotFoundError:
+        p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_bytes(text.encode("utf-8"))
+    return True
+
+def render_brief(job):
+    """Render one brief in every requested style (runs in a worker process)."""
+    t0 = time.perf_counter()
+    res = {"source": job["source"], "outdir": job["outdir"], "styles": len(job["styles"]),
+           "files": 0, "written": 0, "bytes": 0}
+    try:
+        data = load_source(pathlib.Path(job["source"]))
+        res["system"] = infer_system_name(data, job["system_name"])
+        for style in job["styles"]:
+            for rel, text in transform(data, style, job["system_name"], job["adr_id"], **job.get("c4", {})).items():
+                res["files"] += 1
+                res["bytes"] += len(text.encode("utf-8"))
+                res["written"] += write_if_content_changed(pathlib.Path(job["outdir"]) / style / rel, text)
+    except Exception as e:  # one bad brief shouldn't stop the batch
+        res["error"] = f"{type(e).__name__}: {e}"
+    res["seconds"] = time.perf_counter() - t0
+    return res
+
+def run_batch(jobs, workers=1):
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            return list(ex.map(render_brief, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+    return [render_brief(j) for j in jobs]
+
+def render_summary(results, seconds, workers):
+    w = max([len("brief")] + [len(r["source"]) for r in results])
+    lines = [f"{'brief':<{w}}  {'system':<24} {'styles':>6} {'files':>5} {'written':>7} {'KB':>8} {'ms':>8}"]
+    for r in results:
+        if "error" in r:
+            lines.append(f"{r['source']:<{w}}  ERROR {r['error']}")
+            continue
+        lines.append(f"{r['source']:<{w}}  {r['system'][:24]:<24} {r['styles']:>6} {r['files']:>5} {r['written']:>7} "
+                     f"{r['bytes'] / 1024:>8.1f} {r['seconds'] * 1000:>8.1f}")
+    ok = [r for r in results if "error" not in r]
+    files = sum(r["files"] for r in ok); written = sum(r["written"] for r in ok)
+    lines.append(f"{len(results)} briefs, {sum(r['styles'] for r in ok)} renders: {files} files "
+                 f"({written} written, {files - written} unchanged), {sum(r['bytes'] for r in ok) / 1e6:.2f} MB "
+                 f"in {seconds:.2f} s (jobs={workers})" + (f"; {len(results) - len(ok)} failed" if len(ok) < len(results) else ""))
+    return "\n".join(lines)
+
+def main():
+    ap = argparse.ArgumentParser(description="Render A→A artifacts for many briefs × styles")
+    ap.add_argument("briefs", nargs="*", help="brief files, directories or globs")
+    ap.add_argument("--manifest", help="YAML with a `briefs:` list (source, system_name, styles, outdir, adr_id)")
+    ap.add_argument("--styles", nargs="+", choices=STYLES, default=STYLES)
+    ap.add_argument("--outdir", default="docs/a2a/systems")
+    ap.add_argument("--adr-id", default="0001")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="worker processes")
+    ap.add_argument("--partition", choices=["auto", "domain", "community", "off"], default="auto", help="C4 partitioning (see a2a_transform.py)")
+    ap.add_argument("--max-nodes", type=int, default=40)
+    ap.add_argument("--max-edges", type=int, default=80)
+    a = ap.parse_args()
+    if not a.briefs and not a.manifest:
+        ap.error("give brief paths and/or --manifest")
+
+    briefs = expand_briefs(a.briefs)
+    if a.manifest:
+        base = pathlib.Path(a.manifest).parent
+        for b in load_yaml(a.manifest).get("briefs") or []:
+            b = dict(b) if isinstance(b, dict) else {"source": b}
+            bad = [s for s in b.get("styles") or [] if s not in STYLES]
+            if bad:
+                sys.exit(f"{a.manifest}: unknown style(s) for {b['source']}: {', '.join(bad)}")
+            b["source"] = str(base / b["source"])
+            briefs.append(b)
+    if not briefs:
+        sys.exit("No briefs matched")
+    try:
+        jobs = plan(briefs, a.styles, a.outdir, a.adr_id, {"partition": a.partition, "max_nodes": a.max_nodes, "max_edges": a.max_edges})
+    except ValueError as e:
+        sys.exit(str(e))
+
+    t0 = time.perf_counter()
+    results = run_batch(jobs, a.jobs)
+    print(render_summary(results, time.perf_counter() - t0, a.jobs))
+    if any("error" in r for r in results):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
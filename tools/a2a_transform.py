@@ -1,10 +1,12 @@
 #!/usr/bin/env python
-import argparse, pathlib, yaml, datetime as dt, re
+import argparse, pathlib, datetime as dt, re
+import instrument
+from req_io import loads_yaml
 from typing import Dict, Any, List
 
 def load_source(p: pathlib.Path) -> Dict[str, Any]:
     if p.suffix.lower() in {".yml",".yaml"}:
-        return yaml.safe_load(p.read_text(encoding="utf-8"))
+        return loads_yaml(p.read_text(encoding="utf-8"))
     data={"system":None,"domains":[],"services":[],"datastores":[],"integrations":[],
           "quality_attributes":{},"pain_points":[]}
     cur=None
@@ -169,6 +171,30 @@ def mk_c4_containers(system, style, svcs, datastores):
             lines.append(f'Rel(s{i}, broker, "publish/subscribe")')
     return "\n".join(lines)+"\n"
 
+def transform(data, style, system_name=None, adr_id="0001", partition="auto", max_nodes=40, max_edges=80):
+    """Render every A→A artifact for one brief; returns {relative path: text}.
+    C4 diagrams are partitioned (see c4_partition.py) when forced, or in auto mode when the flat
+    diagrams would exceed max_nodes / max_edges."""
+    import c4_partition
+    system= infer_system_name(data, system_name)
+    svcs = list_service_names(data)
+    datastores=[(d["name"] if isinstance(d,dict) else str(d)) for d in data.get("datastores",[])]
+    integrations=[(x["name"] if isinstance(x,dict) else str(x)) for x in data.get("integrations",[])]
+    files = {
+        f"adr/ADR-{adr_id}-{style}.md": mk_adr(system,style,data,adr_id),
+        "backlog.md": mk_backlog(system,style,svcs),
+        "c4/context.mmd": mk_c4_context(system,svcs,integrations),
+        "c4/containers.mmd": mk_c4_containers(system,style,svcs,datastores),
+    }
+    files.update(c4_partition.render(data, style, system, partition, max_nodes, max_edges) or {})
+    return files
+
+def write_outputs(outdir, files):
+    outdir=pathlib.Path(outdir)
+    for rel, text in files.items():
+        (outdir/rel).parent.mkdir(parents=True, exist_ok=True)
+        (outdir/rel).write_text(text, encoding="utf-8")
+
 def main():
     ap=argparse.ArgumentParser(description="Architecture-to-Architecture transformer")
     ap.add_argument("source", help="YAML or Markdown brief of current architecture")
@@ -176,21 +202,21 @@ def main():
     ap.add_argument("--system-name", default=None)
     ap.add_argument("--outdir", default="docs/a2a")
     ap.add_argument("--adr-id", default="0001")
+    ap.add_argument("--partition", choices=["auto","domain","community","off"], default="auto",
+                    help="split C4 diagrams by service domain or call-graph community (auto: only when over budget)")
+    ap.add_argument("--max-nodes", type=int, default=40, help="node budget per C4 diagram")
+    ap.add_argument("--max-edges", type=int, default=80, help="edge budget per C4 diagram")
+    instrument.add_arguments(ap)
     a=ap.parse_args()
-
-    p=pathlib.Path(a.source)
-    data=load_source(p)
-    system= infer_system_name(data, a.system_name)
-    svcs = list_service_names(data)
-    datastores=[(d["name"] if isinstance(d,dict) else str(d)) for d in data.get("datastores",[])]
-    integrations=[(x["name"] if isinstance(x,dict) else str(x)) for x in data.get("integrations",[])]
-
-    outdir=pathlib.Path(a.outdir); (outdir/"adr").mkdir(parents=True, exist_ok=True); (outdir/"c4").mkdir(parents=True, exist_ok=True)
-
-    (outdir/"adr"/f"ADR-{a.adr_id}-{a.target_style}.md").write_text(mk_adr(system,a.target_style,data,a.adr_id), encoding="utf-8")
-    (outdir/"backlog.md").write_text(mk_backlog(system,a.target_style,svcs), encoding="utf-8")
-    (outdir/"c4"/"context.mmd").write_text(mk_c4_context(system,svcs,integrations), encoding="utf-8")
-    (outdir/"c4"/"containers.mmd").write_text(mk_c4_containers(system,a.target_style,svcs,datastores), encoding="utf-8")
+    tm=instrument.from_args("a2a_transform", a)
+
+    with tm.stage("load"):
+        data=load_source(pathlib.Path(a.source))
+    outdir=pathlib.Path(a.outdir)
+    with tm.stage("transform"):
+        files=transform(data, a.target_style, a.system_name, a.adr_id, a.partition, a.max_nodes, a.max_edges)
+    with tm.stage("write"):
+        write_outputs(outdir, files)
     print(f"Generated ADR, backlog, and C4 skeletons under {outdir}/")
 
 if __name__=="__main__":
@@ -1,5 +1,7 @@
 #!/usr/bin/env python
-import argparse, json, datetime as dt, pathlib
+import argparse, datetime as dt, pathlib
+import instrument
+from req_io import load_scores
 
 TEMPLATES = {
   "monolith": [
@@ -16,14 +18,9 @@ TEMPLATES = {
   ]
 }
 
-if __name__ == "__main__":
-  ap = argparse.ArgumentParser(description="Create an ADR from decision_scores.json")
-  ap.add_argument("--scores", default="docs/decisions/decision_scores.json")
-  ap.add_argument("--adr-id", default="010")
-  ap.add_argument("--outdir", default="docs/decisions")
-  args = ap.parse_args()
-
-  data = json.loads(pathlib.Path(args.scores).read_text(encoding="utf-8"))
+def render_adr(data, adr_id):
+  """Markdown ADR for the best option in a decision scores document; returns (kind, text).
+  `scored` may hold just the top rows (load_scores(top_k=...)); "count" says how many there were."""
   scored = data["scored"]; prof = data["profile"]
   best = scored[0]
   today = dt.date.today().isoformat()
@@ -32,7 +29,7 @@ if __name__ == "__main__":
   pros_cons = TEMPLATES.get(kind, [])
 
   lines = []
-  lines.append(f"# ADR {args.adr_id}: Select {kind} architecture — {best['name']}\n")
+  lines.append(f"# ADR {adr_id}: Select {kind} architecture — {best['name']}\n")
   lines.append(f"- **Status**: Proposed")
   lines.append(f"- **Date**: {today}")
   lines.append(f"- **System**: {system}\n")
@@ -52,6 +49,26 @@ if __name__ == "__main__":
   for s in scored[1:]:
     suffix = "" if s["ok"] else " (DISQUALIFIED)"
     lines.append(f"- {s['name']} — score {s['overall']:.3f}{suffix}")
+  more = data.get("count", len(scored)) - len(scored)
+  if more > 0:
+    lines.append(f"- … and {more} more (see decision scores)")
+  return kind, "\n".join(lines) + "\n"
+
+if __name__ == "__main__":
+  ap = argparse.ArgumentParser(description="Create an ADR from decision scores (.jsonl, or the pretty .json export)")
+  ap.add_argument("--scores", default="docs/decisions/decision_scores.jsonl")
+  ap.add_argument("--alternatives", type=int, default=10, help="list at most N alternatives (only those rows are read)")
+  ap.add_argument("--adr-id", default="010")
+  ap.add_argument("--outdir", default="docs/decisions")
+  instrument.add_arguments(ap)
+  args = ap.parse_args()
+  tm = instrument.from_args("adr_from_score", args)
+
+  with tm.stage("load"):
+    data = load_scores(args.scores, top_k=args.alternatives + 1)
+  with tm.stage("render"):
+    kind, text = render_adr(data, args.adr_id)
   out = pathlib.Path(args.outdir) / f"ADR-{args.adr_id}-{kind}.md"
-  out.write_text("\n".join(lines) + "\n", encoding="utf-8")
+  with tm.stage("write"):
+    out.write_text(text, encoding="utf-8")
   print(f"Wrote {out}")
@@ -1,5 +1,7 @@
 #!/usr/bin/env python
-import argparse, yaml, pathlib, json, datetime as dt
+import argparse, pathlib, datetime as dt
+import instrument
+from req_io import dump_scores, load_yaml
 
 LOWER_BETTER = {"performance_p95_ms","cost_monthly_usd","time_to_market_weeks"}
 HIGHER_BETTER = {"availability_pct","operability_score","scalability_score","security_score"}
@@ -12,8 +14,6 @@ def norm_score(metric, val, lo, hi):
     else:                        # higher is better
         return clamp01((val - lo) / (hi - lo))
 
-def load_yaml(p): return yaml.safe_load(pathlib.Path(p).read_text(encoding="utf-8"))
-
 def check_constraints(metrics, constraints):
     msgs=[]; ok=True
     for c in constraints or []:
@@ -23,22 +23,16 @@ def check_constraints(metrics, constraints):
         if mx is not None and v > mx: ok=False; msgs.append(f"{m}={v} > max {mx}")
     return ok, msgs
 
-def main():
-    ap=argparse.ArgumentParser(description="Score architecture options vs NFR profile")
-    ap.add_argument("--profile", required=True)
-    ap.add_argument("--options", required=True)
-    ap.add_argument("--outdir", default="docs/decisions")
-    args=ap.parse_args()
-
-    prof=load_yaml(args.profile)
-    opts=load_yaml(args.options)["options"]
+def score_options(prof, opts, with_index=False):
+    """Score and rank options against the profile; best (constraint-satisfying, highest) first.
+    with_index: also return each row's position in opts (to join per-option results back)."""
     weights=prof["weights"]; bounds=prof["bounds"]
 
     total=sum(weights.values()) or 1.0
     weights={k:v/total for k,v in weights.items()}
 
     scored=[]
-    for opt in opts:
+    for i, opt in enumerate(opts):
         m=opt["metrics"]
         ok,viol=check_constraints(m, prof.get("hard_constraints"))
         per={}
@@ -54,20 +48,404 @@ def main():
             "raw": m, "notes": opt.get("notes",[]), "risks": opt.get("risks",[])
         })
 
-    scored.sort(key=lambda x: (x["ok"], x["overall"]), reverse=True)
-    best=scored[0]
+    order=sorted(range(len(scored)), key=lambda i: (scored[i]["ok"], scored[i]["overall"]), reverse=True)
+    scored=[scored[i] for i in order]
+    return (scored, order) if with_index else scored
 
-    outdir=pathlib.Path(args.outdir); outdir.mkdir(parents=True, exist_ok=True)
-    (outdir/"decision_scores.json").write_text(json.dumps({"profile":prof,"scored":scored}, indent=2), encoding="utf-8")
+# ---- matrix engine: options × metrics arrays, identical results to score_options() ----
+
+class ScoreMatrix:
+    """Vectorized scores for many options: per (n×m normalized), overall (n, rounded like the
+    loop engine), ok (n, hard-constraint mask)."""
+    def __init__(self, prof, opts):
+        import numpy as np
+        weights=prof["weights"]; bounds=prof["bounds"]
+        total=sum(weights.values()) or 1.0
+        self.metrics=list(weights)
+        w=np.array([weights[k]/total for k in self.metrics])
+        lo=np.array([bounds[k][0] for k in self.metrics], dtype=float)
+        hi=np.array([bounds[k][1] for k in self.metrics], dtype=float)
+        self.X=np.array([[o["metrics"][k] for k in self.metrics] for o in opts], dtype=float).reshape(len(opts), len(self.metrics))
+        lower=np.array([k in LOWER_BETTER for k in self.metrics])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.per=np.clip(np.where(lower, (hi - self.X) / (hi - lo), (self.X - lo) / (hi - lo)), 0.0, 1.0)
+        overall=np.zeros(len(opts))
+        for j in range(len(self.metrics)):  # same left-to-right sum as the loop engine
+            overall=overall + w[j]*self.per[:, j]
+        self.overall=np.array([round(x, 4) for x in overall.tolist()])
+        self.ok=self.constraint_mask(opts, prof.get("hard_constraints"))
+
+    @staticmethod
+    def constraint_mask(opts, constraints):
+        import numpy as np
+        ok=np.ones(len(opts), dtype=bool)
+        for c in constraints or []:
+            m=c["metric"]; mn=c.get("min"); mx=c.get("max")
+            v=np.array([np.nan if o["metrics"].get(m) is None else o["metrics"][m] for o in opts], dtype=float)
+            # NaN (metric not given) compares False, i.e. is not a violation
+            if mn is not None: ok &= ~(v < mn)
+            if mx is not None: ok &= ~(v > mx)
+        return ok
+
+    def ranking(self, top_k=None):
+        """Indices best-first, with the loop engine's tie order (stable on input order)."""
+        import numpy as np
+        n=len(self.overall)
+        key=self.ok.astype(float)*2.0 + self.overall  # ok options always outrank disqualified ones
+        if top_k is not None and top_k < n:
+            thr=np.partition(key, n - top_k)[n - top_k]
+            above=np.flatnonzero(key > thr)
+            cand=np.concatenate([above, np.flatnonzero(key == thr)[:top_k - len(above)]])
+        else:
+            cand=np.arange(n)
+        order=np.lexsort((cand, -key[cand]))
+        return cand[order]
+
+def score_options_matrix(prof, opts, top_k=None, with_index=False):
+    """score_options() on the matrix engine; only the top_k rows are materialized as dicts."""
+    sm=ScoreMatrix(prof, opts)
+    scored=[]
+    order=sm.ranking(top_k).tolist()
+    for i in order:
+        opt=opts[i]; m=opt["metrics"]
+        _,viol=check_constraints(m, prof.get("hard_constraints"))
+        scored.append({
+            "name": opt["name"], "kind": opt.get("kind",""),
+            "ok": bool(sm.ok[i]), "violations": viol,
+            "overall": float(sm.overall[i]),
+            "per_metric": {k: round(float(sm.per[i, j]),3) for j,k in enumerate(sm.metrics)},
+            "raw": m, "notes": opt.get("notes",[]), "risks": opt.get("risks",[])
+        })
+    return (scored, order) if with_index else scored
+
+# ---- Monte Carlo sensitivity: Dirichlet weight perturbation + declared metric uncertainty ----
+#
+# options.yaml may declare per-metric uncertainty next to the nominal metrics:
+#   uncertainty: { performance_p95_ms: [300, 420],   # [low, high] range, triangular around nominal
+#                  cost_monthly_usd: 0.15 }          # ±15% of nominal
+# Weights are drawn from Dirichlet(concentration × normalized profile weights).
+
+def _mc_arrays(prof, opts):
+    import numpy as np
+    weights=prof["weights"]; bounds=prof["bounds"]
+    total=sum(weights.values()) or 1.0
+    wm=list(weights)
+    cons=prof.get("hard_constraints") or []
+    names=wm + sorted({c["metric"] for c in cons} - set(wm))
+    n, M = len(opts), len(names)
+    base=np.full((n, M), np.nan); lo=np.full((n, M), np.nan); hi=np.full((n, M), np.nan)
+    for i,o in enumerate(opts):
+        unc=o.get("uncertainty") or {}
+        for j,k in enumerate(names):
+            v=o["metrics"].get(k)
+            if v is None: continue
+            u=unc.get(k)
+            if isinstance(u, (list, tuple)): a,b=float(u[0]), float(u[1])
+            elif u is not None: a,b=v*(1-float(u)), v*(1+float(u))
+            else: a=b=v
+            base[i,j]=v; lo[i,j]=min(a, v); hi[i,j]=max(b, v)
+    return {
+        "base": base, "lo": lo, "hi": hi, "nw": len(wm),
+        "w": np.array([weights[k]/total for k in wm]),
+        "blo": np.array([bounds[k][0] for k in wm], dtype=float),
+        "bhi": np.array([bounds[k][1] for k in wm], dtype=float),
+        "lower": np.array([k in LOWER_BETTER for k in wm]),
+        "cons": [(names.index(c["metric"]), c.get("min"), c.get("max")) for c in cons],
+    }
+
+def _mc_chunk(arrays, samples, seed, concentration, ranks_kept, batch):
+    """Score `samples` perturbed scenarios; returns counts to be summed across chunks."""
+    import numpy as np
+    A=arrays; rng=np.random.default_rng(seed)
+    n=A["base"].shape[0]; R=min(ranks_kept, n)
+    first=np.zeros(n, dtype=np.int64); viol=np.zeros(n, dtype=np.int64)
+    rank_sum=np.zeros(n); hist=np.zeros((n, R + 1), dtype=np.int64)
+    span=A["hi"] - A["lo"]
+    c=np.divide(A["base"] - A["lo"], span, out=np.zeros_like(span), where=span > 0)
+    alpha=np.maximum(concentration * A["w"], 1e-6)
+    done=0
+    while done < samples:
+        B=min(batch, samples - done); done+=B
+        # metric scenarios: triangular(lo, nominal, hi) via inverse CDF (exact nominal when lo == hi)
+        u=rng.random((B,) + span.shape)
+        left=A["lo"] + np.sqrt(u * span * (A["base"] - A["lo"]))
+        right=A["hi"] - np.sqrt((1 - u) * span * (A["hi"] - A["base"]))
+        X=np.where(u < c, left, right)
+        W=rng.dirichlet(alpha, size=B)
+        Xw=X[:, :, :A["nw"]]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            per=np.clip(np.where(A["lower"], (A["bhi"] - Xw) / (A["bhi"] - A["blo"]),
+                                 (Xw - A["blo"]) / (A["bhi"] - A["blo"])), 0.0, 1.0)
+        overall=np.einsum("bnm,bm->bn", per, W)
+        ok=np.ones((B, n), dtype=bool)
+        for j,mn,mx in A["cons"]:
+            if mn is not None: ok &= ~(X[:, :, j] < mn)
+            if mx is not None: ok &= ~(X[:, :, j] > mx)
+        order=np.argsort(-(ok * 2.0 + overall), axis=1, kind="stable")
+        rank=np.empty_like(order); np.put_along_axis(rank, order, np.arange(n)[None, :], axis=1)
+        first+=np.bincount(order[:, 0], minlength=n)
+        viol+=(~ok).sum(0)
+        rank_sum+=rank.sum(0)
+        cell=np.arange(n)[None, :] * (R + 1) + np.minimum(rank, R)
+        hist+=np.bincount(cell.ravel(), minlength=n * (R + 1)).reshape(n, R + 1)
+    return first, viol, rank_sum, hist
 
+def sensitivity(prof, opts, samples=2000, concentration=50.0, seed=0, jobs=1, ranks_kept=5, chunk=500, batch=None):
+    """Per option (input order): probability of ranking first, of violating a hard constraint,
+    mean rank and the distribution over ranks 1..ranks_kept (last bucket: anything worse).
+    Samples are split into fixed chunks with their own seeds, so results don't depend on jobs."""
+    import numpy as np
+    A=_mc_arrays(prof, opts)
+    n=len(opts)
+    batch=batch or max(1, min(256, int(2e7 // max(1, n * A["base"].shape[1]))))
+    sizes=[min(chunk, samples - i) for i in range(0, samples, chunk)]
+    seeds=np.random.SeedSequence(seed).spawn(len(sizes))
+    args=[(A, k, sd, concentration, ranks_kept, batch) for k, sd in zip(sizes, seeds)]
+    if jobs > 1 and len(args) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=jobs) as ex:
+            parts=list(ex.map(_mc_chunk, *zip(*args)))
+    else:
+        parts=[_mc_chunk(*a) for a in args]
+    first, viol, rank_sum, hist=(sum(p[i] for p in parts) for i in range(4))
+    R=hist.shape[1] - 1
+    return [{
+        "p_first": round(float(first[i]) / samples, 4),
+        "p_violation": round(float(viol[i]) / samples, 4),
+        "mean_rank": round(float(rank_sum[i]) / samples + 1, 3),
+        "rank_dist": {**{str(r + 1): round(float(hist[i, r]) / samples, 4) for r in range(R)},
+                      **({f">{R}": round(float(hist[i, R]) / samples, 4)} if R < n else {})},
+    } for i in range(n)]
+
+def _attach(scored, index, key, values):
+    """Set row[key] from the per-option values; index[r] is row r's position among the options."""
+    for row, i in zip(scored, index):
+        row[key]=values[i]
+    return scored
+
+def attach_sensitivity(scored, index, sens):
+    """Add each option's sensitivity dict to its scored row (index as returned with_index)."""
+    return _attach(scored, index, "sensitivity", sens)
+
+# ---- Pareto fronts: non-dominated sorting over the LOWER_BETTER / HIGHER_BETTER metrics ----
+#
+# Bit-parallel dominance: rows are deduplicated, mapped to dense per-metric ranks and processed in
+# descending rank-sum order, so every dominator precedes what it dominates. Each finished block of
+# 4096 rows becomes, per metric, a table of "members ≥ threshold" bitsets; a later row's dominators
+# in the block are the AND of one bitset per metric (64 comparisons per word op). Block members are
+# laid out highest front first, so the first set bit is the dominator with the deepest front.
+
+def _suffix_bits(vals):
+    """Sorted vals and S: S[t] = bitset of members whose value ≥ the t-th smallest value."""
+    import numpy as np
+    c=len(vals)
+    srt=np.argsort(vals, kind="stable")
+    S=np.zeros((c + 1, (c + 63) >> 6), dtype=np.uint64)
+    S[np.arange(c), srt >> 6]=np.left_shift(np.uint64(1), (srt & 63).astype(np.uint64))
+    d=1
+    while d <= c:  # suffix OR by doubling
+        S[:-d] |= S[d:]; d*=2
+    return vals[srt], S
+
+def _dominator_bits(tables, rows):
+    import numpy as np
+    acc=None
+    for j, (sv, S) in enumerate(tables):
+        g=S[np.searchsorted(sv, rows[:, j], "left")]
+        acc=g if acc is None else np.bitwise_and(acc, g, out=acc)
+    return acc
+
+def _first_bit(bits):
+    import numpy as np
+    nz=bits != 0
+    has=nz.any(1)
+    w=nz.argmax(1)
+    word=bits[np.arange(len(bits)), w]
+    low=np.where(has, word & (~word + np.uint64(1)), np.uint64(1))
+    return has, (w << 6) + np.log2(low.astype(np.float64)).astype(np.int64)
+
+def pareto_ranks(X, block=4096, rows=16384):
+    """Front number (1 = non-dominated) of every row of X (n × m, larger is better in every column)."""
+    import numpy as np
+    X=np.asarray(X, dtype=float)
+    n=len(X)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    m=X.shape[1]
+    R=np.empty((n, m), dtype=np.int32)
+    for j in range(m):
+        R[:, j]=np.unique(X[:, j], return_inverse=True)[1].ravel()
+    U, inv=np.unique(R, axis=0, return_inverse=True)  # equal rows share a front; distinct ≥ rows dominate
+    inv=inv.ravel(); u=len(U)
+    order=np.argsort(-U.sum(1, dtype=np.int64), kind="stable")
+    U=U[order]
+    front=np.ones(u, dtype=np.int64)
+    for s in range(0, u, block):
+        e=min(s + block, u)
+        B=U[s:e]
+        # within the block: dominators precede, so one forward pass settles the fronts
+        D=np.unpackbits(_dominator_bits([_suffix_bits(B[:, j]) for j in range(m)], B).view(np.uint8),
+                        axis=1, bitorder="little")[:, :e - s].astype(bool)
+        f=front[s:e]
+        for i in np.flatnonzero(D.sum(1) > 1):  # a row always "dominates" itself
+            d=np.flatnonzero(D[i, :i])
+            if len(d): f[i]=max(f[i], f[d].max() + 1)
+        if e == u:
+            break
+        q=np.argsort(-f, kind="stable")
+        tables=[_suffix_bits(B[q, j]) for j in range(m)]
+        fq=f[q]
+        for a in range(e, u, rows):
+            b=min(a + rows, u)
+            has, pos=_first_bit(_dominator_bits(tables, U[a:b]))
+            front[a:b]=np.where(has, np.maximum(front[a:b], fq[pos] + 1), front[a:b])
+    out=np.empty(u, dtype=np.int64); out[order]=front
+    return out[inv]
+
+def crowding_distance(X, fronts):
+    """NSGA-II crowding distance within each front (inf for a front's extreme points)."""
+    import numpy as np
+    X=np.asarray(X, dtype=float); fronts=np.asarray(fronts)
+    n=len(X)
+    cd=np.zeros(n)
+    for j in range(X.shape[1] if n else 0):
+        o=np.lexsort((X[:, j], fronts))
+        v=X[o, j]; f=fronts[o]
+        start=np.r_[True, f[1:] != f[:-1]]; end=np.r_[f[1:] != f[:-1], True]
+        seg=np.cumsum(start) - 1
+        span=v[end][seg] - v[start][seg]
+        gap=np.zeros(n); gap[1:-1]=v[2:] - v[:-2]
+        c=np.divide(gap, span, out=np.zeros(n), where=span > 0)
+        c[start | end]=np.inf
+        cd[o]+=c
+    return cd
+
+def pareto(prof, opts):
+    """Per option (input order): {"pareto_front", "crowding"} among hard-constraint-satisfying options,
+    compared on the profile's metrics in raw units. Disqualified options get None; an infinite
+    crowding distance (a front's extreme point) is reported as None too."""
+    import numpy as np
+    metrics=[k for k in prof["weights"] if k in LOWER_BETTER or k in HIGHER_BETTER]
+    ok=ScoreMatrix.constraint_mask(opts, prof.get("hard_constraints"))
+    idx=np.flatnonzero(ok)
+    sign=np.array([-1.0 if k in LOWER_BETTER else 1.0 for k in metrics])
+    X=np.array([[opts[i]["metrics"][k] for k in metrics] for i in idx.tolist()], dtype=float).reshape(len(idx), len(metrics)) * sign
+    fronts=pareto_ranks(X)
+    crowd=crowding_distance(X, fronts)
+    out=[{"pareto_front": None, "crowding": None} for _ in opts]
+    for i, f, c in zip(idx.tolist(), fronts.tolist(), crowd.tolist()):
+        out[i]={"pareto_front": f, "crowding": round(c, 4) if np.isfinite(c) else None}
+    return out, metrics
+
+def first_front(prof, opts, par):
+    """The non-dominated options scored with score_options(), best first, each with its crowding."""
+    front=[(o, p) for o, p in zip(opts, par) if p["pareto_front"] == 1]
+    rows, index=score_options(prof, [o for o, _ in front], with_index=True)
+    return _attach(rows, index, "crowding", [p["crowding"] for _, p in front])
+
+def render_report(prof, scored, mc=None, front=None):
     # Simple markdown summary
     lines=[f"# Architecture Decision Report — {prof.get('system','System')}",
            f"_Generated: {dt.date.today().isoformat()}_\n",
            "## Overall ranking"]
     for i,s in enumerate(scored,1):
         lines.append(f"{i}. **{s['name']}** — {s['overall']:.3f}" + ("" if s["ok"] else " (DISQUALIFIED)"))
-    (outdir/"decision_report.md").write_text("\n".join(lines), encoding="utf-8")
-    print(f"Wrote {outdir/'decision_report.md'} and {outdir/'decision_scores.json'}. Best: {best['name']} ({best['overall']:.3f})")
+    if mc and any("sensitivity" in s for s in scored):
+        lines += ["", f"## Sensitivity (Monte Carlo, {mc['samples']} scenarios, Dirichlet concentration {mc['concentration']:g})",
+                  "| Option | P(rank 1) | Mean rank | P(constraint violation) | Rank distribution |",
+                  "|---|---|---|---|---|"]
+        for s in scored:
+            z=s.get("sensitivity")
+            if not z: continue
+            dist=", ".join(f"{r}: {p:.1%}" for r, p in z["rank_dist"].items() if p)
+            lines.append(f"| {s['name']} | {z['p_first']:.1%} | {z['mean_rank']:.2f} | {z['p_violation']:.1%} | {dist} |")
+    if front is not None:
+        lines += ["", f"## Pareto front ({len(front['rows'])} non-dominated of {front['feasible']} feasible options, "
+                      f"{front['fronts']} front{'s' if front['fronts'] != 1 else ''} in total)",
+                  "_No feasible option is better on every metric than these; crowding ∞ marks the extremes of the trade-off._\n",
+                  "| Option | Overall | Crowding |", "|---|---|---|"]
+        for s in front["rows"]:
+            crowd="∞" if s["crowding"] is None else f"{s['crowding']:.3f}"
+            lines.append(f"| {s['name']} | {s['overall']:.3f} | {crowd} |")
+    return "\n".join(lines)
+
+def _at_least_one(v):
+    n=int(v)
+    if n < 1: raise argparse.ArgumentTypeError(f"must be at least 1, got {n}")
+    return n
+
+def main():
+    ap=argparse.ArgumentParser(description="Score architecture options vs NFR profile")
+    ap.add_argument("--profile", required=True)
+    src=ap.add_mutually_exclusive_group(required=True)
+    src.add_argument("--options", help="hand-written candidate options (YAML)")
+    src.add_argument("--components", help="component choices per slot: search their combinations (see option_search.py)")
+    ap.add_argument("--outdir", default="docs/decisions")
+    ap.add_argument("--engine", choices=["auto","loop","numpy"], default="auto",
+                    help="numpy: vectorized matrix engine (auto = numpy when installed)")
+    ap.add_argument("--top-k", type=_at_least_one, default=None, help="keep only the best K options in the outputs (--components: default 10)")
+    ap.add_argument("--mc-samples", type=int, default=0, help="Monte Carlo sensitivity scenarios (0 = off; needs numpy)")
+    ap.add_argument("--mc-concentration", type=float, default=50.0, help="Dirichlet concentration around profile weights (higher = tighter)")
+    ap.add_argument("--mc-seed", type=int, default=0)
+    ap.add_argument("--mc-jobs", type=int, default=1, help="worker processes for the Monte Carlo pass")
+    ap.add_argument("--pareto", action="store_true", help="non-dominated sorting: front rank + crowding per option (needs numpy)")
+    ap.add_argument("--json", action="store_true", help="also write the pretty decision_scores.json export")
+    instrument.add_arguments(ap)
+    args=ap.parse_args()
+    tm=instrument.from_args("arch_decision_score", args)
+
+    with tm.stage("load"):
+        prof=load_yaml(args.profile)
+        if not args.components:
+            opts=load_yaml(args.options)["options"]
+    if args.components:
+        from option_search import ComponentSpace, search
+        with tm.stage("search"):
+            opts, st=search(ComponentSpace(load_yaml(args.components)), prof, args.top_k or 10)
+        print(f"Searched {st['combinations']:,} combinations ({st['nodes']:,} nodes visited, {st['scored']:,} scored)")
+        if not opts:
+            raise SystemExit("No combination satisfies the hard constraints")
+    engine=args.engine
+    if engine == "auto":
+        try:
+            import numpy  # noqa: F401
+            engine="numpy"
+        except ImportError:
+            engine="loop"
+    with tm.stage("score"):
+        if engine == "numpy":
+            scored, index=score_options_matrix(prof, opts, args.top_k, with_index=True)
+        else:
+            scored, index=score_options(prof, opts, with_index=True)
+            scored, index=scored[:args.top_k], index[:args.top_k]
+    best=scored[0]
+
+    out={"profile":prof,"scored":scored}
+    mc=None
+    if args.mc_samples > 0:
+        mc={"samples": args.mc_samples, "concentration": args.mc_concentration, "seed": args.mc_seed}
+        with tm.stage("sensitivity"):
+            attach_sensitivity(scored, index, sensitivity(prof, opts, args.mc_samples, args.mc_concentration,
+                                                         args.mc_seed, args.mc_jobs))
+        out["sensitivity"]=mc
+    front=None
+    if args.pareto:
+        with tm.stage("pareto"):
+            par, metrics=pareto(prof, opts)
+        for key in ("pareto_front", "crowding"):
+            _attach(scored, index, key, [p[key] for p in par])
+        fronts=[p["pareto_front"] for p in par if p["pareto_front"] is not None]
+        front={"rows": first_front(prof, opts, par), "feasible": len(fronts), "fronts": max(fronts, default=0)}
+        out["pareto"]={"metrics": metrics, "feasible": front["feasible"], "fronts": front["fronts"],
+                       "first_front": [r["name"] for r in front["rows"]]}
+
+    outdir=pathlib.Path(args.outdir); outdir.mkdir(parents=True, exist_ok=True)
+    written=[outdir/"decision_report.md", outdir/"decision_scores.jsonl"] + ([outdir/"decision_scores.json"] if args.json else [])
+    with tm.stage("write"):
+        written[0].write_text(render_report(prof, scored, mc, front), encoding="utf-8")
+        for p in written[1:]:
+            dump_scores(out, p)
+    print(f"Wrote {', '.join(map(str, written))}. Best: {best['name']} ({best['overall']:.3f})")
 
 if __name__=="__main__":
     main()
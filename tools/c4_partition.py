@@ -0,0 +1,298 @@
+#!/usr/bin/env python
+"""
+Partitioned, dependency-aware C4 diagrams for large service estates.
+
+Briefs may declare dependencies per service (all optional):
+  services:
+    - name: "Checkout"
+      domain: "Order"                 # partition key for --partition domain
+      calls: ["Payments", "Catalog"]  # service -> service
+      datastores: ["OrdersDB"]        # service -> datastore
+      integrations: ["Stripe"]        # service -> integration
+Services are grouped by `domain` or, without domains, by label-propagation community detection over
+the call / datastore graph. Groups over the node or edge budget are split (breadth-first, so callers
+stay next to callees). Output: a context and an overview diagram over the partitions, plus one
+container diagram per partition in which other partitions appear as single collapsed nodes.
+"""
+import re
+from collections import Counter, defaultdict, deque
+
+METHODS = ["auto", "domain", "community", "off"]
+
+def _names(items):
+    return [(x["name"] if isinstance(x, dict) else str(x)) for x in items or []]
+
+class Estate:
+    """Services and their dependency edges, as declared in a brief."""
+    def __init__(self, data):
+        svcs = [s if isinstance(s, dict) else {"name": str(s)} for s in data.get("services") or []]
+        self.services = [s["name"] for s in svcs]
+        self.pos = {s: i for i, s in enumerate(self.services)}
+        self.solo = {s: s for s in self.services}
+        known = set(self.services)
+        self.domain = {s["name"]: s["domain"] for s in svcs if s.get("domain")}
+        self.calls = {s["name"]: [c for c in dict.fromkeys(_names(s.get("calls"))) if c in known and c != s["name"]] for s in svcs}
+        self.dbs = {s["name"]: list(dict.fromkeys(_names(s.get("datastores")))) for s in svcs}
+        self.ext = {s["name"]: list(dict.fromkeys(_names(s.get("integrations")))) for s in svcs}
+        self.datastores = list(dict.fromkeys(_names(data.get("datastores")) + [d for v in self.dbs.values() for d in v]))
+        self.integrations = list(dict.fromkeys(_names(data.get("integrations")) + [x for v in self.ext.values() for x in v]))
+        self.neighbours, self.callers, self.users = defaultdict(set), defaultdict(list), defaultdict(list)
+        for a, cs in self.calls.items():
+            for b in cs:
+                self.neighbours[a].add(b); self.neighbours[b].add(a); self.callers[b].append(a)
+        for a, ds in self.dbs.items():
+            for d in ds:
+                self.users[d].append(a)
+
+def label_propagation(nodes, adj, max_iter=30):
+    """Community label per node; deterministic (ties to the smallest label). Hubs are visited first so
+    their label seeds each dense region before it can leak across a single bridging edge."""
+    label = {n: n for n in nodes}
+    order = sorted(nodes, key=lambda n: -sum(adj[n].values()))
+    for _ in range(max_iter):
+        changed = False
+        for n in order:
+            if not adj[n]:
+                continue
+            w = Counter()
+            for m, wt in adj[n].items():
+                w[label[m]] += wt
+            best = max(w.values())
+            if w.get(label[n], 0) == best:
+                continue
+            label[n] = min(l for l, c in w.items() if c == best); changed = True
+        if not changed:
+            break
+    return label
+
+def communities(est):
+    """Service groups from the call graph plus shared datastores (datastores join as graph nodes)."""
+    nodes = [("s", s) for s in est.services] + [("d", d) for d in est.datastores]
+    adj = {n: Counter() for n in nodes}
+    for a, cs in est.calls.items():
+        for b in cs:
+            adj[("s", a)][("s", b)] += 1; adj[("s", b)][("s", a)] += 1
+    for a, ds in est.dbs.items():
+        for d in ds:
+            adj[("s", a)][("d", d)] += 1; adj[("d", d)][("s", a)] += 1
+    label = label_propagation(nodes, adj)
+    groups = defaultdict(list)
+    for s in est.services:
+        groups[label[("s", s)]].append(s)
+    named, loners = {}, []
+    for members in groups.values():
+        if len(members) == 1 and not est.neighbours[members[0]]:
+            loners.extend(members)
+            continue
+        hub = max(members, key=lambda s: (len(est.neighbours[s]), -est.pos[s]))
+        named[f"{hub} group"] = members
+    if loners:
+        named["Standalone services"] = loners
+    return named
+
+def partition(est, method="auto"):
+    """{partition label: [services]} by `domain` or by community detection."""
+    if method == "auto":
+        method = "domain" if est.domain else "community"
+    if method == "community":
+        return communities(est)
+    parts = defaultdict(list)
+    for s in est.services:
+        parts[est.domain.get(s, "Unassigned")].append(s)
+    return dict(parts)
+
+class Piece:
+    def __init__(self, label, members, group=None):
+        self.label, self.members, self.group = label, members, group or label
+
+def _detail(est, piece, owner, style):
+    """Nodes and edges of one partition's container diagram (before rendering)."""
+    inside = set(piece.members)
+    nodes, edges = [("svc", s) for s in piece.members], []
+    far = Counter()
+    for s in piece.members:
+        for c in est.calls[s]:
+            if c in inside: edges.append((("svc", s), ("svc", c), "calls"))
+            else: far[(("svc", s), ("part", owner[c]))] += 1
+    for c in piece.members:
+        for s in est.callers[c]:
+            if s not in inside: far[(("part", owner[s]), ("svc", c))] += 1
+    edges += [(a, b, "calls" if n == 1 else f"calls ({n})") for (a, b), n in far.items()]
+    nodes += list(dict.fromkeys(n for a, b in far for n in (a, b) if n[0] == "part"))
+    for kind, table, verb in (("db", est.dbs, "reads/writes"), ("ext", est.ext, "integrates")):
+        used = list(dict.fromkeys(t for s in piece.members for t in table[s]))
+        nodes += [(kind, t) for t in used]
+        edges += [(("svc", s), (kind, t), verb) for s in piece.members for t in table[s]]
+    if style == "event-driven":
+        nodes.append(("broker", "broker"))
+        edges += [(("svc", s), ("broker", "broker"), "publish/subscribe") for s in piece.members]
+    return nodes, edges
+
+def _split(est, label, members, style, max_nodes, max_edges):
+    """Greedy breadth-first packing of a group into pieces that fit the budgets. Pieces are sized with
+    every outside service as its own node: an upper bound on the collapsed partition nodes drawn later."""
+    owner = est.solo
+    if len(members) <= 1:
+        return [Piece(label, members)]
+    inside, order, seen = set(members), [], set()
+    for start in sorted(members, key=lambda s: (-len(est.neighbours[s] & inside), est.pos[s])):
+        if start in seen: continue
+        q = deque([start]); seen.add(start)
+        while q:
+            s = q.popleft(); order.append(s)
+            for n in sorted(est.neighbours[s] & inside - seen, key=est.pos.get):
+                seen.add(n); q.append(n)
+    pieces, cur = [], []
+    for s in order:
+        trial = Piece(label, cur + [s])
+        n, e = _detail(est, trial, owner, style)
+        if cur and (len(n) > max_nodes or len(e) > max_edges):
+            pieces.append(Piece(label, cur)); cur = [s]
+        else:
+            cur.append(s)
+    pieces.append(Piece(label, cur))
+    if len(pieces) > 1:
+        for i, p in enumerate(pieces, 1):
+            p.label = f"{label} ({i}/{len(pieces)})"; p.group = label
+    return pieces
+
+def _cap(nodes, edges, max_nodes, max_edges, keep=()):
+    """Trim to the budgets (least-connected optional nodes first); returns nodes, edges, omitted counts."""
+    deg = Counter(n for a, b, _ in edges for n in (a, b))
+    keep = set(keep)
+    optional = sorted((n for n in nodes if n not in keep), key=lambda n: deg[n])
+    drop = set(optional[:max(0, len(nodes) - max_nodes)])
+    kept_nodes = [n for n in nodes if n not in drop]
+    kept_edges = [e for e in edges if e[0] not in drop and e[1] not in drop]
+    if len(kept_edges) > max_edges:
+        kept_edges = kept_edges[:max_edges]
+    return kept_nodes, kept_edges, (len(nodes) - len(kept_nodes), len(edges) - len(kept_edges))
+
+def slug(s):
+    return re.sub(r"[^a-z0-9]+", "-", s.lower()).strip("-") or "partition"
+
+def plan(data, method="auto", style="microservices", max_nodes=40, max_edges=80):
+    est = Estate(data)
+    pieces = []
+    for label, members in partition(est, method).items():
+        pieces += _split(est, label, members, style, max_nodes, max_edges)
+    owner = {s: p.label for p in pieces for s in p.members}
+    files, used = {}, set()
+    for p in pieces:
+        name = slug(p.label); k = 2
+        while name in used:
+            name = f"{slug(p.label)}-{k}"; k += 1
+        used.add(name); files[p.label] = f"c4/partitions/{name}.mmd"
+    return est, pieces, owner, files
+
+def _ids(est, pieces):
+    ids = {("svc", s): f"s{i}" for i, s in enumerate(est.services, 1)}
+    ids.update({("db", d): f"db{i}" for i, d in enumerate(est.datastores, 1)})
+    ids.update({("ext", x): f"x{i}" for i, x in enumerate(est.integrations, 1)})
+    ids.update({("part", p.label): f"p{i}" for i, p in enumerate(pieces, 1)})
+    ids[("broker", "broker")] = "broker"
+    return ids
+
+def _omitted(n, e):
+    return [f"%% over budget: {n} nodes and {e} edges omitted"] if n or e else []
+
+def render_partition(system, style, est, owner, files, ids, shared, piece, max_nodes, max_edges):
+    nodes, edges = _detail(est, piece, owner, style)
+    nodes, edges, (on, oe) = _cap(nodes, edges, max_nodes, max_edges, keep=[("svc", s) for s in piece.members])
+    size = Counter(owner.values())
+    lines = ["C4Container", f"title Containers — {system}: {piece.label}", f'System_Boundary(b, "{piece.label}") {{']
+    outside = []
+    for n in nodes:
+        kind, name = n
+        if kind == "svc": lines.append(f'  Container({ids[n]}, "{name}", "Service")')
+        elif kind == "db" and name not in shared: lines.append(f'  ContainerDb({ids[n]}, "{name}", "Data store")')
+        elif kind == "db": outside.append(f'ContainerDb_Ext({ids[n]}, "{name}", "Shared data store")')
+        elif kind == "ext": outside.append(f'System_Ext({ids[n]}, "{name}")')
+        elif kind == "part": outside.append(f'System_Ext({ids[n]}, "{name}", "{size[name]} services, see {files[name]}")')
+        else: outside.append('ContainerQueue(broker, "Event Broker", "Topics/Queues")')
+    lines += ["}"] + outside
+    lines += [f'Rel({ids[a]}, {ids[b]}, "{label}")' for a, b, label in edges]
+    return "\n".join(lines + _omitted(on, oe)) + "\n"
+
+def groups_view(pieces, files, limit):
+    """Overview entries [(label, services, description)]: one per group, the smallest pooled beyond limit."""
+    by = defaultdict(list)
+    for p in pieces:
+        by[p.group].append(p)
+    entries = []
+    for label, ps in by.items():
+        n = sum(len(p.members) for p in ps)
+        where = files[ps[0].label] if len(ps) == 1 else f"{len(ps)} diagrams: {files[ps[0].label]} …"
+        entries.append((label, [s for p in ps for s in p.members], f"{n} services, see {where}"))
+    if len(entries) > limit:
+        entries.sort(key=lambda e: -len(e[1]))  # stable: ties keep partition order
+        rest = entries[max(0, limit - 1):]
+        entries = entries[:max(0, limit - 1)] + [(f"{len(rest)} more partitions", [s for e in rest for s in e[1]],
+                                                   f"{sum(len(e[1]) for e in rest)} services")]
+    return entries
+
+def render_overview(system, style, est, pieces, files, ids, max_nodes, max_edges):
+    entries = groups_view(pieces, files, max_nodes - (style == "event-driven"))
+    owner = {s: label for label, members, _ in entries for s in members}
+    calls = Counter((owner[a], owner[b]) for a, cs in est.calls.items() for b in cs if owner[a] != owner[b])
+    ext = Counter((owner[s], x) for s in est.services for x in est.ext[s])
+    db_parts = {d: {owner[s] for s in est.users[d]} for d in est.datastores}
+    gid = {label: f"g{i}" for i, (label, _, _) in enumerate(entries, 1)}
+    ids = {**ids, **{("group", label): g for label, g in gid.items()}}
+    nodes = [("group", label) for label, _, _ in entries]
+    nodes += [("db", d) for d in est.datastores if len(db_parts[d]) > 1] + list(dict.fromkeys(("ext", x) for _, x in ext))
+    weighted = ([(("group", a), ("group", b), f"calls ({n})", n) for (a, b), n in calls.items()]
+                + [(("group", p), ("db", d), "reads/writes", 1) for d, ps in db_parts.items() if len(ps) > 1 for p in sorted(ps)]
+                + [(("group", p), ("ext", x), "integrates", n) for (p, x), n in ext.items()])
+    weighted.sort(key=lambda e: -e[3])  # heaviest dependencies survive the edge budget
+    budget = max_nodes - (style == "event-driven")
+    nodes, edges, (on, oe) = _cap(nodes, [e[:3] for e in weighted], budget, max_edges, keep=nodes[:len(entries)])
+    desc = {label: d for label, _, d in entries}
+    lines = ["C4Container", f"title Overview — {system} ({len(est.services)} services in {len(pieces)} partitions)",
+             f'System_Boundary(system, "{system}") {{']
+    outside = []
+    for n in nodes:
+        kind, name = n
+        if kind == "group": lines.append(f'  Container({ids[n]}, "{name}", "Partition", "{desc[name]}")')
+        elif kind == "db": lines.append(f'  ContainerDb({ids[n]}, "{name}", "Shared data store")')
+        else: outside.append(f'System_Ext({ids[n]}, "{name}")')
+    if style == "event-driven":
+        lines.append('  ContainerQueue(broker, "Event Broker", "Topics/Queues")')
+    lines += ["}"] + outside
+    lines += [f'Rel({ids[a]}, {ids[b]}, "{label}")' for a, b, label in edges]
+    return "\n".join(lines + _omitted(on, oe)) + "\n"
+
+def context_view(system, est, pieces, files, max_nodes, max_edges):
+    """The flat context diagram over partition groups: each costs 1 node and 2 edges, integrations 1 and 1."""
+    import a2a_transform
+    limit = max(1, min(max_nodes - 2, max_edges // 2))
+    groups = [label for label, _, _ in groups_view(pieces, files, limit)]
+    room = max(0, min(max_nodes - 2 - len(groups), max_edges - 2 * len(groups)))
+    return a2a_transform.mk_c4_context(system, groups, est.integrations[:room])
+
+def flat_size(svcs, datastores, integrations, style):
+    """(nodes, edges) of the largest flat diagram a2a_transform would draw."""
+    context = (2 + len(svcs) + len(integrations), 2 * len(svcs) + len(integrations))
+    if style == "medallion":
+        return context
+    containers = (len(svcs) + len(datastores) + (style == "event-driven"), len(svcs) if style == "event-driven" else 0)
+    return max(context[0], containers[0]), max(context[1], containers[1])
+
+def render(data, style, system, method="auto", max_nodes=40, max_edges=80):
+    """{relative path: text} of the partitioned C4 set, or None when the flat diagrams fit (auto)."""
+    if method == "off":
+        return None
+    if method == "auto":
+        n, e = flat_size(_names(data.get("services")), _names(data.get("datastores")), _names(data.get("integrations")), style)
+        if n <= max_nodes and e <= max_edges:
+            return None
+    est, pieces, owner, files = plan(data, method, style, max_nodes, max_edges)
+    out = {"c4/context.mmd": context_view(system, est, pieces, files, max_nodes, max_edges)}
+    if style == "medallion":  # containers are the Bronze/Silver/Gold layers, not services
+        return out
+    ids = _ids(est, pieces)
+    shared = {d for d in est.datastores if len({owner[s] for s in est.users[d]}) > 1}
+    out["c4/containers.mmd"] = render_overview(system, style, est, pieces, files, ids, max_nodes, max_edges)
+    for p in pieces:
+        out[files[p.label]] = render_partition(system, style, est, owner, files, ids, shared, p, max_nodes, max_edges)
+    return out
@@ -1,9 +1,24 @@
 #!/usr/bin/env python
-import json, sys, pathlib, subprocess
-scores = json.loads(pathlib.Path('docs/decisions/decision_scores.json').read_text())
-best = scores['scored'][0]
-kind = (best.get('kind','') or '').lower()
-style = {'microservices':'microservices','event-driven':'event-driven','monolith':'microservices'}.get(kind,'microservices')
-system = scores['profile'].get('system','System')
-print(f"Best: {best['name']} ({kind}) → generating A→A for style={style}")
-subprocess.check_call([sys.executable,'tools/a2a_transform.py','samples/source_architecture.yaml','--target-style',style,'--system-name',system])
+import argparse, pathlib
+from a2a_transform import load_source, transform, write_outputs
+from req_io import load_scores
+
+def style_for(best):
+    kind = (best.get('kind','') or '').lower()
+    return {'microservices':'microservices','event-driven':'event-driven','monolith':'microservices'}.get(kind,'microservices')
+
+def decision_to_a2a(scores, source_data, outdir='docs/a2a'):
+    best = scores['scored'][0]
+    style = style_for(best)
+    system = scores['profile'].get('system','System')
+    print(f"Best: {best['name']} ({(best.get('kind','') or '').lower()}) → generating A→A for style={style}")
+    write_outputs(outdir, transform(source_data, style, system))
+    print(f"Generated ADR, backlog, and C4 skeletons under {outdir}/")
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Generate A→A artifacts for the best-scored option")
+    ap.add_argument("--scores", default="docs/decisions/decision_scores.jsonl", help=".jsonl (only the best row is read) or .json")
+    ap.add_argument("--source", default="samples/source_architecture.yaml")
+    ap.add_argument("--outdir", default="docs/a2a")
+    a = ap.parse_args()
+    decision_to_a2a(load_scores(a.scores, top_k=1), load_source(pathlib.Path(a.source)), a.outdir)
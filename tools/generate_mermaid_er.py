@@ -1,20 +1,185 @@
 #!/usr/bin/env python
-import argparse, yaml, pathlib, re
-def infer_entities(reqs):
-    ents=set()
+"""
+Mermaid ER skeleton from requirement text.
+
+Two streaming passes over the requirements (memory is bounded, not proportional to the corpus):
+ 1. count singularized terms and adjacent-term bigrams, stopwords dropped; counters are capped at
+    `capacity` entries (rare entries are pruned when full), then the top-k entities are taken from a
+    heap. A bigram that makes the cut ("customer order" -> CustomerOrder) absorbs those occurrences of its words.
+ 2. count entity pairs mentioned in the same requirement (a sparse k x k matrix), with a plural/singular
+    tally per side for cardinality (Customer ||--o{ Order when orders are mentioned in the plural next
+    to one customer) and the most common word between the two as the relationship label.
+
+Usage:
+  python tools/generate_mermaid_er.py samples/requirements.yaml --out docs/er.mmd [--entities 8] [--relations 16]
+"""
+import argparse, heapq, pathlib, re
+from collections import Counter, defaultdict
+import instrument
+from req_io import iter_package
+
+WORD = re.compile(r"[A-Za-z_]{3,}")
+STOPWORDS = {
+    # requirement boilerplate (and the original exclusions)
+    "user", "system", "must", "should", "shall", "will", "can", "may", "able", "support", "provide", "allow",
+    "view", "handle", "error", "trace", "alert", "ensure", "within", "less", "than", "more", "least", "most",
+    "high", "low", "fast", "slow", "new", "all", "any", "each", "every", "per", "via", "using", "use", "based",
+    # english function words
+    "the", "and", "for", "with", "from", "into", "onto", "that", "this", "these", "those", "there", "their",
+    "them", "they", "then", "when", "where", "which", "while", "who", "whom", "what", "are", "was", "were",
+    "been", "being", "have", "has", "had", "not", "but", "also", "only", "other", "such", "some", "its",
+    "our", "your", "about", "after", "before", "under", "over", "between", "without", "upon", "out", "off",
+}
+# never entities, but fine as relationship labels ("Customer ||--o{ Order : places")
+VERBS = {
+    "contain", "include", "place", "store", "send", "receive", "create", "update", "delete", "display",
+    "show", "return", "process", "generate", "manage", "require", "need", "make", "take", "read", "write",
+    "own", "belong", "reference", "link", "log", "record", "notify", "export", "import", "search", "encrypt",
+    "hold", "keep", "pay", "publish", "consume", "emit", "assign", "approve", "submit", "track",
+}
+CAPACITY = 200_000
+
+def singular(w):
+    if len(w) > 4 and w.endswith("ies"): return w[:-3] + "y"
+    if len(w) > 4 and w.endswith(("sses", "xes", "ches", "shes")): return w[:-2]
+    if len(w) > 3 and w.endswith("s") and not w.endswith(("ss", "us", "is")): return w[:-1]
+    return w
+
+_TERMS = {}  # word -> (singular term or None if dropped, was plural); bounded like the counters
+
+def _term(w):
+    s = singular(w)
+    noun = len(s) >= 4 and not {s, w} & STOPWORDS and s not in VERBS and not (len(w) > 5 and w.endswith(("ed", "ing")))
+    t = (s, s != w) if noun else (None, False)
+    if len(_TERMS) >= CAPACITY: _TERMS.clear()
+    _TERMS[w] = t
+    return t
+
+def terms(text):
+    """(singular term, was plural, position) for each candidate noun (not a stopword, verb or participle)."""
+    out = []
+    for i, w in enumerate(WORD.findall(text.lower())):
+        s, plural = _TERMS.get(w) or _term(w)
+        if s:
+            out.append((s, plural, i))
+    return out
+
+def _prune(counter, capacity):
+    if len(counter) > capacity:  # keep the frequent half; frequent terms survive with their counts
+        keep = heapq.nlargest(capacity // 2, counter.items(), key=lambda kv: kv[1])
+        counter.clear(); counter.update(dict(keep))
+
+def count_terms(reqs, capacity=CAPACITY):
+    uni, bi = Counter(), Counter()
     for r in reqs:
-        for w in re.findall(r"[A-Za-z_]{4,}", r["text"]):
-            if w.lower() in {"user","system","must","view","handle","error","trace","alert"}: continue
-            ents.add(w.capitalize())
-    return sorted(list(ents))[:8]
+        ts = terms(r.get("text") or "")
+        prev = None
+        for t, _, pos in ts:
+            uni[t] += 1
+            if prev and prev[1] == pos - 1:
+                bi[(prev[0], t)] += 1
+            prev = (t, pos)
+        _prune(uni, capacity); _prune(bi, capacity)
+    return uni, bi
+
+def select_entities(uni, bi, k=8, min_bigram=2):
+    """Top-k entities by count (ties alphabetical). A bigram seen at least min_bigram times that accounts
+    for at least half of each of its words' occurrences is a phrase: an entity of its own, and its
+    occurrences no longer count for the single words."""
+    count = dict(uni)
+    for b, n in sorted(bi.items(), key=lambda kv: (-kv[1], kv[0])):  # heaviest first claims shared words
+        # the counters are pruned separately: a bigram can outlive its words, and is then no phrase
+        if n >= min_bigram and all(w in uni and n * 2 >= uni[w] and count[w] >= n for w in b):
+            count[b] = n
+            for w in b:
+                count[w] -= n
+    best = heapq.nsmallest(k, ((-n, entity_name(e), e) for e, n in count.items() if n > 0))
+    return [e for _, _, e in best]
+
+def entity_name(e):
+    return "".join(w.capitalize() for w in ((e,) if isinstance(e, str) else e))
+
+def mentions(text, unis, bis):
+    """{entity: (was plural, position)} for entities in one requirement; bigrams consume their words."""
+    found, prev = {}, None
+    for t, plural, pos in terms(text):
+        if prev and (prev[0], t) in bis and prev[2] == pos - 1:
+            if prev[0] in unis and found.get(prev[0]) == prev[1:]:
+                del found[prev[0]]  # counted as a unigram a moment ago; it belongs to the bigram
+            found.setdefault((prev[0], t), (plural, pos)); prev = None
+            continue
+        if t in unis:
+            found.setdefault(t, (plural, pos))
+        prev = (t, plural, pos)
+    return found
+
+def infer_relations(reqs, entities, label_cap=64):
+    """{(a, b): {"count", "plural": (a plural n, b plural n), "label"}} for entity pairs mentioned together,
+    oriented the way the text usually reads (a mentioned before b)."""
+    rank = {e: i for i, e in enumerate(entities)}
+    unis = {e for e in entities if isinstance(e, str)}; bis = set(entities) - unis
+    count, plural_a, plural_b, a_first, between = Counter(), Counter(), Counter(), Counter(), defaultdict(Counter)
+    for r in reqs:
+        text = r.get("text") or ""
+        found = mentions(text, unis, bis)
+        if len(found) < 2:
+            continue
+        found = sorted(found.items(), key=lambda kv: rank[kv[0]])
+        words = None
+        for i, (a, (pa, xa)) in enumerate(found):
+            for b, (pb, xb) in found[i + 1:]:
+                ab = (a, b); count[ab] += 1
+                if pa: plural_a[ab] += 1
+                if pb: plural_b[ab] += 1
+                if xa < xb: a_first[ab] += 1
+                lo, hi = (xa, xb) if xa < xb else (xb, xa)
+                if hi - lo > 1:
+                    words = words or WORD.findall(text.lower())
+                    verb = next((w for w in words[lo + 1:hi] if w not in STOPWORDS), None)
+                    c = between[ab]
+                    if verb and (verb in c or len(c) < label_cap):
+                        c[verb] += 1
+    out = {}
+    for (a, b), n in count.items():
+        d = {"count": n, "plural": (plural_a[(a, b)], plural_b[(a, b)]),
+             "label": between[(a, b)].most_common(1)[0][0] if between.get((a, b)) else "relates to"}
+        if a_first[(a, b)] * 2 < n:
+            a, b = b, a; d["plural"] = d["plural"][::-1]
+        out[(a, b)] = d
+    return out
+
+def cardinality(d):
+    many_a, many_b = (p * 2 > d["count"] for p in d["plural"])
+    return ("}o" if many_a else "||") + "--" + ("o{" if many_b else "||")
+
+def render_er(reqs, k=8, max_relations=16, capacity=CAPACITY, timings=instrument.OFF):
+    """reqs must be re-iterable (a list, or see Requirements) since it is read twice."""
+    with timings.stage("terms"):
+        entities = select_entities(*count_terms(reqs, capacity), k=k)
+    with timings.stage("relations"):
+        rels = infer_relations(reqs, entities)
+    lines = ["erDiagram"]
+    for e in sorted(entities, key=entity_name): lines.append(f"  {entity_name(e)} {{\n    string id\n  }}")
+    top = sorted(rels.items(), key=lambda kv: (-kv[1]["count"], entity_name(kv[0][0]), entity_name(kv[0][1])))[:max_relations]
+    for (a, b), d in top:
+        lines.append(f'  {entity_name(a)} {cardinality(d)} {entity_name(b)} : "{d["label"]}"')
+    return "\n".join(lines)+"\n"
+
+class Requirements:
+    """Re-iterable requirement stream from a package file (constant memory for .jsonl)."""
+    def __init__(self, path):
+        self.path = path
+    def __iter__(self):
+        return iter_package(self.path)
+
 if __name__=="__main__":
     ap=argparse.ArgumentParser()
-    ap.add_argument("yaml_file"); ap.add_argument("--out", required=True)
+    ap.add_argument("yaml_file", help="requirements package (.yaml, .jsonl, .msgpack)"); ap.add_argument("--out", required=True)
+    ap.add_argument("--entities", type=int, default=8); ap.add_argument("--relations", type=int, default=16)
+    instrument.add_arguments(ap)
     a=ap.parse_args()
-    reqs = yaml.safe_load(pathlib.Path(a.yaml_file).read_text())["requirements"]
-    ents = infer_entities(reqs)
-    lines=["erDiagram"]
-    for e in ents: lines.append(f"  {e} {{\n    string id\n  }}")
-    mmd="\n".join(lines)+"\n"
-    pathlib.Path(a.out).write_text(mmd, encoding="utf-8")
+    tm=instrument.from_args("generate_mermaid_er", a)
+    mmd=render_er(Requirements(a.yaml_file), a.entities, a.relations, timings=tm)
+    with tm.stage("write"):
+        pathlib.Path(a.out).write_text(mmd, encoding="utf-8")
     print(f"Wrote {a.out} (Mermaid ER)")
@@ -0,0 +1,110 @@
+"""
+Opt-in timing / memory instrumentation shared by the tools.
+
+Every tool takes:
+  --timings [FILE]     per-stage wall time + peak RSS (and, for req_lint, per-rule calls / time) as
+                       JSON to FILE, or to stderr when no FILE is given
+  --profile-out FILE   a cProfile dump of the whole run (inspect with `python -m pstats FILE`)
+
+    tm = instrument.from_args("req_lint", args)
+    with tm.stage("parse"):
+        ...
+
+When neither flag is given, stage() hands back one shared no-op context manager and nothing is
+recorded. Reports are written at exit, so early sys.exit() paths are covered too.
+"""
+import atexit, contextlib, json, sys, time
+
+_NULL = contextlib.nullcontext()
+
+def peak_rss_mb():
+    """This process's peak resident set size in MB (0.0 where it can't be read)."""
+    try:  # Linux: the process image's own high-water mark (ru_maxrss also counts a forked parent's)
+        with open("/proc/self/status") as f:
+            return next(int(l.split()[1]) for l in f if l.startswith("VmHWM:")) / 1024
+    except (OSError, StopIteration):
+        try:
+            import resource
+        except ImportError:  # Windows
+            return 0.0
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024)  # bytes on macOS
+
+class _Stage:
+    __slots__ = ("tm", "name", "t0")
+    def __init__(self, tm, name):
+        self.tm, self.name = tm, name
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+    def __exit__(self, *exc):
+        s = self.tm.stages.setdefault(self.name, {"calls": 0, "seconds": 0.0, "peak_rss_mb": 0.0})
+        s["calls"] += 1
+        s["seconds"] += time.perf_counter() - self.t0
+        s["peak_rss_mb"] = max(s["peak_rss_mb"], peak_rss_mb())
+
+class Timings:
+    def __init__(self, tool, enabled=False, out=None, profile_out=None):
+        self.tool, self.enabled, self.out, self.profile_out = tool, enabled or bool(profile_out), out, profile_out
+        self.stages, self.rules = {}, {}
+        self.t0 = time.perf_counter()
+        self.profiler = None
+        if profile_out:
+            import cProfile
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        if self.enabled:
+            atexit.register(self.finish)
+
+    def stage(self, name):
+        """Context manager timing one stage (repeated stages accumulate)."""
+        return _Stage(self, name) if self.enabled else _NULL
+
+    def record(self, name, seconds):
+        """Add a stage measured elsewhere (e.g. by the pipeline's own scheduler)."""
+        if self.enabled:
+            s = self.stages.setdefault(name, {"calls": 0, "seconds": 0.0, "peak_rss_mb": 0.0})
+            s["calls"] += 1; s["seconds"] += seconds; s["peak_rss_mb"] = max(s["peak_rss_mb"], peak_rss_mb())
+
+    def rule(self, name, seconds, hits=0):
+        r = self.rules.get(name)
+        if r is None:
+            r = self.rules[name] = {"calls": 0, "seconds": 0.0, "hits": 0}
+        r["calls"] += 1; r["seconds"] += seconds; r["hits"] += hits
+
+    def report(self):
+        total = time.perf_counter() - self.t0
+        out = {"tool": self.tool, "argv": sys.argv[1:], "seconds": round(total, 6), "peak_rss_mb": round(peak_rss_mb(), 1),
+               "stages": [{"name": k, **v, "seconds": round(v["seconds"], 6), "share": round(v["seconds"] / total, 4) if total else 0.0,
+                           "peak_rss_mb": round(v["peak_rss_mb"], 1)} for k, v in self.stages.items()]}
+        if self.rules:
+            out["rules"] = [{"rule": k, **v, "seconds": round(v["seconds"], 6),
+                             "us_per_call": round(v["seconds"] / v["calls"] * 1e6, 3) if v["calls"] else 0.0}
+                            for k, v in sorted(self.rules.items(), key=lambda kv: -kv[1]["seconds"])]
+        return out
+
+    def finish(self):
+        """Write the JSON report / profile once (also registered with atexit)."""
+        if not self.enabled:
+            return
+        self.enabled = False
+        if self.profiler is not None:
+            self.profiler.disable()
+            self.profiler.dump_stats(self.profile_out)
+        if self.out is not None:
+            text = json.dumps(self.report(), indent=2)
+            if self.out == "-":
+                print(text, file=sys.stderr)
+            else:
+                with open(self.out, "w", encoding="utf-8") as f:
+                    f.write(text + "\n")
+
+def add_arguments(ap):
+    ap.add_argument("--timings", nargs="?", const="-", default=None, metavar="FILE",
+                    help="write per-stage wall time / peak RSS as JSON to FILE (default: stderr)")
+    ap.add_argument("--profile-out", default=None, metavar="FILE", help="write a cProfile (pstats) dump of the run")
+
+def from_args(tool, args):
+    return Timings(tool, args.timings is not None, args.timings, args.profile_out)
+
+# disabled instance: the default for library functions that accept a timings argument
+OFF = Timings("")
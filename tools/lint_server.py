@@ -0,0 +1,250 @@
+#!/usr/bin/env python
+"""
+Warm requirement-lint server for editors and pre-commit hooks (JSON-RPC 2.0).
+
+One long-lived process keeps req_lint imported (compiled rules and the vague-term lexicon) and an
+LRU cache of package results keyed by path, mtime and size. A single-requirement lint then costs
+the rules alone (tens of microseconds) instead of interpreter start-up plus imports (~50-150 ms).
+
+Transports (one JSON-RPC message per line, batches allowed):
+  stdin/stdout          default; for an editor that spawns the server as a child process
+  --socket PATH         Unix socket, one thread per connection; shared by hooks and terminals
+
+Methods:
+  lint         {"requirement": {...}} or {"text": ..., "type": "nfr"|"func"} -> {"id", "issues": [{"rule", "message"}]}
+  lint_many    {"requirements": [...], "format"?}  -> {"ok", "results", "conflicts"} (or {"ok", "report"} with format)
+  lint_file    {"path": ..., "format"?, "source"?} -> as lint_many, for a package on disk (.yaml/.jsonl/.msgpack)
+  set_lexicon  {"paths": [...], "replace": false}   -> {"terms": N}; clears the file cache
+  stats / ping / shutdown
+"format" is text, json or sarif and yields exactly what req_lint.py prints.
+
+Client (imports nothing beyond the stdlib; lints in-process when no server is listening):
+  python tools/lint_server.py --socket .cache/req_lint.sock &
+  python tools/lint_server.py --socket .cache/req_lint.sock --check samples/requirements.yaml
+Exit code of --check: 1 if any issues found (as req_lint.py).
+"""
+import argparse, json, pathlib, socket, sys, threading, time
+from collections import OrderedDict
+
+PARSE_ERROR, INVALID_REQUEST, METHOD_NOT_FOUND, INVALID_PARAMS, INTERNAL_ERROR = -32700, -32600, -32601, -32602, -32603
+
+class RpcError(Exception):
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+def _error(rid, code, message):
+    return {"jsonrpc": "2.0", "id": rid, "error": {"code": code, "message": message}}
+
+class LintService:
+    def __init__(self, lexicons=(), replace=False, cache_max=64, rules=()):
+        import inspect, req_io, req_lint  # the expensive part, paid once per server (the --check client skips it)
+        self.io, self.rl = req_io, req_lint
+        if lexicons or replace:
+            req_lint.use_lexicon(lexicons, replace=replace)
+        if rules:
+            req_lint.use_rules(rules)
+        self.cache_max = cache_max
+        self.files = OrderedDict()  # (path, mtime_ns, size) -> (results, conflicts)
+        self.lock = threading.Lock()
+        self.started, self.hits, self.misses, self.calls = time.time(), 0, 0, {}
+        self.stopping = False
+        self.methods = {"lint": self.lint, "lint_many": self.lint_many, "lint_file": self.lint_file,
+                        "set_lexicon": self.set_lexicon, "stats": self.stats, "ping": self.ping,
+                        "shutdown": self.shutdown}
+        self.signatures = {name: inspect.signature(fn) for name, fn in self.methods.items()}
+
+    def _lint(self, reqs):
+        # no per-requirement cache: keying one costs about a third of linting it
+        return self.rl.lint_all(reqs), self.rl.detect_conflicts(reqs)
+
+    def _report(self, results, conflicts, source, fmt):
+        ok = not conflicts and not any(i for _, i in results)
+        if fmt is None:
+            return {"ok": ok, "conflicts": conflicts,
+                    "results": [{"id": rid, "issues": [{"rule": self.rl.rule_id(i), "message": i} for i in issues]}
+                                for rid, issues in results if issues]}
+        if fmt == "json":
+            report = self.rl.render_json(results, conflicts, source)
+        elif fmt == "sarif":
+            report = self.rl.render_sarif(results, conflicts, source)
+        elif fmt == "text":
+            report = "Lints: OK" if ok else self.rl.render_text(results, conflicts)
+        else:
+            raise RpcError(INVALID_PARAMS, f"unknown format {fmt!r} (text, json or sarif)")
+        return {"ok": ok, "report": report}
+
+    # --- methods ---
+    def lint(self, requirement=None, text=None, type=None):
+        r = requirement if requirement is not None else {"text": text or "", "type": type or ""}
+        if not isinstance(r, dict):
+            raise RpcError(INVALID_PARAMS, "requirement must be an object")
+        return {"id": r.get("id"), "issues": [{"rule": self.rl.rule_id(i), "message": i} for i in self.rl.lint_req(r)]}
+
+    def lint_many(self, requirements, format=None, source="<rpc>"):
+        if not isinstance(requirements, list) or not all(isinstance(r, dict) for r in requirements):
+            raise RpcError(INVALID_PARAMS, "requirements must be a list of objects")
+        return self._report(*self._lint(requirements), source, format)
+
+    def lint_file(self, path, format=None, source=None):
+        p = pathlib.Path(path).resolve()
+        try:
+            st = p.stat()
+        except OSError as e:
+            raise RpcError(INVALID_PARAMS, f"cannot read {path}: {e.strerror}")
+        key = (str(p), st.st_mtime_ns, st.st_size)
+        with self.lock:
+            hit = self.files.get(key)
+            if hit is not None:
+                self.files.move_to_end(key); self.hits += 1
+            else:
+                self.misses += 1
+        if hit is None:
+            data = self.io.load_package(p)
+            hit = self._lint(data.get("requirements", []))
+            with self.lock:
+                self.files[key] = hit
+                while len(self.files) > self.cache_max:
+                    self.files.popitem(last=False)
+        results, conflicts = hit
+        return self._report(results, conflicts, source or path, format)
+
+    def set_lexicon(self, paths=(), replace=False):
+        with self.lock:
+            self.rl.use_lexicon(paths, replace=replace)
+            self.files.clear()
+        return {"terms": len(self.rl.VAGUE)}
+
+    def stats(self):
+        return {"uptime_s": round(time.time() - self.started, 1), "calls": dict(self.calls), "terms": len(self.rl.VAGUE),
+                "cache": {"files": len(self.files), "hits": self.hits, "misses": self.misses}}
+
+    def ping(self):
+        return "pong"
+
+    def shutdown(self):
+        self.stopping = True
+        return "bye"
+
+    def handle(self, msg):
+        """One decoded JSON-RPC request (or batch) -> response object(s); None for notifications."""
+        if isinstance(msg, list):
+            if not msg:
+                return _error(None, INVALID_REQUEST, "empty batch")
+            out = [r for r in map(self.handle, msg) if r is not None]
+            return out or None
+        if not isinstance(msg, dict) or msg.get("jsonrpc") != "2.0" or not isinstance(msg.get("method"), str):
+            return _error(msg.get("id") if isinstance(msg, dict) else None, INVALID_REQUEST, "invalid request")
+        rid, method, params = msg.get("id"), msg["method"], msg.get("params", {})
+        try:
+            if method not in self.methods:
+                raise RpcError(METHOD_NOT_FOUND, f"unknown method {method!r}")
+            if not isinstance(params, dict):
+                raise RpcError(INVALID_PARAMS, "params must be an object")
+            try:
+                self.signatures[method].bind(**params)
+            except TypeError as e:
+                raise RpcError(INVALID_PARAMS, str(e))
+            self.calls[method] = self.calls.get(method, 0) + 1
+            resp = {"jsonrpc": "2.0", "id": rid, "result": self.methods[method](**params)}
+        except RpcError as e:
+            resp = _error(rid, e.code, str(e))
+        except Exception as e:
+            resp = _error(rid, INTERNAL_ERROR, f"{type(e).__name__}: {e}")
+        return resp if "id" in msg else None
+
+def serve_lines(service, rfile, wfile):
+    """Answer newline-delimited JSON-RPC from a binary reader until EOF or shutdown."""
+    for line in rfile:
+        if not line.strip():
+            continue
+        try:
+            resp = service.handle(json.loads(line))
+        except ValueError as e:
+            resp = _error(None, PARSE_ERROR, f"parse error: {e}")
+        if resp is not None:
+            wfile.write(json.dumps(resp, ensure_ascii=False).encode("utf-8") + b"\n")
+            wfile.flush()
+        if service.stopping:
+            return
+
+def serve_socket(service, path):
+    import socketserver
+    p = pathlib.Path(path)
+    if p.exists():
+        try:
+            call(path, "ping", timeout=1)
+        except OSError:
+            p.unlink()  # stale socket left by a server that died
+        else:
+            sys.exit(f"a lint server is already listening on {path}")
+    p.parent.mkdir(parents=True, exist_ok=True)
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            serve_lines(service, self.rfile, self.wfile)
+            if service.stopping:
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+
+    class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    with Server(str(p), Handler) as srv:
+        print(f"req_lint server listening on {p}", file=sys.stderr, flush=True)
+        try:
+            srv.serve_forever()
+        finally:
+            p.unlink(missing_ok=True)
+
+def call(path, method, params=None, timeout=60):
+    """One JSON-RPC call to the server on a Unix socket; returns the result (RuntimeError on an RPC error)."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.settimeout(timeout)
+        s.connect(str(path))
+        s.sendall(json.dumps({"jsonrpc": "2.0", "id": 1, "method": method, "params": params or {}}).encode("utf-8") + b"\n")
+        with s.makefile("rb") as f:
+            resp = json.loads(f.readline() or b"null")
+    if not isinstance(resp, dict):
+        raise RuntimeError(f"{method}: no reply from {path}")
+    if "error" in resp:
+        raise RuntimeError(resp["error"]["message"])
+    return resp["result"]
+
+def check(paths, sock=None, fmt="text", lexicons=(), replace=False, rules=()):
+    """Lint package files through the server (in-process when none is listening); True if all clean.
+    Lexicon and rule options only apply in-process: a running server keeps the ones it was started with."""
+    service, ok = None, True
+    for path in paths:
+        params = {"path": str(pathlib.Path(path).resolve()), "format": fmt, "source": path}
+        try:
+            if sock is None:
+                raise FileNotFoundError
+            res = call(sock, "lint_file", params)
+        except (FileNotFoundError, ConnectionRefusedError):
+            service = service or LintService(lexicons, replace, rules=rules)
+            res = service.lint_file(**params)
+        print(res["report"])
+        ok = ok and res["ok"]
+    return ok
+
+def main():
+    ap = argparse.ArgumentParser(description="Warm req_lint server (JSON-RPC 2.0 over stdio or a Unix socket)")
+    ap.add_argument("--socket", default=None, help="serve on (or, with --check, connect to) this Unix socket; default: stdin/stdout")
+    ap.add_argument("--check", nargs="+", metavar="FILE", help="client: lint these packages via the server and exit")
+    ap.add_argument("--format", choices=["text", "json", "sarif"], default="text", help="--check report format")
+    ap.add_argument("--lexicon", action="append", default=[], help="extra banned-term file (one phrase per line); repeatable")
+    ap.add_argument("--no-builtin-vague", action="store_true", help="use only --lexicon terms, not the built-in VAGUE_WORDS")
+    ap.add_argument("--rules", action="append", default=[], help="extra rule pack (.yaml/.json/.py); repeatable")
+    ap.add_argument("--cache-max", type=int, default=64, help="max cached package results (LRU eviction)")
+    a = ap.parse_args()
+    if a.check:
+        sys.exit(0 if check(a.check, a.socket, a.format, a.lexicon, a.no_builtin_vague, a.rules) else 1)
+
+    service = LintService(a.lexicon, a.no_builtin_vague, a.cache_max, a.rules)
+    if a.socket:
+        serve_socket(service, a.socket)
+    else:
+        serve_lines(service, sys.stdin.buffer, sys.stdout.buffer)
+
+if __name__ == "__main__":
+    main()
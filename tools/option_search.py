@@ -0,0 +1,186 @@
+#!/usr/bin/env python
+"""
+Generate architecture options from component choices and search them with branch-and-bound.
+
+A components file lists slots (compute, datastore, broker, region, ...) and the choices for each;
+an option is one choice per slot, and its metrics combine the chosen components' metrics per rule:
+  sum      cost_monthly_usd                         additive
+  max      performance_p95_ms, time_to_market_weeks the slowest hop / longest lead time dominates
+  min      *_score                                  weakest link
+  product  availability_pct                         serial availability (product of percentages)
+A choice that doesn't mention a metric doesn't contribute to it. Override rules under `combine:`.
+
+search() walks the slots depth-first, tracking the interval each metric can still end up in.
+A branch is cut as soon as a hard constraint can no longer be met, or when even the best end of
+every interval cannot beat the current k-th best score. The cross product is never built.
+Results equal scoring every combination (in slot order) and keeping the first top_k feasible ones.
+
+Usage:
+  python tools/option_search.py samples/decision/components.yaml --profile samples/decision/nfr_profile.yaml \
+      [--top-k 10] [--out generated_options.yaml]
+  python tools/arch_decision_score.py --profile ... --components samples/decision/components.yaml --top-k 10
+"""
+import argparse, heapq, math, sys, yaml
+from req_io import load_yaml
+from arch_decision_score import LOWER_BETTER, norm_score, score_options
+
+DEFAULT_RULES = {
+    "performance_p95_ms": "max", "availability_pct": "product", "cost_monthly_usd": "sum",
+    "operability_score": "min", "scalability_score": "min", "security_score": "min",
+    "time_to_market_weeks": "max",
+}
+# rule -> (combine, identity); all are monotone, so combining per-slot extremes bounds every completion
+OPS = {
+    "sum": (lambda a, b: a + b, 0.0),
+    "max": (max, -math.inf),
+    "min": (min, math.inf),
+    "product": (lambda a, b: a * b, 1.0),
+}
+
+class ComponentSpace:
+    def __init__(self, spec):
+        self.rules = {**DEFAULT_RULES, **(spec.get("combine") or {})}
+        bad = sorted({r for r in self.rules.values() if r not in OPS})
+        if bad:
+            raise ValueError(f"unknown combine rule(s): {', '.join(bad)} (use one of {', '.join(OPS)})")
+        self.slots = list(spec.get("slots") or {})
+        self.choices = [list(spec["slots"][s]) for s in self.slots]
+        if not self.slots or not all(self.choices):
+            raise ValueError("components need at least one slot, and every slot at least one choice")
+        self.metrics = sorted({k for ch in self.choices for c in ch for k in c.get("metrics", {})})
+        missing = [k for k in self.metrics if k not in self.rules]
+        if missing:
+            raise ValueError(f"no combine rule for: {', '.join(missing)}")
+        self.ops = [OPS[self.rules[k]] for k in self.metrics]
+
+    def size(self):
+        return math.prod(len(c) for c in self.choices)
+
+    def provided(self, metric):
+        """True if every combination gets a value for metric (some slot sets it on all its choices)."""
+        return any(all(metric in c.get("metrics", {}) for c in ch) for ch in self.choices)
+
+    def encode(self, choice):
+        m = choice.get("metrics", {})
+        return tuple(ident if k not in m else (m[k] / 100.0 if self.rules[k] == "product" else float(m[k]))
+                     for k, (_, ident) in zip(self.metrics, self.ops))
+
+    def decode(self, acc):
+        out = {}
+        for k, x in zip(self.metrics, acc):
+            if self.rules[k] == "product":
+                x = round(x * 100.0, 4)
+            out[k] = int(x) if float(x).is_integer() else round(x, 4)
+        return out
+
+    def combine(self, a, b):
+        return tuple(op(x, y) for (op, _), x, y in zip(self.ops, a, b))
+
+    def option(self, picks):
+        """The option dict (options.yaml shape, plus `components`) for one choice index per slot."""
+        chosen = [ch[i] for ch, i in zip(self.choices, picks)]
+        acc = tuple(ident for _, ident in self.ops)
+        for c in chosen:
+            acc = self.combine(acc, self.encode(c))
+        given = {k for c in chosen for k in c.get("metrics", {})}
+        return {
+            "name": " + ".join(c["name"] for c in chosen),
+            "kind": next((c["kind"] for c in chosen if c.get("kind")), ""),
+            "metrics": {k: v for k, v in self.decode(acc).items() if k in given},
+            "components": {s: c["name"] for s, c in zip(self.slots, chosen)},
+            "notes": [n for c in chosen for n in c.get("notes", [])],
+            "risks": [r for c in chosen for r in c.get("risks", [])],
+        }
+
+    def options(self):
+        """Every combination in slot order (small spaces / testing only)."""
+        import itertools
+        return [self.option(p) for p in itertools.product(*(range(len(c)) for c in self.choices))]
+
+def search(space, prof, top_k=10):
+    """The top_k best-scoring feasible combinations as option dicts (best first), plus search statistics."""
+    unknown = [k for k in prof["weights"] if not space.provided(k)]
+    if unknown:
+        raise ValueError(f"weighted metric(s) not provided by every combination: {', '.join(unknown)}")
+    weights = prof["weights"]; bounds = prof["bounds"]
+    total = sum(weights.values()) or 1.0
+    weights = {k: v / total for k, v in weights.items()}
+    col = {k: j for j, k in enumerate(space.metrics)}
+    cons = [(col[c["metric"]], c.get("min"), c.get("max")) for c in prof.get("hard_constraints") or [] if c["metric"] in col]
+
+    S = len(space.slots)
+    vals = [[space.encode(c) for c in ch] for ch in space.choices]
+    rest_lo = [None] * (S + 1); rest_hi = [None] * (S + 1)
+    rest_lo[S] = rest_hi[S] = tuple(ident for _, ident in space.ops)
+    for s in range(S - 1, -1, -1):
+        rest_lo[s] = space.combine(tuple(map(min, zip(*vals[s]))), rest_lo[s + 1])
+        rest_hi[s] = space.combine(tuple(map(max, zip(*vals[s]))), rest_hi[s + 1])
+    radix = [math.prod(len(c) for c in space.choices[s + 1:]) for s in range(S)]
+    stats = {"combinations": space.size(), "nodes": 0, "scored": 0, "pruned_constraint": 0, "pruned_bound": 0}
+    heap = []  # (score, -index, picks); root = worst kept (lowest score, then latest in slot order)
+
+    def ends(acc, s):
+        return space.decode(space.combine(acc, rest_lo[s])), space.decode(space.combine(acc, rest_hi[s]))
+
+    def feasible(lo, hi):
+        for j, mn, mx in cons:
+            k = space.metrics[j]
+            if mn is not None and hi[k] < mn: return False
+            if mx is not None and lo[k] > mx: return False
+        return True
+
+    def optimistic(lo, hi):
+        # same expression as score_options(), so at a leaf it *is* the option's score
+        per = {k: norm_score(k, (lo if k in LOWER_BETTER else hi)[k], *bounds[k]) for k in weights}
+        return round(sum(weights[k] * per[k] for k in weights), 4)
+
+    def visit(s, acc, idx, picks):
+        stats["nodes"] += 1
+        children = []
+        for c, v in enumerate(vals[s]):
+            a = space.combine(acc, v)
+            lo, hi = ends(a, s + 1)
+            if not feasible(lo, hi):
+                stats["pruned_constraint"] += 1
+                continue
+            children.append((optimistic(lo, hi), c, a))
+        children.sort(key=lambda t: (-t[0], t[1]))  # most promising first: fills the top-k early
+        for bound, c, a in children:
+            cidx = idx + c * radix[s]
+            if len(heap) == top_k and (bound, -cidx) <= heap[0][:2]:
+                stats["pruned_bound"] += 1
+                continue
+            if s + 1 == S:
+                stats["scored"] += 1
+                item = (bound, -cidx, picks + (c,))
+                (heapq.heappush if len(heap) < top_k else heapq.heapreplace)(heap, item)
+            else:
+                visit(s + 1, a, cidx, picks + (c,))
+
+    if top_k > 0:
+        visit(0, rest_hi[S], 0, ())
+    best = sorted(heap, key=lambda t: (-t[0], -t[1]))
+    return [space.option(p) for _, _, p in best], stats
+
+def main():
+    ap = argparse.ArgumentParser(description="Search component combinations for the best-scoring architecture options")
+    ap.add_argument("components")
+    ap.add_argument("--profile", required=True)
+    ap.add_argument("--top-k", type=int, default=10)
+    ap.add_argument("--out", help="write the best combinations as an options.yaml")
+    a = ap.parse_args()
+    prof = load_yaml(a.profile)
+    opts, st = search(ComponentSpace(load_yaml(a.components)), prof, a.top_k)
+    print(f"{st['combinations']:,} combinations: visited {st['nodes']:,} nodes, scored {st['scored']:,}, "
+          f"pruned {st['pruned_constraint']:,} by constraints and {st['pruned_bound']:,} by score bound")
+    for i, s in enumerate(score_options(prof, opts), 1):
+        print(f"{i:>3}. {s['overall']:.4f}  {s['name']}")
+    if a.out:
+        with open(a.out, "w", encoding="utf-8") as f:
+            yaml.safe_dump({"options": opts}, f, sort_keys=False, allow_unicode=True)
+        print(f"Wrote {a.out}")
+    if not opts:
+        sys.exit("No combination satisfies the hard constraints")
+
+if __name__ == "__main__":
+    main()
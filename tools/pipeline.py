@@ -0,0 +1,230 @@
+#!/usr/bin/env python
+"""
+In-process pipeline runner for the workshop toolchain.
+
+Stages are imported as functions and pass in-memory objects to each other:
+
+  extract ─┬─ validate          score ─┬─ adr
+           ├─ lint                     └─ a2a
+           └─ er
+
+Each stage's output is cached (SQLite, .cache/pipeline.sqlite) under a hash of its inputs:
+the stage's tool source, its parameters, the content of the files it reads and the hashes of
+its dependencies' outputs. Only invalidated stages re-run; independent stages run concurrently.
+Files are (re)written only when their content changes.
+
+Usage:
+  python tools/pipeline.py                     # everything, sample inputs
+  python tools/pipeline.py lint er --jobs 4    # selected stages (+ their dependencies)
+"""
+import argparse, hashlib, io, json, pathlib, sys, time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+TOOLS = pathlib.Path(__file__).resolve().parent
+sys.path.insert(0, str(TOOLS))
+import instrument, req_io
+
+DEFAULTS = {
+    "requirements_md": ["samples/requirements_sample.md"],
+    "requirements_out": "samples/requirements.yaml",
+    "schema": "tools/req_schema.json",
+    "er_out": "docs/er.mmd",
+    "profile": "samples/decision/nfr_profile.yaml",
+    "options": "samples/decision/options.yaml",
+    "decisions_outdir": "docs/decisions",
+    "adr_id": "010",
+    "a2a_source": "samples/source_architecture.yaml",
+    "a2a_outdir": "docs/a2a",
+}
+
+def _hash(obj):
+    return hashlib.sha256(json.dumps(obj, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")).hexdigest()
+
+def _file_hash(p):
+    return hashlib.sha256(pathlib.Path(p).read_bytes()).hexdigest()
+
+# ---- stages: run(cfg, **deps) -> JSON-able output; emit(cfg, output) -> files written ----
+
+def run_extract(cfg):
+    import req_extract
+    return {"requirements": list(req_extract.iter_requirements(req_extract.expand_inputs(cfg["requirements_md"])))}
+
+def emit_extract(cfg, pkg):
+    import req_extract
+    buf = io.StringIO()
+    if req_io.package_format(cfg["requirements_out"]) == "jsonl":
+        req_extract.write_jsonl_stream(pkg["requirements"], buf)
+    else:
+        req_extract.write_yaml_stream(pkg["requirements"], buf)
+    return [cfg["requirements_out"]] if req_io.write_if_changed(cfg["requirements_out"], buf.getvalue()) else []
+
+def run_validate(cfg, extract):
+    import req_validate
+    schema = json.loads(pathlib.Path(cfg["schema"]).read_text(encoding="utf-8"))
+    return [list(e) for e in req_validate.validate_data(extract, schema)]
+
+def run_lint(cfg, extract):
+    import req_lint
+    reqs = extract["requirements"]
+    results = req_lint.lint_all(reqs)
+    return {"results": [(rid, i) for rid, i in results if i], "conflicts": req_lint.detect_conflicts(reqs)}
+
+def run_er(cfg, extract):
+    import generate_mermaid_er
+    return generate_mermaid_er.render_er(extract["requirements"])
+
+def emit_er(cfg, mmd):
+    return [cfg["er_out"]] if req_io.write_if_changed(cfg["er_out"], mmd) else []
+
+def run_score(cfg):
+    import arch_decision_score
+    prof = req_io.load_yaml(cfg["profile"])
+    scored = arch_decision_score.score_options(prof, req_io.load_yaml(cfg["options"])["options"])
+    return {"profile": prof, "scored": scored, "report": arch_decision_score.render_report(prof, scored)}
+
+def emit_score(cfg, out):
+    d = pathlib.Path(cfg["decisions_outdir"])
+    files = {d / "decision_scores.jsonl": req_io.dumps_scores({"profile": out["profile"], "scored": out["scored"]}),
+             d / "decision_report.md": out["report"]}
+    return [str(p) for p, text in files.items() if req_io.write_if_changed(p, text)]
+
+def run_adr(cfg, score):
+    import adr_from_score
+    kind, text = adr_from_score.render_adr(score, cfg["adr_id"])
+    return {"file": f"ADR-{cfg['adr_id']}-{kind}.md", "text": text}
+
+def emit_adr(cfg, out):
+    p = pathlib.Path(cfg["decisions_outdir"]) / out["file"]
+    return [str(p)] if req_io.write_if_changed(p, out["text"]) else []
+
+def run_a2a(cfg, score):
+    import a2a_transform, decision_to_a2a
+    source = a2a_transform.load_source(pathlib.Path(cfg["a2a_source"]))
+    style = decision_to_a2a.style_for(score["scored"][0])
+    return a2a_transform.transform(source, style, score["profile"].get("system", "System"))
+
+def emit_a2a(cfg, files):
+    d = pathlib.Path(cfg["a2a_outdir"])
+    return [str(d / rel) for rel, text in files.items() if req_io.write_if_changed(d / rel, text)]
+
+class Stage:
+    def __init__(self, name, run, deps=(), files=(), params=(), tools=(), emit=None):
+        self.name, self.run, self.deps, self.emit = name, run, tuple(deps), emit
+        self.files, self.params, self.tools = files, tuple(params), tuple(tools)
+
+    def key(self, cfg, dep_hashes):
+        """Hash of everything the stage output depends on."""
+        files = self.files(cfg) if callable(self.files) else [cfg[k] for k in self.files]
+        return _hash({
+            "stage": self.name,
+            "tools": [_file_hash(TOOLS / t) for t in self.tools],
+            "params": {k: cfg[k] for k in self.params},
+            "files": {str(f): _file_hash(f) for f in files},
+            "deps": dep_hashes,
+        })
+
+def _extract_inputs(cfg):
+    import req_extract
+    return req_extract.expand_inputs(cfg["requirements_md"])
+
+STAGES = {s.name: s for s in [
+    Stage("extract", run_extract, files=_extract_inputs, tools=["req_extract.py"], emit=emit_extract),
+    Stage("validate", run_validate, ["extract"], files=["schema"], tools=["req_validate.py"]),
+    Stage("lint", run_lint, ["extract"], tools=["req_lint.py", "req_lint_rules.py"]),
+    Stage("er", run_er, ["extract"], tools=["generate_mermaid_er.py"], emit=emit_er),
+    Stage("score", run_score, files=["profile", "options"], tools=["arch_decision_score.py"], emit=emit_score),
+    Stage("adr", run_adr, ["score"], params=["adr_id"], tools=["adr_from_score.py"], emit=emit_adr),
+    Stage("a2a", run_a2a, ["score"], files=["a2a_source"], tools=["a2a_transform.py", "decision_to_a2a.py"], emit=emit_a2a),
+]}
+
+def _closure(targets):
+    need, todo = set(), list(targets)
+    while todo:
+        n = todo.pop()
+        if n not in need:
+            need.add(n); todo.extend(STAGES[n].deps)
+    return need
+
+def run_pipeline(cfg=None, targets=None, cache=None, jobs=4, emit=True):
+    """Run the requested stages (and their dependencies) as a DAG.
+    Returns {stage: {"output", "cached", "seconds", "written"}}."""
+    cfg = {**DEFAULTS, **(cfg or {})}
+    need = _closure(targets or STAGES)
+    outputs, hashes, report = {}, {}, {}
+
+    def execute(name):
+        st, t0 = STAGES[name], time.perf_counter()
+        key = st.key(cfg, {d: hashes[d] for d in st.deps})
+        out = cache.get(f"{name}:{key}") if cache is not None else None
+        cached = out is not None
+        if not cached:
+            out = st.run(cfg, **{d: outputs[d] for d in st.deps})
+            out = json.loads(json.dumps(out))  # same shape whether fresh or cached
+            if cache is not None:
+                cache.put(f"{name}:{key}", out)
+        written = st.emit(cfg, out) if (emit and st.emit) else []
+        return name, out, cached, time.perf_counter() - t0, written
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as ex:
+        running = {}
+        while len(report) < len(need):
+            for n in sorted(need):
+                if n not in report and n not in running.values() and all(d in report for d in STAGES[n].deps):
+                    running[ex.submit(execute, n)] = n
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                del running[fut]
+                name, out, cached, secs, written = fut.result()
+                outputs[name], hashes[name] = out, _hash(out)
+                report[name] = {"output": out, "cached": cached, "seconds": secs, "written": written}
+    return report
+
+def main():
+    ap = argparse.ArgumentParser(description="Run the requirements/decision pipeline in one process")
+    ap.add_argument("stages", nargs="*", help=f"stages to run (default: all): {', '.join(STAGES)}")
+    ap.add_argument("--md", nargs="+", default=DEFAULTS["requirements_md"], help="requirement Markdown files/dirs/globs")
+    ap.add_argument("--requirements-out", default=DEFAULTS["requirements_out"])
+    ap.add_argument("--profile", default=DEFAULTS["profile"])
+    ap.add_argument("--options", default=DEFAULTS["options"])
+    ap.add_argument("--jobs", type=int, default=4, help="max stages running at once")
+    ap.add_argument("--cache", default=".cache/pipeline.sqlite")
+    ap.add_argument("--no-cache", action="store_true")
+    instrument.add_arguments(ap)
+    a = ap.parse_args()
+    tm = instrument.from_args("pipeline", a)
+    unknown = [s for s in a.stages if s not in STAGES]
+    if unknown:
+        ap.error(f"unknown stage(s): {', '.join(unknown)}")
+
+    cfg = {"requirements_md": a.md, "requirements_out": a.requirements_out, "profile": a.profile, "options": a.options}
+    cache = None
+    if not a.no_cache:
+        from sqlite_cache import SqliteCache
+        cache = SqliteCache(a.cache, max_entries=1000)
+    try:
+        report = run_pipeline(cfg, a.stages or None, cache, a.jobs)
+    finally:
+        if cache is not None:
+            cache.close()
+
+    for name in [n for n in STAGES if n in report]:
+        r = report[name]
+        tm.record(name, r["seconds"])
+        state = "cached" if r["cached"] else "ran"
+        print(f"{name:<9} {state:<7} {r['seconds']*1000:8.1f} ms" + (f"  wrote {', '.join(r['written'])}" if r["written"] else ""))
+    failed = False
+    if "validate" in report and report["validate"]["output"]:
+        failed = True
+        print("\nSchema validation: FAILED")
+        for path, msg in report["validate"]["output"]:
+            print(f"- {path}: {msg}")
+    if "lint" in report:
+        import req_lint
+        lint = report["lint"]["output"]
+        if lint["results"] or lint["conflicts"]:
+            print("\n" + req_lint.render_text(lint["results"], lint["conflicts"]))
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
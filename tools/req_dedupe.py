@@ -0,0 +1,293 @@
+#!/usr/bin/env python
+"""
+Near-duplicate requirement detection (MinHash + LSH).
+
+- Text is normalized (lower-cased, every digit run -> 0, so a copy that only changes its numbers
+  still matches) and shingled into word bigrams; each requirement gets a 128-value MinHash signature.
+- LSH banding (16 bands x 8 rows) buckets the signatures: only requirements sharing a bucket are
+  compared, and each with the bucket's first member only, so the cost grows roughly linearly with
+  the corpus instead of with all pairs. Candidates are confirmed by estimated Jaccard similarity
+  (the share of equal signature values) and joined into clusters.
+- Clusters list every member's similarity to the cluster's first requirement and flag copies whose
+  numbers differ (restated requirements with conflicting targets).
+- --index DB keeps signatures and band keys in SQLite, so new requirements are checked against an
+  existing corpus without recomputing it; --update upserts the package's requirements by id.
+All hashing is seeded (no Python str hash), so signatures are stable across runs and processes.
+req_lint.py --dedupe runs the in-package check as part of linting.
+
+Usage:
+  python tools/req_dedupe.py samples/requirements.yaml [--threshold 0.8] [--format json]
+  python tools/req_dedupe.py corpus.jsonl --index .cache/dedupe.sqlite --update    # build / refresh the index
+  python tools/req_dedupe.py new.yaml --index .cache/dedupe.sqlite                   # check new requirements against it
+Exit code: 1 if any near-duplicates were found.
+"""
+import argparse, hashlib, json, pathlib, re, sqlite3, sys, zlib
+import instrument
+from req_io import iter_package
+
+NUM_PERM, BANDS, SHINGLE, THRESHOLD = 128, 16, 2, 0.8
+U64 = 0xFFFFFFFFFFFFFFFF
+_DIGITS = re.compile(r"\d+")
+_WORD = re.compile(r"\w+")
+_NUMBERS = re.compile(r"\d+(?:[.,]\d+)*")
+
+def _splitmix64(seed, n):
+    out, x = [], seed & U64
+    for _ in range(n):
+        x = (x + 0x9E3779B97F4A7C15) & U64
+        z = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & U64
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & U64
+        out.append(z ^ (z >> 31))
+    return out
+
+def tokens(text):
+    return _WORD.findall(_DIGITS.sub("0", text.lower()))
+
+class MinHasher:
+    """Seeded MinHash over word shingles: h(x) = (a*x + b mod 2^64) >> 32 per permutation."""
+    def __init__(self, num_perm=NUM_PERM, bands=BANDS, shingle=SHINGLE, seed=1):
+        import numpy as np
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.np, self.num_perm, self.bands, self.rows, self.shingle, self.seed = np, num_perm, bands, num_perm // bands, shingle, seed
+        r = _splitmix64(seed, 2 * num_perm + shingle + self.rows)
+        odd = lambda xs: np.array([x | 1 for x in xs], dtype=np.uint64)
+        self.a, self.b = odd(r[:num_perm])[:, None], np.array(r[num_perm:2 * num_perm], dtype=np.uint64)[:, None]
+        self.mix, self.band_mix = odd(r[2 * num_perm:2 * num_perm + shingle]), odd(r[2 * num_perm + shingle:])
+        self.vocab = {}  # token -> crc32
+
+    def params(self):
+        return {"num_perm": self.num_perm, "bands": self.bands, "shingle": self.shingle, "seed": self.seed}
+
+    def signatures(self, texts, chunk=2048):
+        """(signatures (n, num_perm) uint32, mask of texts that had any words)."""
+        np, k, vocab = self.np, self.shingle, self.vocab
+        sigs = np.empty((len(texts), self.num_perm), dtype=np.uint32)
+        ok = np.ones(len(texts), dtype=bool)
+        for lo in range(0, len(texts), chunk):
+            flat, lengths = [], []
+            for i, t in enumerate(texts[lo:lo + chunk], lo):
+                toks = tokens(t)
+                if not toks:
+                    ok[i] = False
+                th = [vocab[w] if w in vocab else vocab.setdefault(w, zlib.crc32(w.encode("utf-8"))) for w in toks]
+                th += [0] * (k - len(th))  # short texts: one padded shingle
+                flat += th; lengths.append(len(th))
+            flat = np.array(flat, dtype=np.uint64)
+            doc = np.repeat(np.arange(len(lengths)), lengths)
+            n = len(flat) - k + 1
+            x = flat[:n] * self.mix[0]
+            for j in range(1, k):
+                x += flat[j:j + n] * self.mix[j]
+            x = x[doc[:n] == doc[k - 1:]]  # windows inside one text
+            x = (x >> np.uint64(32)) ^ (x & np.uint64(0xFFFFFFFF))
+            starts = np.r_[0, np.cumsum(np.array(lengths) - k + 1)[:-1]]
+            h = (self.a * x[None, :] + self.b) >> np.uint64(32)
+            sigs[lo:lo + len(lengths)] = np.minimum.reduceat(h, starts, axis=1).T
+        return sigs, ok
+
+    def band_keys(self, sigs):
+        """(n, bands) int64 key per LSH band (SQLite-sized)."""
+        n = len(sigs)
+        keys = (sigs.reshape(n, self.bands, self.rows).astype(self.np.uint64) * self.band_mix).sum(axis=2, dtype=self.np.uint64)
+        return keys.view(self.np.int64)
+
+    def clusters(self, sigs, threshold=THRESHOLD, ok=None, chunk=65536):
+        """Index groups (each ascending, groups by first index) of signatures linked by a band-mate
+        at >= threshold estimated similarity."""
+        np = self.np
+        n = len(sigs)
+        idx = np.arange(n) if ok is None else np.flatnonzero(ok)
+        if not len(idx):  # nothing (or only blank texts) to compare
+            return []
+        keys = self.band_keys(sigs)
+        src, dst = [], []
+        for band in range(self.bands):
+            order = idx[np.argsort(keys[idx, band], kind="stable")]
+            k = keys[order, band]
+            first = np.r_[True, k[1:] != k[:-1]]
+            rep = order[np.flatnonzero(first)[np.cumsum(first) - 1]]  # each element's bucket head
+            others, reps = order[~first], rep[~first]
+            for lo in range(0, len(others), chunk):
+                o, r = others[lo:lo + chunk], reps[lo:lo + chunk]
+                hit = (sigs[o] == sigs[r]).mean(axis=1) >= threshold
+                src.append(o[hit]); dst.append(r[hit])
+        label = np.arange(n)
+        if src:
+            src, dst = np.concatenate(src), np.concatenate(dst)
+            while True:  # min-label propagation with pointer jumping
+                new = label.copy()
+                np.minimum.at(new, src, label[dst])
+                np.minimum.at(new, dst, label[src])
+                new = new[new]
+                if (new == label).all():
+                    break
+                label = new
+        order = np.argsort(label, kind="stable")
+        bounds = np.flatnonzero(np.r_[True, label[order][1:] != label[order][:-1], True])
+        groups = [order[s:e] for s, e in zip(bounds[:-1], bounds[1:]) if e - s > 1]
+        return sorted(groups, key=lambda g: g[0])
+
+    def similarity(self, sig, others):
+        return (others == sig).mean(axis=1)
+
+def numbers(text):
+    return _NUMBERS.findall(text or "")
+
+def find_duplicates(reqs, threshold=THRESHOLD, hasher=None):
+    """[{"ids", "similarity", "numbers_differ"}] per cluster of near-duplicate requirements; ids in
+    input order, similarity to the first."""
+    hasher = hasher or MinHasher()
+    reqs = list(reqs)
+    texts = [r.get("text") or "" for r in reqs]
+    sigs, ok = hasher.signatures(texts)
+    out = []
+    for g in hasher.clusters(sigs, threshold, ok):
+        sims = hasher.similarity(sigs[g[0]], sigs[g])
+        first = numbers(texts[g[0]])
+        out.append({"ids": [reqs[i].get("id", "?") for i in g], "similarity": [round(float(s), 2) for s in sims],
+                    "numbers_differ": any(numbers(texts[i]) != first for i in g[1:])})
+    return out
+
+def version(hasher=None):
+    """Changes whenever this file or the MinHash parameters change (cache namespace for find_duplicates)."""
+    h = hashlib.sha256(pathlib.Path(__file__).read_bytes())
+    h.update(json.dumps((hasher or MinHasher()).params(), sort_keys=True).encode("utf-8"))
+    return h.hexdigest()[:16]
+
+def describe(cluster, max_listed=10):
+    """One report line, e.g. "near-duplicate requirements → R1 ≈ R7:0.94, R9:1.00 (numbers differ)"."""
+    ids, sims = cluster["ids"], cluster["similarity"]
+    rest = [f"{rid}:{s:.2f}" for rid, s in zip(ids[1:max_listed], sims[1:max_listed])]
+    more = f" (+{len(ids) - max_listed} more)" if len(ids) > max_listed else ""
+    return (f"near-duplicate requirements → {ids[0]} ≈ {', '.join(rest)}{more}"
+            + (" (numbers differ)" if cluster["numbers_differ"] else ""))
+
+class DedupeIndex:
+    """Signatures and LSH band keys of a requirement corpus in SQLite: upsert by requirement id,
+    query new texts against it. The MinHash parameters are stored with the index."""
+    def __init__(self, path, hasher=None):
+        pathlib.Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(path))
+        self.db.executescript(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS sigs (rid TEXT PRIMARY KEY, sig BLOB NOT NULL, text TEXT NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS bands (band INTEGER NOT NULL, key INTEGER NOT NULL, rid TEXT NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS bands_key ON bands(band, key);"
+            "CREATE INDEX IF NOT EXISTS bands_rid ON bands(rid);")
+        row = self.db.execute("SELECT value FROM meta WHERE key='params'").fetchone()
+        if row is None:
+            self.hasher = hasher or MinHasher()
+            with self.db:
+                self.db.execute("INSERT INTO meta VALUES ('params', ?)", (json.dumps(self.hasher.params()),))
+        else:
+            params = json.loads(row[0])
+            if hasher is not None and hasher.params() != params:
+                raise ValueError(f"{path}: index was built with {params}, not {hasher.params()}")
+            self.hasher = hasher or MinHasher(**params)
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM sigs").fetchone()[0]
+
+    def upsert(self, reqs):
+        """Add or replace requirements (by id); returns how many were written. A requirement whose
+        text is blank (no words) is removed from the index."""
+        reqs = list(reqs)
+        sigs, ok = self.hasher.signatures([r.get("text") or "" for r in reqs])
+        keys = self.hasher.band_keys(sigs).tolist()
+        rows = [(r.get("id", "?"), r["text"], s, k) for r, s, k, good in zip(reqs, sigs, keys, ok) if good]
+        blank = [(r.get("id", "?"),) for r, good in zip(reqs, ok) if not good]
+        with self.db:
+            self.db.executemany("DELETE FROM sigs WHERE rid=?", blank)
+            self.db.executemany("DELETE FROM bands WHERE rid=?", blank + [(rid,) for rid, *_ in rows])
+            self.db.executemany("INSERT OR REPLACE INTO sigs VALUES (?, ?, ?)", [(rid, s.tobytes(), text) for rid, text, s, _ in rows])
+            self.db.executemany("INSERT INTO bands VALUES (?, ?, ?)", [(b, key, rid) for rid, _, _, ks in rows for b, key in enumerate(ks)])
+        return len(rows)
+
+    def query(self, reqs, threshold=THRESHOLD):
+        """{id: [(corpus id, similarity, numbers differ)], best first} for requirements with indexed
+        near-duplicates (a requirement never matches its own id)."""
+        np = self.hasher.np
+        reqs = list(reqs)
+        sigs, ok = self.hasher.signatures([r.get("text") or "" for r in reqs])
+        keys = self.hasher.band_keys(sigs).tolist()
+        db = self.db
+        db.execute("CREATE TEMP TABLE IF NOT EXISTS q (qi INTEGER, band INTEGER, key INTEGER)")
+        db.execute("DELETE FROM q")
+        db.executemany("INSERT INTO q VALUES (?, ?, ?)", [(i, b, key) for i, ks in enumerate(keys) if ok[i] for b, key in enumerate(ks)])
+        cands = db.execute("SELECT DISTINCT q.qi, b.rid FROM q JOIN bands b ON b.band = q.band AND b.key = q.key").fetchall()
+        stored = {}
+        rids = sorted({rid for _, rid in cands})
+        for lo in range(0, len(rids), 500):
+            part = rids[lo:lo + 500]
+            for rid, blob, text in db.execute(f"SELECT rid, sig, text FROM sigs WHERE rid IN ({','.join('?' * len(part))})", part):
+                stored[rid] = (np.frombuffer(blob, dtype=np.uint32), text)
+        out = {}
+        for qi, rid in cands:
+            r = reqs[qi]
+            if rid == r.get("id", "?"):
+                continue
+            sim = float((stored[rid][0] == sigs[qi]).mean())
+            if sim >= threshold:
+                out.setdefault(r.get("id", "?"), []).append((rid, round(sim, 2), numbers(stored[rid][1]) != numbers(r.get("text"))))
+        for matches in out.values():
+            matches.sort(key=lambda m: (-m[1], m[0]))
+        return out
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def main():
+    ap = argparse.ArgumentParser(description="Near-duplicate requirements (MinHash + LSH)")
+    ap.add_argument("yaml_file", help="requirements package (.yaml, .jsonl or .msgpack)")
+    ap.add_argument("--threshold", type=float, default=THRESHOLD, help="min estimated Jaccard similarity of word shingles")
+    ap.add_argument("--index", default=None, help="SQLite signature index of a corpus to check the package against")
+    ap.add_argument("--update", action="store_true", help="upsert the package into --index (by requirement id) after checking")
+    ap.add_argument("--format", choices=["text", "json"], default="text")
+    ap.add_argument("--output", default=None, help="write the report here instead of stdout")
+    instrument.add_arguments(ap)
+    a = ap.parse_args()
+    if a.update and not a.index:
+        ap.error("--update needs --index")
+    tm = instrument.from_args("req_dedupe", a)
+
+    with tm.stage("read"):
+        reqs = list(iter_package(a.yaml_file))
+    with tm.stage("cluster"):
+        clusters = find_duplicates(reqs, a.threshold)
+    matches, written = {}, None
+    if a.index:
+        with DedupeIndex(a.index) as idx:
+            with tm.stage("query"):
+                matches = idx.query(reqs, a.threshold)
+            if a.update:
+                with tm.stage("update"):
+                    written = idx.upsert(reqs)
+
+    with tm.stage("render"):
+        if a.format == "json":
+            report = json.dumps({"tool": "req_dedupe", "source": a.yaml_file, "threshold": a.threshold, "clusters": clusters,
+                                 "matches": [{"id": rid, "matches": [{"id": m, "similarity": s, "numbers_differ": d} for m, s, d in ms]}
+                                             for rid, ms in matches.items()]}, indent=2, ensure_ascii=False)
+        else:
+            lines = [describe(c) for c in clusters]
+            lines += [f"{rid} ≈ indexed " + ", ".join(f"{m}:{s:.2f}" + (" (numbers differ)" if d else "") for m, s, d in ms[:10])
+                      for rid, ms in matches.items()]
+            report = "\n".join(lines) if lines else "Near-duplicates: none"
+    if a.output:
+        pathlib.Path(a.output).write_text(report + "\n", encoding="utf-8")
+    else:
+        print(report)
+    if written is not None:
+        print(f"Indexed {written} requirement(s) in {a.index}", file=sys.stderr)
+    if clusters or matches:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
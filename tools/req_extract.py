@@ -1,18 +1,114 @@
 #!/usr/bin/env python
-import argparse, yaml, pathlib
-def parse_markdown(md:str):
-    reqs=[]; rid=1
-    for line in md.splitlines():
+"""
+Requirement extractor: Markdown -> requirements YAML/JSONL.
+
+Inputs may be files, directories (searched recursively for *.md) or globs.
+Requirements are yielded lazily and written one at a time, so memory stays flat
+and downstream tools can read the output while the corpus is still being parsed.
+
+IDs are assigned in sorted path order, so the same corpus always gets the same IDs:
+- global (default): R001, R002, ... numbered across all files
+- file: <file-stem>-R001, ... numbered per file, so editing one file never renumbers another. Files
+  sharing a stem are told apart by their path below the common input root (a/reqs.md -> a-reqs-R001);
+  adding a file whose stem is already taken (b/reqs.md) therefore renames the IDs of the existing one
+  (reqs-R001 -> a-reqs-R001). Give files unique names where IDs must stay stable.
+"""
+import argparse, glob, itertools, json, os, sys, yaml, pathlib
+from collections import Counter
+from typing import Iterable, Iterator, List
+import instrument
+
+def _req(rid: str, t: str):
+    return {"id": rid, "type": "func" if "As a" in t else "nfr",
+            "text": t, "priority": "M", "category": None, "acceptance": []}
+
+def iter_markdown(lines: Iterable[str], ids: Iterator[int] = None, prefix: str = "") -> Iterator[dict]:
+    ids = ids if ids is not None else itertools.count(1)
+    for line in lines:
         t=line.strip()
         if not t or t.startswith("#"): continue
-        reqs.append({"id": f"R{rid:03}", "type": "func" if "As a" in t else "nfr",
-                     "text": t, "priority": "M", "category": None, "acceptance": []})
-        rid+=1
-    return {"requirements": reqs}
+        yield _req(f"{prefix}R{next(ids):03}", t)
+
+def parse_markdown(md:str):
+    return {"requirements": list(iter_markdown(md.splitlines()))}
+
+def expand_inputs(specs: Iterable[str]) -> List[pathlib.Path]:
+    out=set()
+    for s in specs:
+        p=pathlib.Path(s)
+        if p.is_dir():
+            out.update(x for x in p.rglob("*.md") if x.is_file())
+        elif p.is_file():
+            out.add(p)
+        else:
+            out.update(pathlib.Path(x) for x in glob.glob(s, recursive=True) if pathlib.Path(x).is_file())
+    return sorted(out)
+
+def file_prefixes(paths: List[pathlib.Path]) -> dict:
+    """Per-file ID prefix for --ids file: the stem, or the path below the common root when stems clash."""
+    stems=Counter(p.stem for p in paths)
+    root=os.path.commonpath([os.path.abspath(p.parent) for p in paths]) if paths else ""
+    out={}
+    for p in paths:
+        name=p.stem if stems[p.stem] == 1 else "-".join(pathlib.Path(os.path.relpath(os.path.abspath(p), root)).with_suffix("").parts)
+        out[p]=f"{name}-"
+    clash=[k for k, n in Counter(out.values()).items() if n > 1]
+    if clash:
+        raise ValueError(f"--ids file: inputs would share the ID prefix {clash[0]!r}; rename one of them")
+    return out
+
+def iter_requirements(paths: Iterable[pathlib.Path], ids: str = "global") -> Iterator[dict]:
+    counter=itertools.count(1)
+    if ids == "file":
+        paths=list(paths); prefixes=file_prefixes(paths)
+    for p in paths:
+        if ids == "file":
+            counter=itertools.count(1)
+        with open(p, encoding="utf-8") as f:
+            yield from iter_markdown(f, counter, prefixes[p] if ids == "file" else "")
+
+def write_yaml_stream(reqs: Iterable[dict], fh) -> int:
+    n=0
+    for r in reqs:
+        if n == 0: fh.write("requirements:\n")
+        fh.write(yaml.safe_dump([r], sort_keys=False))
+        n+=1
+    if n == 0: fh.write("requirements: []\n")
+    return n
+
+def write_jsonl_stream(reqs: Iterable[dict], fh) -> int:
+    n=0
+    for r in reqs:
+        fh.write(json.dumps(r, ensure_ascii=False) + "\n")
+        n+=1
+    return n
+
 if __name__=="__main__":
-    ap=argparse.ArgumentParser()
-    ap.add_argument("input_md"); ap.add_argument("--out",required=True)
+    ap=argparse.ArgumentParser(description="Extract requirements from Markdown files, directories or globs")
+    ap.add_argument("inputs", nargs="+", help="Markdown file(s), directories or glob patterns")
+    ap.add_argument("--out",required=True, help="output path, or '-' for stdout")
+    ap.add_argument("--format", choices=["yaml","jsonl"], default=None, help="default: from --out suffix (.jsonl -> jsonl, else yaml)")
+    ap.add_argument("--ids", choices=["global","file"], default="global")
+    instrument.add_arguments(ap)
     a=ap.parse_args()
-    data=parse_markdown(pathlib.Path(a.input_md).read_text(encoding="utf-8"))
-    pathlib.Path(a.out).write_text(yaml.safe_dump(data, sort_keys=False), encoding="utf-8")
-    print(f"Wrote {a.out}")
+    tm=instrument.from_args("req_extract", a)
+    fmt=a.format or ("jsonl" if a.out.endswith(".jsonl") else "yaml")
+    with tm.stage("expand"):
+        paths=expand_inputs(a.inputs)
+    if not paths:
+        sys.exit(f"No Markdown inputs matched: {' '.join(a.inputs)}")
+    write=write_jsonl_stream if fmt == "jsonl" else write_yaml_stream
+    if a.ids == "file":
+        try:
+            file_prefixes(paths)  # fail before the output file is opened
+        except ValueError as e:
+            sys.exit(str(e))
+    reqs=iter_requirements(paths, a.ids)
+    with tm.stage("extract"):  # streamed: reading, parsing and writing interleave
+        if a.out == "-":
+            write(reqs, sys.stdout)
+        else:
+            with open(a.out, "w", encoding="utf-8") as fh:
+                n=write(reqs, fh)
+    if a.out != "-":
+        print(f"Wrote {a.out} ({n} requirements from {len(paths)} file(s))")
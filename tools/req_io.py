@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+"""
+Shared loaders for requirement packages and YAML inputs.
+
+- YAML is parsed with libyaml's CSafeLoader when PyYAML was built with it (pure-Python fallback).
+  PyYAML is imported on first use, so tools reading .jsonl / .msgpack never pay for it.
+- Requirement packages may also be stored compactly:
+  - .jsonl     one requirement object per line (what `req_extract.py --out x.jsonl` writes)
+  - .jsonl.idx optional memory-mapped index of line offsets for O(1) random access (JsonlPackage)
+  - .msgpack   the package dict as MessagePack (needs the optional `msgpack` module)
+  - .sqlite     a requirement store (req_store.py; also .sqlite3 / .db): read in stored order, written by upsert
+All tools read packages through load_package(), so any format works everywhere.
+
+Decision scores (arch_decision_score.py output) are written as decision_scores.jsonl: a header line
+(format, count, profile and any extra sections), then one scored option per line, best first.
+load_scores(p, top_k) reads only the header and the first top_k rows; pretty .json still loads.
+
+Convert once, load fast afterwards:
+  python tools/req_io.py samples/requirements.yaml requirements.jsonl --index
+"""
+import argparse, array, itertools, json, mmap, pathlib, sys
+
+_Loader = None
+
+def loads_yaml(text):
+    global _Loader
+    import yaml
+    if _Loader is None:
+        _Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)  # SafeLoader: PyYAML without libyaml
+    return yaml.load(text, Loader=_Loader)
+
+def load_yaml(p):
+    return loads_yaml(pathlib.Path(p).read_text(encoding="utf-8"))
+
+def package_format(p) -> str:
+    s = str(p).lower()
+    if s.endswith((".sqlite", ".sqlite3", ".db")):
+        return "sqlite"
+    return "jsonl" if s.endswith(".jsonl") else "msgpack" if s.endswith((".msgpack", ".mpk")) else "yaml"
+
+def iter_jsonl(lines):
+    for line in lines:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+def iter_package(p):
+    """Yield requirements one at a time (constant memory for .jsonl and stores)."""
+    fmt = package_format(p)
+    if fmt == "jsonl":
+        with open(p, encoding="utf-8") as f:
+            yield from iter_jsonl(f)
+    elif fmt == "sqlite":
+        from req_store import RequirementStore
+        with RequirementStore(p, readonly=True) as st:
+            yield from st.query()
+    else:
+        yield from load_package(p).get("requirements", [])
+
+def loads_package(raw: bytes, fmt: str = "yaml"):
+    """Parse package bytes already in memory into {"requirements": [...], ...}."""
+    if fmt == "jsonl":
+        return {"requirements": list(iter_jsonl(raw.decode("utf-8").splitlines()))}
+    if fmt == "msgpack":
+        try:
+            import msgpack
+        except ImportError:
+            raise RuntimeError("reading .msgpack packages needs the optional 'msgpack' module (pip install msgpack)")
+        return msgpack.unpackb(raw, raw=False)
+    if fmt == "sqlite":
+        raise ValueError("requirement stores are read from their path: use load_package() / iter_package()")
+    return loads_yaml(raw.decode("utf-8")) or {}
+
+def load_package(p):
+    if package_format(p) == "sqlite":
+        return {"requirements": list(iter_package(p))}
+    return loads_package(pathlib.Path(p).read_bytes(), package_format(p))
+
+def dump_package(data, p, index=False):
+    """Write a package dict as YAML, JSONL (+ optional .idx), MessagePack or a store (upsert), chosen by suffix."""
+    p = pathlib.Path(p); fmt = package_format(p)
+    if fmt == "jsonl":
+        with open(p, "w", encoding="utf-8") as f:
+            for r in data.get("requirements", []):
+                f.write(json.dumps(r, ensure_ascii=False) + "\n")
+        if index:
+            build_index(p)
+    elif fmt == "sqlite":
+        from req_store import RequirementStore
+        with RequirementStore(p) as st:
+            st.upsert(data.get("requirements", []))
+    elif fmt == "msgpack":
+        import msgpack
+        p.write_bytes(msgpack.packb(data, use_bin_type=True))
+    else:
+        import yaml
+        p.write_text(yaml.safe_dump(data, sort_keys=False), encoding="utf-8")
+
+def write_if_changed(p, text):
+    """Write text only when the file content differs (keeps mtimes and git diffs quiet); True if written."""
+    p = pathlib.Path(p)
+    data = text.encode("utf-8")
+    try:
+        if p.stat().st_size == len(data) and p.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_bytes(data)
+    return True
+
+SCORES_FORMAT = "decision-scores/1"
+
+def iter_scores_lines(doc):
+    """JSONL lines for a decision scores document {"profile", "scored", ...}: header, then rows."""
+    yield json.dumps({"format": SCORES_FORMAT, "count": len(doc["scored"]),
+                      **{k: v for k, v in doc.items() if k != "scored"}}, ensure_ascii=False)
+    for row in doc["scored"]:
+        yield json.dumps(row, ensure_ascii=False)
+
+def dumps_scores(doc, fmt="jsonl"):
+    if fmt == "json":
+        return json.dumps(doc, indent=2)
+    return "".join(line + "\n" for line in iter_scores_lines(doc))
+
+def dump_scores(doc, p):
+    """Write decision scores as JSONL (rows streamed) or, for a .json path, the pretty export."""
+    p = pathlib.Path(p)
+    if package_format(p) != "jsonl":
+        p.write_text(dumps_scores(doc, "json"), encoding="utf-8")
+        return
+    with open(p, "w", encoding="utf-8") as f:
+        for line in iter_scores_lines(doc):
+            f.write(line + "\n")
+
+def load_scores(p, top_k=None):
+    """Decision scores document holding only the best top_k rows (all if None); "count" is the total.
+    .jsonl is read only as far as needed, so the best option costs one line however many were scored."""
+    if package_format(p) != "jsonl":
+        doc = json.loads(pathlib.Path(p).read_text(encoding="utf-8"))
+        doc.setdefault("count", len(doc["scored"]))
+        doc["scored"] = doc["scored"][:top_k]
+        return doc
+    with open(p, encoding="utf-8") as f:
+        head = json.loads(f.readline() or "{}")
+        if head.pop("format", None) != SCORES_FORMAT:
+            raise ValueError(f"{p}: not a decision scores file (expected a {SCORES_FORMAT} header line)")
+        return {**head, "scored": list(iter_jsonl(itertools.islice(f, top_k)))}
+
+def build_index(p):
+    """Write <file>.idx: little-endian uint64 start offsets of every non-empty line, plus EOF."""
+    offs = array.array("Q")
+    pos = 0
+    with open(p, "rb") as f:
+        for line in f:
+            if line.strip():
+                offs.append(pos)
+            pos += len(line)
+    offs.append(pos)
+    if sys.byteorder != "little":
+        offs.byteswap()
+    idx = pathlib.Path(str(p) + ".idx")
+    idx.write_bytes(offs.tobytes())
+    return idx
+
+class JsonlPackage:
+    """Random access into a .jsonl package through its memory-mapped .idx (built if missing)."""
+    def __init__(self, p):
+        self.path = pathlib.Path(p)
+        idx = pathlib.Path(str(p) + ".idx")
+        if not idx.exists() or idx.stat().st_mtime < self.path.stat().st_mtime:
+            build_index(self.path)
+        self._f = open(self.path, "rb"); self._fi = open(idx, "rb")
+        self._data = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ) if self.path.stat().st_size else b""
+        self._idx = mmap.mmap(self._fi.fileno(), 0, access=mmap.ACCESS_READ)
+        self._offs = memoryview(self._idx).cast("Q") if sys.byteorder == "little" else array.array("Q", self._idx[:])
+
+    def __len__(self):
+        return len(self._offs) - 1
+
+    def __getitem__(self, i):
+        if i < 0: i += len(self)
+        if not 0 <= i < len(self): raise IndexError(i)
+        return json.loads(self._data[self._offs[i]:self._offs[i + 1]])
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def close(self):
+        if isinstance(self._offs, memoryview): self._offs.release()
+        self._idx.close(); self._fi.close()
+        if isinstance(self._data, mmap.mmap): self._data.close()
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Convert a requirement package between YAML / JSONL / MessagePack")
+    ap.add_argument("src"); ap.add_argument("dst")
+    ap.add_argument("--index", action="store_true", help="also write a .idx offset index for .jsonl output")
+    a = ap.parse_args()
+    data = load_package(a.src)
+    dump_package(data, a.dst, index=a.index)
+    print(f"Wrote {a.dst} ({len(data.get('requirements', []))} requirements)")
@@ -2,18 +2,29 @@
 """
 Requirement linter for architecture work.
 
-Rules added:
-- Vague/banned words (e.g., "fast", "robust", "user-friendly", "optimize", "soon")
+Rules come from a rule pack (built-in: req_lint_rules.py; add team packs with --rules FILE). Every
+pattern is compiled into one scanner, so each requirement is tokenized once and its events are
+dispatched only to the rules indexed under them (see RuleEngine). Built-in rules:
+- Vague/banned words (e.g., "fast", "robust", "user-friendly", "optimize", "soon"),
+  matched as whole words in one pass; extend with --lexicon files (one phrase per line)
 - NFR must include quantifiable unit(s) or measurable form (ms, %, rps, RTO/RPO, p95 comparator)
 - Availability must include percent or 'nines'
 - Latency/response-time must include a number + unit
 - Security specificity (e.g., 'encrypt' -> say at rest/in transit; 'secure' -> name control like TLS/OIDC)
 - Functional requirements must have acceptance criteria
-- Basic cross-requirement conflict detection (latency & availability)
+- Cross-requirement conflicts per (metric, component/category): latency, availability,
+  throughput, RTO/RPO and error rate; reports the disagreeing clusters of requirement ids
+- Optional --dedupe: clusters of near-duplicate requirement texts (MinHash/LSH, see req_dedupe.py)
+Optional --cache: issues are reused for requirements whose content (and the rule set /
+lexicon) is unchanged; an unchanged package file is answered without re-parsing it.
+Reads requirement stores (req_store.py, .sqlite) like any package.
 Exit code: 1 if any issues found.
 """
-import argparse, re, sys, yaml, pathlib
+import argparse, hashlib, json, operator, re, string, sys, pathlib
 from collections import defaultdict
+from time import perf_counter
+import instrument, req_lint_rules
+from req_io import load_package, loads_package, package_format
 
 VAGUE_WORDS = {
     "fast","robust","user friendly","user-friendly","scalable","reliable","soon",
@@ -21,150 +32,623 @@ VAGUE_WORDS = {
     "easy","simple","intuitive","secure"  # 'secure' without specifics will be flagged
 }
 
-# regexes
-NUM_UNIT = re.compile(r"\b\d+(\.\d+)?\s*(ms|s|sec|seconds?|rps|qps|req/s|tps|%|percent|w(?:eeks)?|m(?:in|ins|inutes)?|h(?:r|rs|ours)?)\b", re.I)
-HAS_P95 = re.compile(r"\bp9(5|9)\b", re.I)
-CMP_NUM = re.compile(r"(<=|>=|<|>)\s*\d+(\.\d+)?")
-PCT = re.compile(r"\b\d{2,3}(\.\d+)?\s*%\b")
-NINES = re.compile(r"\b([34])\s*nines\b", re.I)  # "3 nines", "4 nines"
-LAT_MS = re.compile(r"\b(\d+(\.\d+)?)\s*ms\b", re.I)
-LAT_SEC = re.compile(r"\b(\d+(\.\d+)?)\s*s(ec|econds?)?\b", re.I)
-AVAIL = re.compile(r"\bavailability|uptime\b", re.I)
-LATENCY = re.compile(r"\blatency|response\s*time|rt\b", re.I)
-SEC_ENCRYPT = re.compile(r"\bencrypt(?:ion)?\b", re.I)
-SEC_PROTOCOLS = re.compile(r"\b(tls|mtls|https|oauth2|oidc|kms|aes|fips|kms)\b", re.I)
-RTO_RPO = re.compile(r"\b(RTO|RPO)\b", re.I)
-
-def has_number_unit(text: str) -> bool:
-    t = text.lower()
-    return bool(NUM_UNIT.search(t) or (HAS_P95.search(t) and CMP_NUM.search(t)) or RTO_RPO.search(t))
+class VagueMatcher:
+    """Whole-word phrase matcher compiled once into a single trie-shaped regex.
+
+    Matching is one left-to-right pass over the text; per-position cost depends on
+    the trie depth, not on the number of phrases in the lexicon.
+    """
+    def __init__(self, terms):
+        self.terms = sorted({" ".join(t.lower().split()) for t in terms if t and t.strip()})
+        body = self._trie_regex(self.terms)
+        self.rx = re.compile(rf"(?<!\w)(?:{body})(?!\w)", re.I) if body else None
+
+    @staticmethod
+    def _trie_regex(terms):
+        trie = {}
+        for t in terms:
+            node = trie
+            for ch in t:
+                node = node.setdefault(ch, {})
+            node[""] = True
+        def build(node):
+            end = "" in node
+            alts = [(r"\s+" if ch == " " else re.escape(ch)) + build(sub)
+                    for ch, sub in sorted(node.items()) if ch]
+            if not alts:
+                return ""
+            rx = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+            if end:
+                rx = "(?:" + rx + ")?"
+            return rx
+        return build(trie)
+
+    @classmethod
+    def from_files(cls, paths, base=()):
+        terms = set(base)
+        for p in paths:
+            terms.update(load_lexicon(p))
+        return cls(terms)
+
+    def finditer(self, text: str):
+        """Yield (term, start, end) for every non-overlapping hit, longest phrase first."""
+        if self.rx is None:
+            return
+        for m in self.rx.finditer(text):
+            yield " ".join(m.group(0).lower().split()), m.start(), m.end()
+
+    def __len__(self):
+        return len(self.terms)
+
+def load_lexicon(path):
+    """One phrase per line; blank lines and '#' comments are ignored."""
+    out = []
+    for line in pathlib.Path(path).read_text(encoding="utf-8").splitlines():
+        t = line.split("#", 1)[0].strip()
+        if t:
+            out.append(t)
+    return out
+
+VAGUE = VagueMatcher(VAGUE_WORDS)
+
+def use_lexicon(paths=(), replace=False):
+    """Swap the module-wide vague-term matcher (built-ins plus the given lexicon files)."""
+    global VAGUE, ENGINE
+    VAGUE = VagueMatcher.from_files(paths, () if replace else VAGUE_WORDS)
+    timings = ENGINE.timings
+    ENGINE = RuleEngine(ENGINE.pack, VAGUE.terms)
+    ENGINE.timings = timings
+    return VAGUE
+
+# --- rule engine ---
+# numbers and the units the scanner understands; a k prefix (5k rps) applies to throughput only
+NUMBER = r"\d+(?:,\d{3})*(?:\.\d+)?"
+UNIT = (r"%|(?:k\s*)?(?:rps|qps|tps|req/s|requests?\s+per\s+second)(?!\w)"
+        r"|(?:ms|s|secs?|seconds?|m|mins?|minutes?|h|hrs?|hours?|w|weeks|percent|nines)(?!\w)")
+# unit -> (measurable, ms per unit (latency), minutes per unit (RTO/RPO), rps per unit)
+UNITS = {
+    "ms": (True, 1.0, None, None),
+    "s": (True, 1000.0, 1 / 60, None), "sec": (True, 1000.0, 1 / 60, None), "secs": (False, None, 1 / 60, None),
+    "second": (True, 1000.0, 1 / 60, None), "seconds": (True, 1000.0, 1 / 60, None),
+    "m": (True, None, 1.0, None), "min": (True, None, 1.0, None), "mins": (True, None, 1.0, None),
+    "minute": (False, None, 1.0, None), "minutes": (True, None, 1.0, None),
+    "h": (True, None, 60.0, None), "hr": (True, None, 60.0, None), "hrs": (True, None, 60.0, None),
+    "hour": (False, None, 60.0, None), "hours": (True, None, 60.0, None),
+    "w": (True, None, None, None), "weeks": (True, None, None, None),
+    "%": (True, None, None, None), "percent": (True, None, None, None), "nines": (False, None, None, None),
+}
+for _u, _m in [("rps", True), ("qps", True), ("tps", True), ("req/s", True),
+               ("request per second", False), ("requests per second", False)]:
+    UNITS[_u] = (_m, None, None, 1.0)
+    UNITS["k" + _u] = UNITS["k " + _u] = (False, None, None, 1000.0)
+NUMBER_EVENTS = {"number-unit", "percent", "nines", "latency-value", "throughput", "comparator"}
+_RECOVERY_GAP = re.compile(r"\W{0,3}(?:of|is|=|:|<=|<|≤)?\s*", re.I)  # "RTO: 15 min", "RPO of 5 minutes"
+_ERROR_RATE_GAP = re.compile(r"\D{0,20}")
+
+def _pct(num):
+    """2-3 digit percentages only (99.9%, not 5% or 1,000%)."""
+    return "," not in num and 2 <= len(num.split(".")[0]) <= 3
+
+class Scan:
+    """One (lower-cased) text as the scanner read it: the events raised, term hits
+    (events, phrase, start, end) and numbers (start, end, text, value, unit) in text order."""
+    __slots__ = ("text", "events", "terms", "numbers")
+
+    def __init__(self, text, events, terms, numbers):
+        self.text, self.events, self.terms, self.numbers = text, events, terms, numbers
+
+    def phrases(self, event):
+        """Distinct phrases that raised a term event, sorted."""
+        return sorted({phrase for events, phrase, _, _ in self.terms if event in events})
+
+    def _after(self, pos):
+        return next((n for n in self.numbers if n[0] >= pos), None)
+
+    def availability(self):
+        """First 2-3 digit percentage, else 3/4 nines as a percentage."""
+        pct = next((v for _, _, num, v, unit in self.numbers if unit == "%" and _pct(num)), None)
+        if pct is not None:
+            return pct
+        n = next((num for _, _, num, _, unit in self.numbers if unit == "nines" and num in ("3", "4")), None)
+        return None if n is None else 100 - 10 ** (-int(n)) * 100
+
+    def latency_ms(self):
+        """First value in ms, else the first in seconds."""
+        v = next((v for _, _, _, v, unit in self.numbers if unit == "ms"), None)
+        if v is None:
+            v = next((v * UNITS[unit][1] for _, _, _, v, unit in self.numbers if unit and UNITS[unit][1]), None)
+        return v
+
+    def throughput_rps(self):
+        return next((v * UNITS[unit][3] for _, _, _, v, unit in self.numbers if unit and UNITS[unit][3]), None)
+
+    def recovery(self):
+        """{'rto': minutes, 'rpo': minutes} for whichever objectives are followed by a number + time unit."""
+        out = {}
+        if "rto" not in self.events and "rpo" not in self.events:
+            return out
+        for events, _, _, end in self.terms:
+            for ev in events:
+                if ev in ("rto", "rpo") and ev not in out:
+                    n = self._after(end)
+                    if n and n[4] and UNITS[n[4]][2] and _RECOVERY_GAP.fullmatch(self.text, end, n[0]):
+                        out[ev] = n[3] * UNITS[n[4]][2]
+        return out
+
+    def error_rate(self):
+        if "error-rate" not in self.events:
+            return None
+        for events, _, _, end in self.terms:
+            if "error-rate" in events:
+                n = self._after(end)
+                if n and n[4] == "%" and _ERROR_RATE_GAP.fullmatch(self.text, end, n[0]):
+                    return n[3]
+        return None
+
+    def percentile(self):
+        """'p95' / 'p99' when the text names one (first wins)."""
+        return next((phrase for events, phrase, _, _ in self.terms if "p95" in events or "p99" in events), None)
+
+class Issue(str):
+    """An issue message that carries the id of the rule that raised it (see rule_id)."""
+    def __new__(cls, message, rule="lint"):
+        issue = super().__new__(cls, message)
+        issue.rule = rule
+        return issue
+
+    def __reduce__(self):  # keep the rule across --jobs worker processes
+        return Issue, (str(self), self.rule)
+
+class Rule:
+    KEYS = {"id", "types", "when", "unless", "missing", "message"}
+    __slots__ = ("id", "order", "types", "when", "trigger", "unless", "missing", "message", "fields")
+
+    def __init__(self, order, spec):
+        unknown = set(spec) - self.KEYS
+        if unknown or not spec.get("message"):
+            raise ValueError(f"rule {spec.get('id')!r}: needs a message" + (f"; unknown keys {sorted(unknown)}" if unknown else ""))
+        when = list(spec.get("when") or [])
+        self.id, self.order, self.message = spec["id"], order, spec["message"]
+        self.types = frozenset(t.lower() for t in spec["types"]) if spec.get("types") else None
+        self.when, self.trigger = frozenset(when), (when[0] if when else None)
+        self.unless = [frozenset([u]) if isinstance(u, str) else frozenset(u) for u in spec.get("unless") or []]
+        self.missing = spec.get("missing")
+        self.fields = [f for _, f, _, _ in string.Formatter().parse(self.message) if f]
+
+    def events(self):
+        return self.when.union(*self.unless)
+
+    def __call__(self, r, scan):
+        """The Issue, or None when the rule does not fire."""
+        if self.missing is not None and r.get(self.missing):
+            return None
+        ev = scan.events
+        if not self.when <= ev or any(alt <= ev for alt in self.unless):
+            return None
+        if not self.fields:
+            return Issue(self.message, self.id)
+        return Issue(self.message.format_map({f: ", ".join(scan.phrases(f)) for f in self.fields}), self.id)
+
+class RuleEngine:
+    """A rule pack compiled for one-pass linting (pack format: see req_lint_rules.py).
+
+    The phrases of every term event and the number/unit lexemes form one scanner regex (terms as a
+    trie, gated by a first-character lookahead, matched case-sensitively against the lower-cased
+    text), so each requirement is tokenized once however many rules there are. Rules are indexed by
+    requirement type and by their first `when` event: a requirement evaluates only the rules its
+    events can fire, plus those that need no event (`unless`-only and `missing` rules).
+    """
+    def __init__(self, pack, vague_terms=()):
+        self.pack = pack
+        terms = {}
+        for ev, phrases in [*pack["terms"].items(), ("vague", vague_terms)]:
+            for phrase in phrases:
+                key = " ".join(str(phrase).lower().split())
+                if key:
+                    terms.setdefault(key, {})[ev] = None
+        self.terms = {k: tuple(v) for k, v in terms.items()}
+        trie = VagueMatcher._trie_regex(sorted(self.terms))
+        first = re.escape("".join(sorted({t[0] for t in self.terms} | set("0123456789<>"))))
+        word = (rf"(?P<t>{trie})(?!\w)|" if trie else "") + rf"(?P<n>{NUMBER})(?:\s*(?P<u>{UNIT}))?"
+        self.rx = re.compile(rf"(?=[{first}])(?:(?<!\w)(?:{word})|(?P<c><=|>=|<|>)(?=\s*\d))")
+        self.rules = [Rule(i, spec) for i, spec in enumerate(pack["rules"])]
+        known = NUMBER_EVENTS | set(pack["terms"]) | {"vague"}
+        for rule in self.rules:
+            if rule.events() - known:
+                raise ValueError(f"rule {rule.id!r}: unknown event(s) {sorted(rule.events() - known)}")
+        self.default = self._bucket(None)
+        self.index = {t: self._bucket(t) for t in {t for rule in self.rules for t in rule.types or ()}}
+        self.timings = None
+
+    def _bucket(self, rtype):
+        always, by_event = [], {}
+        for rule in self.rules:
+            if rule.types is None or rtype in rule.types:
+                if rule.trigger is None: always.append(rule)
+                else: by_event.setdefault(rule.trigger, []).append(rule)
+        return always, by_event
+
+    def scan(self, text):
+        text = text.lower()
+        events, terms, numbers = set(), [], []
+        for m in self.rx.finditer(text):
+            kind = m.lastgroup
+            if kind == "t":
+                phrase = m.group()
+                evs = self.terms.get(phrase)
+                if evs is None:  # a phrase matched with other whitespace
+                    phrase = " ".join(phrase.split()); evs = self.terms[phrase]
+                events.update(evs)
+                terms.append((evs, phrase, m.start(), m.end()))
+            elif kind == "c":
+                events.add("comparator")
+            else:
+                num, unit = m.group("n"), m.group("u")
+                if unit:
+                    if unit not in UNITS:
+                        unit = " ".join(unit.split())
+                    measurable, ms, _, rps = UNITS[unit]
+                    if measurable: events.add("number-unit")
+                    if ms: events.add("latency-value")
+                    if rps: events.add("throughput")
+                    if unit == "%" and _pct(num): events.add("percent")
+                    elif unit == "nines" and num in ("3", "4"): events.add("nines")
+                numbers.append((m.start(), m.end(), num, float(num.replace(",", "")), unit))
+        return Scan(text, events, terms, numbers)
+
+    def lint(self, r, scan):
+        """Issues (messages tagged with their rule id) for one requirement, in rule order."""
+        always, by_event = self.index.get((r.get("type") or "").lower(), self.default)
+        rules = always
+        if by_event:
+            fired = [rule for ev in scan.events if ev in by_event for rule in by_event[ev]]
+            if fired:
+                rules = sorted([*always, *fired], key=_ORDER)
+        tm = self.timings
+        issues = []
+        for rule in rules:
+            if tm is None:
+                msg = rule(r, scan)
+            else:
+                t0 = perf_counter(); msg = rule(r, scan)
+                tm.rule(rule.id, perf_counter() - t0, msg is not None)
+            if msg is not None:
+                issues.append(msg)
+        return issues
+
+_ORDER = operator.attrgetter("order")
+
+def load_rule_pack(path):
+    """{"terms", "rules"} from a .yaml/.yml, .json or .py (TERMS / RULES) rule pack file."""
+    p = pathlib.Path(path)
+    if p.suffix == ".py":
+        import runpy
+        ns = runpy.run_path(str(p))
+        data = {"terms": ns.get("TERMS"), "rules": ns.get("RULES")}
+    elif p.suffix == ".json":
+        data = json.loads(p.read_text(encoding="utf-8"))
+    else:
+        from req_io import load_yaml
+        data = load_yaml(p) or {}
+    return {"terms": dict(data.get("terms") or {}), "rules": list(data.get("rules") or [])}
+
+def merge_packs(*packs):
+    """Term phrases accumulate per event; a rule replaces an earlier one with the same id in place."""
+    terms, rules = {}, {}
+    for pack in packs:
+        for ev, phrases in pack["terms"].items():
+            terms[ev] = list(dict.fromkeys([*terms.get(ev, []), *phrases]))
+        for rule in pack["rules"]:
+            if not isinstance(rule, dict) or not rule.get("id"):
+                raise ValueError(f"rule without an id: {rule!r}")
+            rules[rule["id"]] = rule
+    return {"terms": terms, "rules": list(rules.values())}
+
+BUILTIN_PACK = {"terms": req_lint_rules.TERMS, "rules": req_lint_rules.RULES}
+ENGINE = RuleEngine(BUILTIN_PACK, VAGUE.terms)
+
+def use_rules(paths=()):
+    """Rebuild the engine from the built-in pack plus the given rule pack files."""
+    global ENGINE
+    timings = ENGINE.timings
+    ENGINE = RuleEngine(merge_packs(BUILTIN_PACK, *map(load_rule_pack, paths)), VAGUE.terms)
+    ENGINE.timings = timings
+    return ENGINE
+
+def find_vague(text: str):
+    """All vague-term hits as (term, start, end), in text order."""
+    return list(VAGUE.finditer(text))
 
 def contains_vague(text: str):
-    t = text.lower()
-    hits = [w for w in VAGUE_WORDS if w in t]
-    return hits
-
-def availability_value(text: str):
-    t = text.lower()
-    m = PCT.search(t)
-    if m:
-        try: return float(m.group(0).replace("%","").strip())
-        except: return None
-    if NINES.search(t):
-        # "three nines" ~ 99.9; "four nines" ~ 99.99
-        n = int(NINES.search(t).group(1))
-        return 100 - 10**(-n)*100  # approx
-    return None
-
-def latency_ms_value(text: str):
-    t = text.lower()
-    m = LAT_MS.search(t)
-    if m:
-        return float(m.group(1))
-    m = LAT_SEC.search(t)
-    if m:
-        return float(m.group(1)) * 1000.0
-    return None
-
-def lint_req(r):
-    issues=[]
-    text = r.get("text","")
-    rtype = (r.get("type") or "").lower()   # "func" or "nfr"
-
-    # 1) vague words
-    vague = contains_vague(text)
-    if vague:
-        issues.append(f"vague wording: {', '.join(sorted(vague))}")
-
-    # 2) NFR metrics/units
-    if rtype == "nfr":
-        if not has_number_unit(text):
-            issues.append("nfr missing measurable unit/metric (add ms/%/rps, RTO/RPO, or p95 comparator)")
-
-        # availability specificity
-        if AVAIL.search(text) and not (PCT.search(text) or NINES.search(text)):
-            issues.append("availability mentioned without explicit percent or 'nines'")
-
-        # latency specificity
-        if LATENCY.search(text) and latency_ms_value(text) is None:
-            issues.append("latency/response-time mentioned without a number + unit (e.g., 300 ms)")
-
-        # security specificity
-        if SEC_ENCRYPT.search(text) and not re.search(r"at rest|in transit", text, re.I):
-            issues.append("encryption mentioned; specify 'at rest' and/or 'in transit'")
-        if "secure" in text.lower() and not SEC_PROTOCOLS.search(text):
-            issues.append("security vague: reference concrete control (TLS/mTLS, OAuth2/OIDC, AES, KMS, etc.)")
-
-    # 3) func acceptance criteria
-    if rtype == "func":
-        ac = r.get("acceptance", [])
-        if not ac:
-            issues.append("functional requirement missing acceptance criteria")
-
-    return issues
-
-def detect_conflicts(requirements):
-    """Very simple cross-req conflicts for latency & availability."""
-    buckets = defaultdict(list)  # metric -> list of (rid, value)
+    return sorted({term for term, _, _ in VAGUE.finditer(text)})
+
+def lint_req(r, index=None):
+    """Issues for one requirement from a single scan of its text; with index, its metric targets
+    are added there too (see index_requirement), from the same scan."""
+    scan = ENGINE.scan(r.get("text") or "")
+    if index is not None:
+        index_requirement(index, r, scan)
+    return ENGINE.lint(r, scan)
+
+def time_rules(timings):
+    """Report per-rule calls / time / hits to timings (--timings). A rule is called only when its
+    trigger event was raised, so calls count evaluations, not requirements."""
+    ENGINE.timings = timings
+
+# metric -> (tolerance kind, tolerance, display format); values within tolerance agree
+CONFLICT_METRICS = {
+    "availability": ("abs", 0.2, "{rid}:{v}%"),            # percentage points
+    "latency":      ("ratio", 1.2, "{rid}:{v:.0f}ms"),
+    "throughput":   ("ratio", 1.2, "{rid}:{v:g}rps"),
+    "rto":          ("ratio", 1.2, "{rid}:{v:g}min"),
+    "rpo":          ("ratio", 1.2, "{rid}:{v:g}min"),
+    "error_rate":   ("ratio", 1.5, "{rid}:{v:g}%"),
+}
+
+def metric_targets(r, scan=None):
+    """Yield (metric, value) pairs stated by one requirement."""
+    s = scan or ENGINE.scan(r.get("text") or "")
+    if not s.numbers:
+        return
+    if "availability" in s.events:
+        v = s.availability()
+        if v is not None: yield "availability", v
+    if "latency" in s.events:
+        v = s.latency_ms()
+        if v is not None:
+            p = s.percentile()
+            yield ("latency" + (f" {p}" if p else "")), v
+    if "throughput" in s.events:
+        yield "throughput", s.throughput_rps()
+    for k, v in s.recovery().items():
+        yield k, v
+    v = s.error_rate()
+    if v is not None: yield "error_rate", v
+
+def requirement_scope(r):
+    return r.get("component") or r.get("category") or "*"
+
+def index_requirement(index, r, scan=None):
+    """Add one requirement's metric targets to a (metric, scope) -> [(value, rid)] index."""
+    for metric, v in metric_targets(r, scan):
+        index[(metric, requirement_scope(r))].append((v, r.get("id","?")))
+
+def build_metric_index(requirements):
+    """(metric, scope) -> [(value, rid)] sorted by value."""
+    index = defaultdict(list)
     for r in requirements:
-        rid = r.get("id","?")
-        t = r.get("text","")
-        if AVAIL.search(t):
-            v = availability_value(t)
-            if v is not None:
-                buckets["availability"].append((rid, v))
-        if LATENCY.search(t):
-            v = latency_ms_value(t)
-            if v is not None:
-                buckets["latency"].append((rid, v))
-
-    conflicts=[]
-    # availability: percent; flag if values differ by > 0.2 percentage points
-    if buckets["availability"]:
-        vals = [v for _,v in buckets["availability"]]
-        if max(vals) - min(vals) > 0.2:
-            pairs = ", ".join([f"{rid}:{v}%" for rid,v in buckets['availability']])
-            conflicts.append(f"conflicting availability targets across requirements → {pairs}")
-
-    # latency: ms; flag if values differ by > 20%
-    if buckets["latency"]:
-        vals = [v for _,v in buckets["latency"]]
-        if min(vals) > 0 and (max(vals)/min(vals) > 1.2):
-            pairs = ", ".join([f"{rid}:{int(v)}ms" for rid,v in buckets['latency']])
-            conflicts.append(f"conflicting latency targets across requirements → {pairs}")
+        index_requirement(index, r)
+    for rows in index.values():
+        rows.sort()
+    return index
+
+def _agreeing_clusters(rows, kind, tol):
+    """Split value-sorted rows into runs whose values all agree with the run's first value."""
+    clusters = [[rows[0]]]
+    for v, rid in rows[1:]:
+        start = clusters[-1][0][0]
+        apart = (v - start > tol) if kind == "abs" else v != start and (start <= 0 or v / start > tol)
+        if apart: clusters.append([(v, rid)])
+        else: clusters[-1].append((v, rid))
+    return clusters
+
+def detect_conflicts(requirements, max_listed=10):
+    """Cross-req conflicts per (metric, component/category): sort each group once and report
+    the clusters of mutually agreeing targets when a group holds more than one (O(n log n))."""
+    return conflicts_from_index(build_metric_index(requirements), max_listed)
 
+def conflicts_from_index(index, max_listed=10):
+    """detect_conflicts() over an index filled incrementally with index_requirement()."""
+    conflicts = []
+    for (metric, scope), rows in sorted(index.items()):
+        rows.sort()
+        kind, tol, fmt = CONFLICT_METRICS[metric.split()[0]]
+        clusters = _agreeing_clusters(rows, kind, tol)
+        if len(clusters) < 2:
+            continue
+        def show(c):
+            s = ", ".join(fmt.format(rid=rid, v=v) for v, rid in c[:max_listed])
+            return s + (f" (+{len(c) - max_listed} more)" if len(c) > max_listed else "")
+        where = "across requirements" if scope == "*" else f"in {scope}"
+        conflicts.append(f"conflicting {metric} targets {where} → " + " vs ".join(show(c) for c in clusters))
     return conflicts
 
+def rule_id(issue: str) -> str:
+    """Stable rule id of an issue, for machine-readable output."""
+    return getattr(issue, "rule", "lint")
+
+def dump_issues(issues):
+    """JSON-ready [[rule id, message]] for caches; load_issues() restores the Issues."""
+    return [[rule_id(i), str(i)] for i in issues]
+
+def load_issues(rows):
+    return [Issue(msg, rule) for rule, msg in rows]
+
+def _lint_chunk(chunk):
+    return [(r.get("id","?"), lint_req(r)) for r in chunk]
+
+def _init_worker(lexicons, replace, rules=()):
+    if lexicons or replace:
+        use_lexicon(lexicons, replace=replace)
+    if rules:
+        use_rules(rules)
+
+def lint_all(reqs, jobs=1, lexicons=(), replace=False, min_chunk=500, rules=()):
+    """Lint every requirement; returns [(rid, issues)] in input order regardless of jobs."""
+    if jobs <= 1 or len(reqs) <= min_chunk:
+        return _lint_chunk(reqs)
+    from concurrent.futures import ProcessPoolExecutor
+    size = max(min_chunk, -(-len(reqs) // (jobs * 4)))
+    chunks = [reqs[i:i+size] for i in range(0, len(reqs), size)]
+    out = []
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(list(lexicons), replace, list(rules))) as ex:
+        for part in ex.map(_lint_chunk, chunks):  # map() keeps chunk order
+            out.extend(part)
+    return out
+
+def ruleset_hash():
+    """Changes whenever this file, the active rule pack or the lexicon change (cache namespace)."""
+    h = hashlib.sha256(pathlib.Path(__file__).read_bytes())
+    h.update(json.dumps(ENGINE.pack, sort_keys=True).encode("utf-8"))
+    h.update("\n".join(VAGUE.terms).encode("utf-8"))
+    return h.hexdigest()[:16]
+
+def req_hash(r):
+    body = {k: v for k, v in r.items() if k != "id"}  # renumbering alone must not invalidate
+    return hashlib.sha256(json.dumps(body, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")).hexdigest()
+
+def lint_cached(reqs, cache, jobs=1, lexicons=(), replace=False, rules=()):
+    """lint_all() that reuses cached issues for unchanged requirements and lints only the rest."""
+    ns = ruleset_hash()
+    keys = [f"{ns}:{req_hash(r)}" for r in reqs]
+    known = cache.get_many(keys)
+    todo = [i for i, k in enumerate(keys) if k not in known]
+    fresh = lint_all([reqs[i] for i in todo], jobs, lexicons, replace, rules=rules)
+    known = {k: load_issues(v) for k, v in known.items()}
+    new = {keys[i]: issues for i, (_, issues) in zip(todo, fresh)}
+    cache.put_many((k, dump_issues(v)) for k, v in new.items())
+    known.update(new)
+    return [(r.get("id","?"), known[k]) for r, k in zip(reqs, keys)]
+
+def render_text(results, conflicts, duplicates=None):
+    lines = []
+    for rid, issues in results:
+        if issues:
+            lines.append(f"- {rid}:")
+            lines.extend(f"  • {i}" for i in issues)
+    if conflicts:
+        lines.append("\nCROSS-REQUIREMENT ISSUES:")
+        lines.extend(f"  • {c}" for c in conflicts)
+    if duplicates:
+        from req_dedupe import describe
+        lines.append("\nNEAR-DUPLICATE REQUIREMENTS:")
+        lines.extend(f"  • {describe(d)}" for d in duplicates)
+    return "\n".join(lines)
+
+def render_json(results, conflicts, source, duplicates=None):
+    report = {
+        "tool": "req_lint", "source": str(source),
+        "ok": not conflicts and not duplicates and not any(i for _, i in results),
+        "results": [{"id": rid, "issues": [{"rule": rule_id(i), "message": i} for i in issues]}
+                    for rid, issues in results if issues],
+        "conflicts": conflicts,
+    }
+    if duplicates is not None:  # only when --dedupe ran
+        report["duplicates"] = duplicates
+    return json.dumps(report, indent=2, ensure_ascii=False)
+
+def render_sarif(results, conflicts, source, duplicates=None):
+    def result(rule, msg, rid=None):
+        loc = {"physicalLocation": {"artifactLocation": {"uri": str(source)}}}
+        if rid is not None:
+            loc["logicalLocations"] = [{"name": rid, "kind": "requirement"}]
+        return {"ruleId": rule, "level": "error", "message": {"text": msg}, "locations": [loc]}
+    rows = [result(rule_id(i), i, rid) for rid, issues in results for i in issues]
+    rows += [result("cross-requirement-conflict", c) for c in conflicts]
+    if duplicates:
+        from req_dedupe import describe
+        rows += [result("near-duplicate", describe(d), d["ids"][0]) for d in duplicates]
+    rules = sorted({r["ruleId"] for r in rows})
+    return json.dumps({
+        "$schema": "https://json.schemastore.org/sarif-2.1.0.json", "version": "2.1.0",
+        "runs": [{"tool": {"driver": {"name": "req_lint", "rules": [{"id": r} for r in rules]}},
+                  "results": rows}],
+    }, indent=2, ensure_ascii=False)
+
 def main():
     ap = argparse.ArgumentParser()
-    ap.add_argument("yaml_file", help="requirements YAML produced by req_extract.py")
+    ap.add_argument("yaml_file", help="requirements package produced by req_extract.py (.yaml, .jsonl, .msgpack or a .sqlite store)")
+    ap.add_argument("--lexicon", action="append", default=[], help="extra banned-term file (one phrase per line); repeatable")
+    ap.add_argument("--no-builtin-vague", action="store_true", help="use only --lexicon terms, not the built-in VAGUE_WORDS")
+    ap.add_argument("--rules", action="append", default=[], help="extra rule pack (.yaml/.json/.py, see req_lint_rules.py); repeatable")
+    ap.add_argument("--jobs", type=int, default=1, help="lint in N worker processes (output identical to serial)")
+    ap.add_argument("--format", choices=["text","json","sarif"], default="text")
+    ap.add_argument("--output", default=None, help="write the report here instead of stdout")
+    ap.add_argument("--cache", nargs="?", const=".cache/req_lint.sqlite", default=None,
+                    help="reuse issues for unchanged requirements (default path: .cache/req_lint.sqlite)")
+    ap.add_argument("--cache-max", type=int, default=500_000, help="max cached entries (LRU eviction)")
+    ap.add_argument("--dedupe", action="store_true", help="also report near-duplicate requirements (MinHash/LSH, see req_dedupe.py)")
+    ap.add_argument("--dedupe-threshold", type=float, default=0.8, help="min estimated similarity for --dedupe")
+    instrument.add_arguments(ap)
     args = ap.parse_args()
+    tm = instrument.from_args("req_lint", args)
+    if tm.enabled:
+        time_rules(tm)  # per-rule counts / time (in this process: run with --jobs 1 to cover every rule call)
+    if args.lexicon or args.no_builtin_vague:
+        use_lexicon(args.lexicon, replace=args.no_builtin_vague)
+    if args.rules:
+        use_rules(args.rules)
 
-    data = yaml.safe_load(pathlib.Path(args.yaml_file).read_text(encoding="utf-8"))
-    reqs = data.get("requirements", [])
-    any_issues=False
+    fmt = package_format(args.yaml_file)
+    with tm.stage("read"):
+        if fmt == "sqlite":  # a store: its fingerprint stands in for the file bytes in the cache key
+            from req_store import RequirementStore
+            with RequirementStore(args.yaml_file, readonly=True) as st:
+                raw = st.fingerprint().encode()
+        else:
+            raw = pathlib.Path(args.yaml_file).read_bytes()
+    cache = pkg_key = cached = None
+    if args.cache:
+        from sqlite_cache import SqliteCache
+        with tm.stage("cache"):
+            cache = SqliteCache(args.cache, max_entries=args.cache_max)
+            pkg_key = f"{ruleset_hash()}:pkg:{hashlib.sha256(raw).hexdigest()}"
+            if args.dedupe:
+                import req_dedupe
+                pkg_key += f":dedupe={args.dedupe_threshold}:{req_dedupe.version()}"
+            cached = cache.get(pkg_key)
 
-    # per-requirement lints
-    for r in reqs:
-        rid = r.get("id","?")
-        issues = lint_req(r)
-        if issues:
-            any_issues=True
-            print(f"- {rid}:")
-            for i in issues:
-                print(f"  • {i}")
+    if cached is not None:
+        # unchanged package: skip YAML parsing entirely
+        results, conflicts = [(rid, load_issues(i)) for rid, i in cached["results"]], cached["conflicts"]
+        duplicates = cached.get("duplicates")
+    else:
+        with tm.stage("parse"):
+            data = load_package(args.yaml_file) if fmt == "sqlite" else loads_package(raw, fmt)
+        reqs = data.get("requirements", [])
+        # per-requirement lints (sharded across processes with --jobs), then cross-requirement conflicts;
+        # serially, one scan per requirement feeds both
+        index = None
+        with tm.stage("lint"):
+            if cache is not None:
+                results = lint_cached(reqs, cache, args.jobs, args.lexicon, args.no_builtin_vague, args.rules)
+            elif args.jobs > 1:
+                results = lint_all(reqs, args.jobs, args.lexicon, args.no_builtin_vague, rules=args.rules)
+            else:
+                index = defaultdict(list)
+                results = [(r.get("id","?"), lint_req(r, index)) for r in reqs]
+        with tm.stage("conflicts"):
+            conflicts = detect_conflicts(reqs) if index is None else conflicts_from_index(index)
+        duplicates = None
+        if args.dedupe:
+            import req_dedupe
+            with tm.stage("dedupe"):
+                duplicates = req_dedupe.find_duplicates(reqs, args.dedupe_threshold)
+        if cache is not None:
+            with tm.stage("cache"):
+                cache.put(pkg_key, {"results": [(rid, dump_issues(i)) for rid, i in results if i], "conflicts": conflicts,
+                                    "duplicates": duplicates})
+    if cache is not None:
+        with tm.stage("cache"):
+            cache.close()
+    any_issues = bool(conflicts) or bool(duplicates) or any(issues for _, issues in results)
 
-    # cross-requirement conflicts
-    conflicts = detect_conflicts(reqs)
-    if conflicts:
-        any_issues=True
-        print("\nCROSS-REQUIREMENT ISSUES:")
-        for c in conflicts:
-            print(f"  • {c}")
+    with tm.stage("render"):
+        if args.format == "json":
+            report = render_json(results, conflicts, args.yaml_file, duplicates)
+        elif args.format == "sarif":
+            report = render_sarif(results, conflicts, args.yaml_file, duplicates)
+        else:
+            report = render_text(results, conflicts, duplicates) if any_issues else "Lints: OK"
+    with tm.stage("write"):
+        if args.output:
+            pathlib.Path(args.output).write_text(report + "\n", encoding="utf-8")
+        else:
+            print(report)
 
     if any_issues:
         sys.exit(1)
-    print("Lints: OK")
 
 if __name__=="__main__":
     main()
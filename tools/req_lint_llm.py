@@ -8,25 +8,35 @@ Advisory LLM pass for requirements linting.
   (and acceptance criteria for functional reqs lacking them).
 - Writes a non-blocking Markdown report to docs/reviews/lint_advice.md.
 
+- Requests run on a bounded thread pool (--concurrency) under optional requests/tokens
+  per-minute limits, retrying 429/5xx with exponential backoff; the report always keeps
+  requirement order.
+- Responses are cached on disk (SQLite; TTL + LRU) keyed by model, system prompt, requirement
+  prompt and temperature, so an unchanged package reruns without network calls.
+  --cache-only never calls the API (offline runs); --no-cache disables the cache.
+- --batch-size N packs up to N flagged requirements (within --batch-tokens) into one request
+  that returns a JSON array keyed by each item's position (so repeated ids stay apart); items
+  missing from the reply are retried one at a time.
+
 Usage:
-  OPENAI_API_KEY=sk-... python tools/req_lint_llm.py samples/requirements.yaml
+  OPENAI_API_KEY=sk-... python tools/req_lint_llm.py samples/requirements.yaml [--concurrency 8 --rpm 500 --tpm 200000]
 Env:
   OPENAI_API_KEY  -> required for LLM suggestions (otherwise advisory falls back to rule-only text)
+  OPENAI_BASE_URL -> optional OpenAI-compatible endpoint (e.g., a local stub server)
   LLM_MODEL       -> optional (default: gpt-4o-mini)
 """
-import os, sys, yaml, pathlib, datetime as dt, textwrap, importlib.util
+import argparse, hashlib, json, os, random, sys, threading, time, pathlib, datetime as dt, textwrap
+from collections import deque
 
 ROOT = pathlib.Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "tools"))  # shared helpers (req_io, sqlite_cache) and req_lint
 
-# Load req_lint.py dynamically (no package needed)
-rl_path = ROOT / "tools" / "req_lint.py"
-spec = importlib.util.spec_from_file_location("req_lint", str(rl_path))
-rl = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(rl)
+import req_lint as rl  # a plain import: loaded once per process, shared with anything else importing it
+from req_io import load_package
 
 def load_yaml(p):
-    return yaml.safe_load(pathlib.Path(p).read_text(encoding="utf-8"))
+    return load_package(p)
 
 def llm_client():
     key = os.getenv("OPENAI_API_KEY", "").strip()
@@ -34,10 +44,63 @@ def llm_client():
         return None
     try:
         from openai import OpenAI
-        return OpenAI(api_key=key)
+        return OpenAI(api_key=key, max_retries=0)  # retries/backoff are handled in complete()
     except Exception:
         return None
 
+class RateLimiter:
+    """Sliding 60 s window over requests and (estimated) tokens, shared by all worker threads."""
+    def __init__(self, rpm=None, tpm=None, clock=time.monotonic, sleep=time.sleep):
+        self.rpm, self.tpm = rpm, tpm
+        self.clock, self.sleep = clock, sleep
+        self.events = deque()  # (timestamp, tokens)
+        self.tokens = 0
+        self.lock = threading.Lock()
+
+    def acquire(self, tokens=0):
+        if not self.rpm and not self.tpm:
+            return
+        while True:
+            with self.lock:
+                now = self.clock()
+                while self.events and now - self.events[0][0] >= 60:
+                    self.tokens -= self.events.popleft()[1]
+                fits_r = not self.rpm or len(self.events) < self.rpm
+                fits_t = not self.tpm or not self.events or self.tokens + tokens <= self.tpm
+                if fits_r and fits_t:
+                    self.events.append((now, tokens)); self.tokens += tokens
+                    return
+                wait = 60 - (now - self.events[0][0])
+            self.sleep(max(wait, 0.01))
+
+def estimate_tokens(*texts):
+    return sum(len(t) for t in texts) // 4 + 1
+
+RETRY_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+def _retry_after(err):
+    headers = getattr(getattr(err, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+def complete(client, model, messages, temperature=0.2, limiter=None, max_retries=5, backoff=1.0):
+    """One chat completion with rate limiting and exponential backoff on 429/5xx/connection errors."""
+    for attempt in range(max_retries + 1):
+        if limiter is not None:
+            limiter.acquire(estimate_tokens(*(m["content"] for m in messages)))
+        try:
+            resp = client.chat.completions.create(model=model, messages=messages, temperature=temperature)
+            return resp.choices[0].message.content.strip()
+        except Exception as e:
+            status = getattr(e, "status_code", None)
+            transient = status in RETRY_STATUS or (status is None and type(e).__name__ in {"APIConnectionError", "APITimeoutError"})
+            if not transient or attempt == max_retries:
+                raise
+            delay = _retry_after(e) or backoff * (2 ** attempt)
+            time.sleep(delay * (1 + random.random() * 0.25))
+
 SYSTEM_PROMPT = (
     "You are an assistant that rewrites software requirements to be clear, testable, and measurable. "
     "Use concise language, include numeric targets and units for NFRs (e.g., p95<300 ms, 99.9% availability, RTO 15m, RPO 5m), "
@@ -46,10 +109,10 @@ SYSTEM_PROMPT = (
     "Return only the rewritten requirement and, if applicable, a short bullet list of acceptance criteria."
 )
 
-def ask_llm(client, model, requirement, issues):
-    if client is None:
-        return None
-    msg = textwrap.dedent(f"""
+TEMPERATURE = 0.2
+
+def user_prompt(requirement, issues):
+    return textwrap.dedent(f"""
     Original requirement:
     {requirement.get('text','').strip()}
 
@@ -71,19 +134,147 @@ def ask_llm(client, model, requirement, issues):
     - <bullet 3>
     """).strip()
 
+def ask_llm(client, model, requirement, issues, limiter=None, max_retries=5):
+    if client is None:
+        return None
     try:
-        resp = client.chat.completions.create(
-            model=os.getenv("LLM_MODEL","gpt-4o-mini"),
-            messages=[{"role":"system","content":SYSTEM_PROMPT},
-                      {"role":"user","content":msg}],
-            temperature=0.2,
-        )
-        return resp.choices[0].message.content.strip()
+        return complete(client, model or os.getenv("LLM_MODEL","gpt-4o-mini"),
+                        [{"role":"system","content":SYSTEM_PROMPT},
+                         {"role":"user","content":user_prompt(requirement, issues)}],
+                        temperature=TEMPERATURE, limiter=limiter, max_retries=max_retries)
     except Exception as e:
         return f"(LLM error: {e})"
 
+BATCH_INSTRUCTIONS = textwrap.dedent("""
+    Rewrite each requirement below to resolve its lint issues, following the same rules:
+    numeric thresholds and units for NFRs, % for availability, ms for latency, concrete
+    security controls, and 2-3 acceptance criteria for functional requirements that lack them.
+
+    Respond with ONLY a JSON array, one object per requirement:
+    [{"id": "<requirement id>", "requirement": "<one-line improved requirement>",
+      "acceptance_criteria": ["<bullet>", ...]}]
+    """).strip()
+
+def batch_item_text(rid, requirement, issues):
+    return (f"ID: {rid}\nType: {requirement.get('type','').strip().lower()}\n"
+            f"Text: {requirement.get('text','').strip()}\n"
+            f"Lint issues: {', '.join(issues) if issues else 'none'}")
+
+def make_batches(items, max_items, max_tokens):
+    """Greedily pack [(rid, requirement, issues)] into batches under an item and token budget."""
+    budget = max_tokens - estimate_tokens(SYSTEM_PROMPT, BATCH_INSTRUCTIONS)
+    batches, cur, used = [], [], 0
+    for it in items:
+        # reply size is roughly the size of the request again
+        cost = 2 * estimate_tokens(batch_item_text(*it))
+        if cur and (len(cur) >= max_items or used + cost > budget):
+            batches.append(cur); cur, used = [], 0
+        cur.append(it); used += cost
+    if cur:
+        batches.append(cur)
+    return batches
+
+def format_suggestion(obj):
+    lines = [f"Requirement: {str(obj.get('requirement','')).strip()}"]
+    ac = [str(a).strip() for a in obj.get("acceptance_criteria") or [] if str(a).strip()]
+    if ac:
+        lines.append("AcceptanceCriteria (optional):")
+        lines.extend(f"- {a}" for a in ac)
+    return "\n".join(lines)
+
+def parse_batch_response(text, ids):
+    """{id: suggestion} for well-formed entries whose id was asked for; anything else is dropped."""
+    t = text.strip()
+    if t.startswith("```"):
+        t = t.split("\n", 1)[1] if "\n" in t else ""
+        t = t.rsplit("```", 1)[0]
+    try:
+        data = json.loads(t)
+    except ValueError:
+        start, end = t.find("["), t.rfind("]")
+        try:
+            data = json.loads(t[start:end+1]) if start >= 0 else []
+        except ValueError:
+            return {}
+    if isinstance(data, dict):
+        data = data.get("rewrites") or data.get("requirements") or []
+    wanted, out = set(ids), {}
+    for obj in data if isinstance(data, list) else []:
+        if isinstance(obj, dict) and str(obj.get("id")) in wanted and str(obj.get("requirement","")).strip():
+            out[str(obj["id"])] = format_suggestion(obj)
+    return out
+
+def ask_llm_batch(client, model, batch, limiter=None, max_retries=5):
+    """One request for a whole batch; returns {rid: suggestion} for the ids the reply covered."""
+    msg = BATCH_INSTRUCTIONS + "\n\nRequirements:\n\n" + "\n\n".join(batch_item_text(*it) for it in batch)
+    try:
+        text = complete(client, model, [{"role":"system","content":SYSTEM_PROMPT},
+                                        {"role":"user","content":msg}],
+                        temperature=TEMPERATURE, limiter=limiter, max_retries=max_retries)
+    except Exception:
+        return {}
+    return parse_batch_response(text, [rid for rid, _, _ in batch])
+
+def cache_key(model, requirement, issues, temperature=TEMPERATURE, batched=False):
+    """Key of the answer to one requirement's prompt; batched answers (BATCH_INSTRUCTIONS) get their own."""
+    prompt = [BATCH_INSTRUCTIONS, batch_item_text("", requirement, issues)] if batched else [user_prompt(requirement, issues)]
+    payload = json.dumps([model, SYSTEM_PROMPT, *prompt, temperature], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def advise_all(client, model, failing, concurrency=4, limiter=None, max_retries=5, cache=None, cache_only=False,
+               batch_size=1, batch_tokens=6000):
+    """Suggestions for [(rid, requirement, issues)], returned in the same order as given.
+    Cached responses are reused; only misses reach the API (none at all with cache_only).
+    With batch_size > 1 misses are sent in batches; items a batch reply misses are asked singly.
+    Each answer is cached under the key of the prompt that produced it: a batched run also reuses
+    single-prompt answers, an unbatched run never serves batch answers."""
+    keys = [cache_key(model, r, issues) for _, r, issues in failing] if cache is not None else []
+    bkeys = [cache_key(model, r, issues, batched=True) for _, r, issues in failing] if cache is not None and batch_size > 1 else []
+    known = cache.get_many(keys + bkeys) if cache is not None else {}
+    out = [known.get(b) or known.get(k) for k, b in zip(keys, bkeys or keys)] if cache is not None else [None] * len(failing)
+    todo = [i for i, v in enumerate(out) if v is None]
+    if client is None or cache_only or not todo:
+        return out
+    from concurrent.futures import ThreadPoolExecutor
+    ask = lambda i: ask_llm(client, model, failing[i][1], failing[i][2], limiter, max_retries)
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as ex:
+        if batch_size > 1:
+            # items are labelled by their position in failing, so repeated (or "?") ids cannot collide
+            batches = make_batches([(str(i), failing[i][1], failing[i][2]) for i in todo], batch_size, batch_tokens)
+            got = {}
+            for part in ex.map(lambda b: ask_llm_batch(client, model, b, limiter, max_retries), batches):
+                got.update((int(k), v) for k, v in part.items())
+            batched = set(got)
+            single = [i for i in todo if i not in got]
+            for i, v in zip(single, ex.map(ask, single)):
+                got[i] = v
+            fresh = [got[i] for i in todo]
+        else:
+            fresh, batched = list(ex.map(ask, todo)), set()
+    for i, v in zip(todo, fresh):
+        out[i] = v
+    if cache is not None:
+        cache.put_many(((bkeys if i in batched else keys)[i], v) for i, v in zip(todo, fresh)
+                       if v and not v.startswith("(LLM error"))
+    return out
+
 def main():
-    yaml_file = sys.argv[1] if len(sys.argv) > 1 else "samples/requirements.yaml"
+    ap = argparse.ArgumentParser(description="Advisory LLM pass over req_lint findings")
+    ap.add_argument("yaml_file", nargs="?", default="samples/requirements.yaml")
+    ap.add_argument("--out", default=str(ROOT / "docs" / "reviews" / "lint_advice.md"))
+    ap.add_argument("--concurrency", type=int, default=4, help="parallel LLM requests")
+    ap.add_argument("--rpm", type=int, default=None, help="max requests per minute")
+    ap.add_argument("--tpm", type=int, default=None, help="max (estimated) prompt tokens per minute")
+    ap.add_argument("--max-retries", type=int, default=5, help="retries on 429/5xx with exponential backoff")
+    ap.add_argument("--batch-size", type=int, default=1, help="requirements per LLM request (1 = no batching)")
+    ap.add_argument("--batch-tokens", type=int, default=6000, help="estimated token budget per batched request")
+    ap.add_argument("--cache", default=str(ROOT / ".cache" / "llm_responses.sqlite"), help="response cache (SQLite)")
+    ap.add_argument("--no-cache", action="store_true", help="do not read or write the response cache")
+    ap.add_argument("--cache-only", action="store_true", help="offline: use cached responses only, never call the API")
+    ap.add_argument("--cache-ttl-days", type=float, default=30.0)
+    ap.add_argument("--cache-max", type=int, default=50_000, help="max cached responses (LRU eviction)")
+    args = ap.parse_args()
+    yaml_file = args.yaml_file
     data = load_yaml(yaml_file)
     reqs = data.get("requirements", [])
 
@@ -99,9 +290,8 @@ def main():
 
     conflicts = rl.detect_conflicts(reqs)
 
-    outdir = ROOT / "docs" / "reviews"
-    outdir.mkdir(parents=True, exist_ok=True)
-    out_md = outdir / "lint_advice.md"
+    out_md = pathlib.Path(args.out)
+    out_md.parent.mkdir(parents=True, exist_ok=True)
 
     lines = []
     lines.append(f"# Lint Advisory Report")
@@ -121,20 +311,35 @@ def main():
             lines.append(f"- {c}")
         lines.append("")
 
-    client = llm_client()
-    if client is None:
+    client = None if args.cache_only else llm_client()
+    if args.cache_only:
+        lines.append("> **Note:** --cache-only: showing cached LLM rewrites only (no API calls).\n")
+    elif client is None:
         lines.append("> **Note:** OPENAI_API_KEY not set; showing rule-based issues only (no LLM rewrites).\n")
 
+    cache = None
+    if not args.no_cache:
+        from sqlite_cache import SqliteCache
+        cache = SqliteCache(args.cache, max_entries=args.cache_max, ttl=args.cache_ttl_days * 86400)
+
+    model = os.getenv("LLM_MODEL","gpt-4o-mini")
+    failing = [x for x in per_req if x[2]]
+    suggestions = advise_all(client, model, failing, args.concurrency,
+                             RateLimiter(args.rpm, args.tpm), args.max_retries,
+                             cache=cache, cache_only=args.cache_only,
+                             batch_size=args.batch_size, batch_tokens=args.batch_tokens)
+    if cache is not None:
+        lines.append(f"_LLM response cache: {cache.hits} hit(s), {cache.misses} miss(es)_\n")
+        print(f"LLM response cache: {cache.hits} hit(s), {cache.misses} miss(es) ({args.cache})")
+        cache.close()
+
     lines.append("## Requirement-level advice")
-    for rid, r, issues in per_req:
-        if not issues:
-            continue
+    for (rid, r, issues), suggestion in zip(failing, suggestions):
         lines.append(f"### {rid}")
         lines.append(f"**Original**: {r.get('text','').strip()}")
         lines.append("**Issues:**")
         for i in issues:
             lines.append(f"- {i}")
-        suggestion = ask_llm(client, os.getenv("LLM_MODEL","gpt-4o-mini"), r, issues)
         if suggestion:
             lines.append("**LLM Suggestion:**")
             lines.append(suggestion)
@@ -0,0 +1,55 @@
+"""
+Built-in rule pack for req_lint.py. Team packs use the same shape as .yaml, .json or .py files
+(a .py pack defines TERMS and/or RULES) and are added with `req_lint.py --rules FILE`:
+
+  terms:                      # event -> whole-word phrases (case-insensitive, any whitespace between words)
+    pci: [cardholder data, pan]
+  rules:
+    - id: pci-scope           # a rule with a built-in id replaces it; new ids are reported after the built-ins
+      types: [nfr]            # requirement types it applies to (omit for every type)
+      when: [pci]             # fires only if all of these events were raised...
+      unless: [encryption, [control, encryption-scope]]   # ...and none of these (a list = all of them)
+      message: "cardholder data mentioned ({pci}) without encryption controls"   # {event}: its phrases
+    - id: owner
+      missing: owner          # fires when the requirement has no (or an empty) `owner` field
+
+Besides the term events, the scanner raises these from the numbers it reads:
+  number-unit    a number with a measurable unit (ms, s, %, rps, min, h, weeks, ...)
+  percent        a 2-3 digit percentage (99.9%)
+  nines          "3 nines" / "4 nines"
+  latency-value  a number in ms or seconds
+  throughput     a number in rps/qps/tps/req/s or requests per second (optionally k-prefixed)
+  comparator     <, <=, > or >= followed by a number
+The vague-term lexicon (VAGUE_WORDS plus --lexicon files) raises `vague`.
+"""
+
+TERMS = {
+    "availability": ["availability", "uptime"],
+    "latency": ["latency", "latencies", "response time", "response times", "responsetime", "responsetimes", "rt"],
+    "p95": ["p95"],
+    "p99": ["p99"],
+    "encryption": ["encrypt", "encryption"],
+    "encryption-scope": ["at rest", "in transit"],
+    "secure": ["secure", "secured", "securely", "insecure"],
+    "control": ["tls", "mtls", "https", "oauth2", "oidc", "kms", "aes", "fips"],
+    "rto": ["rto"],
+    "rpo": ["rpo"],
+    "error-rate": ["error rate", "error rates", "error-rate", "errorrate"],
+}
+
+# in report order
+RULES = [
+    {"id": "vague-wording", "when": ["vague"], "message": "vague wording: {vague}"},
+    {"id": "nfr-measurable", "types": ["nfr"], "unless": ["number-unit", ["p95", "comparator"], ["p99", "comparator"], "rto", "rpo"],
+     "message": "nfr missing measurable unit/metric (add ms/%/rps, RTO/RPO, or p95 comparator)"},
+    {"id": "availability-specific", "types": ["nfr"], "when": ["availability"], "unless": ["percent", "nines"],
+     "message": "availability mentioned without explicit percent or 'nines'"},
+    {"id": "latency-specific", "types": ["nfr"], "when": ["latency"], "unless": ["latency-value"],
+     "message": "latency/response-time mentioned without a number + unit (e.g., 300 ms)"},
+    {"id": "encryption-specific", "types": ["nfr"], "when": ["encryption"], "unless": ["encryption-scope"],
+     "message": "encryption mentioned; specify 'at rest' and/or 'in transit'"},
+    {"id": "security-specific", "types": ["nfr"], "when": ["secure"], "unless": ["control"],
+     "message": "security vague: reference concrete control (TLS/mTLS, OAuth2/OIDC, AES, KMS, etc.)"},
+    {"id": "func-acceptance", "types": ["func"], "missing": "acceptance",
+     "message": "functional requirement missing acceptance criteria"},
+]
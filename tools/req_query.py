@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+"""
+Query a requirement store (req_store.py) without re-parsing any package.
+
+Filters combine with AND and run on the store's indexes:
+  --match QUERY        FTS5 full-text query over text (words, "phrases", prefix*, OR / NOT)
+  --type / --priority / --category
+  --metric SPEC        a parsed metric target, e.g. "latency p95 < 200" (metric names and units as
+                       req_lint reads them: latency[ p95|p99] ms, availability %, throughput rps,
+                       rto / rpo minutes, error_rate %); repeatable
+  --missing FIELD      the field is absent or empty (e.g. acceptance); repeatable
+
+Usage:
+  python tools/req_query.py .cache/reqs.sqlite --type nfr --match payment --metric "latency p95 < 200"
+  python tools/req_query.py .cache/reqs.sqlite --type func --missing acceptance --count
+  python tools/req_query.py .cache/reqs.sqlite --priority H --format jsonl > high.jsonl   # a package for the other tools
+"""
+import argparse, json, re, sqlite3, sys
+import instrument
+from req_store import OPS, RequirementStore
+
+METRIC = re.compile(r"\s*([a-z][a-z0-9_ ]*?)\s*(<=|>=|<|>|=)\s*(\d+(?:\.\d+)?)\s*")
+
+def parse_metric(spec):
+    """'latency p95 < 200' -> ('latency p95', '<', 200.0)."""
+    m = METRIC.fullmatch(spec.lower())
+    if not m:
+        raise ValueError(f"bad --metric {spec!r}: expected 'METRIC OP NUMBER' with OP one of {' '.join(OPS)}")
+    return " ".join(m[1].split()), m[2], float(m[3])
+
+def main():
+    ap = argparse.ArgumentParser(description="Query a requirement store")
+    ap.add_argument("store", help="store built by req_store.py (.sqlite)")
+    ap.add_argument("--match", default=None, help="FTS5 full-text query over requirement text")
+    ap.add_argument("--type", default=None, choices=["func", "nfr"])
+    ap.add_argument("--priority", default=None, choices=["H", "M", "L"])
+    ap.add_argument("--category", default=None)
+    ap.add_argument("--metric", action="append", default=[], help='metric target filter, e.g. "latency p95 < 200"; repeatable')
+    ap.add_argument("--missing", action="append", default=[], help="field that must be absent or empty; repeatable")
+    ap.add_argument("--limit", type=int, default=None)
+    ap.add_argument("--count", action="store_true", help="print only the number of matches")
+    ap.add_argument("--format", choices=["text", "jsonl"], default="text", help="text: one line per requirement; jsonl: a package")
+    instrument.add_arguments(ap)
+    a = ap.parse_args()
+    tm = instrument.from_args("req_query", a)
+    try:
+        filters = {"match": a.match, "type": a.type, "priority": a.priority, "category": a.category,
+                   "metrics": [parse_metric(m) for m in a.metric], "missing": a.missing}
+        with RequirementStore(a.store, readonly=True) as st, tm.stage("query"):
+            if a.count:
+                print(st.count(**filters))
+                return
+            for r in st.query(limit=a.limit, **filters):
+                if a.format == "jsonl":
+                    print(json.dumps(r, ensure_ascii=False))
+                else:
+                    print(f"{r.get('id')} [{r.get('type') or '-'}/{r.get('priority') or '-'}] {r.get('text', '')}")
+    except (ValueError, FileNotFoundError, sqlite3.OperationalError) as e:  # bad filter, missing store, FTS syntax
+        sys.exit(f"req_query: {e}")
+
+if __name__ == "__main__":
+    main()
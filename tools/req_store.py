@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+"""
+Local SQLite requirement store: ingest packages once, then query them without re-parsing.
+
+Tables (one file, stdlib sqlite3 only):
+  requirements  one row per requirement id: type, priority, category, text, acceptance count and the
+                full requirement as JSON; indexed on (type, priority), category and (type, acceptance)
+  req_fts       FTS5 index over text (porter stemming: "payment" also finds "payments"), kept in sync by triggers
+  metrics       parsed metric targets (req_lint.metric_targets): metric, scope, value, indexed on
+                (metric, value). Values use req_lint's units: latency ms, availability %, throughput rps,
+                rto/rpo minutes, error_rate %
+Upserts are by requirement id: unchanged requirements are skipped, changed ones keep their position
+and get their FTS entry and metric rows replaced. Requirements come back in first-ingested order.
+meta records the req_lint version the metric rows were parsed with (req_lint.ruleset_hash); an upsert
+under another version re-parses the metrics of every stored requirement first.
+
+req_io reads a store like any package (.sqlite, .sqlite3 or .db), so req_lint.py,
+generate_mermaid_er.py and the other tools accept one in place of YAML; req_query.py filters it.
+
+Usage:
+  python tools/req_store.py .cache/reqs.sqlite samples/requirements.yaml [more packages...]
+"""
+import argparse, hashlib, json, pathlib, sqlite3, sys, uuid
+from itertools import islice
+import instrument
+from req_io import iter_package
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS requirements (
+  rid INTEGER PRIMARY KEY, id TEXT NOT NULL UNIQUE, type TEXT, priority TEXT, category TEXT,
+  text TEXT NOT NULL, acceptance INTEGER NOT NULL, doc TEXT NOT NULL, hash TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS requirements_type ON requirements(type, priority);
+CREATE INDEX IF NOT EXISTS requirements_category ON requirements(category);
+CREATE INDEX IF NOT EXISTS requirements_acceptance ON requirements(type, acceptance);
+CREATE VIRTUAL TABLE IF NOT EXISTS req_fts USING fts5(text, content='requirements', content_rowid='rid', tokenize='porter unicode61');
+CREATE TRIGGER IF NOT EXISTS requirements_ai AFTER INSERT ON requirements BEGIN
+  INSERT INTO req_fts(rowid, text) VALUES (new.rid, new.text); END;
+CREATE TRIGGER IF NOT EXISTS requirements_au AFTER UPDATE OF text ON requirements BEGIN
+  INSERT INTO req_fts(req_fts, rowid, text) VALUES ('delete', old.rid, old.text);
+  INSERT INTO req_fts(rowid, text) VALUES (new.rid, new.text); END;
+CREATE TABLE IF NOT EXISTS metrics (req INTEGER NOT NULL, metric TEXT NOT NULL, scope TEXT NOT NULL, value REAL NOT NULL);
+CREATE INDEX IF NOT EXISTS metrics_value ON metrics(metric, value);
+CREATE INDEX IF NOT EXISTS metrics_req ON metrics(req);
+"""
+OPS = ("<", "<=", ">", ">=", "=")
+
+class RequirementStore:
+    def __init__(self, path, readonly=False):
+        p = pathlib.Path(path)
+        if readonly:
+            if not p.exists():
+                raise FileNotFoundError(f"no requirement store at {path}")
+            self.db = sqlite3.connect(f"{p.resolve().as_uri()}?mode=ro", uri=True)
+            return
+        p.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(p))
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        with self.db:
+            self.db.executescript(SCHEMA)
+            self.db.execute("INSERT OR IGNORE INTO meta VALUES ('store', ?)", (uuid.uuid4().hex,))
+            self.db.execute("INSERT OR IGNORE INTO meta VALUES ('revision', '0')")
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM requirements").fetchone()[0]
+
+    def fingerprint(self):
+        """Changes whenever an upsert changes the store (a cache key for its contents)."""
+        return ":".join(v for _, v in self.db.execute("SELECT key, value FROM meta WHERE key IN ('store', 'revision') ORDER BY key"))
+
+    def upsert(self, reqs, batch=5000):
+        """Add or update requirements by id; returns {"added", "updated", "unchanged"}."""
+        import req_lint
+        stats = {"added": 0, "updated": 0, "unchanged": 0}
+        it = iter(reqs)
+        with self.db:
+            reparsed = self._refresh_metrics(req_lint, batch)
+            self.next_rid = self.db.execute("SELECT coalesce(max(rid), 0) + 1 FROM requirements").fetchone()[0]
+            while chunk := list(islice(it, batch)):
+                self._upsert_chunk(chunk, stats, req_lint)
+            if reparsed or stats["added"] or stats["updated"]:
+                self.db.execute("UPDATE meta SET value = CAST(value AS INTEGER) + 1 WHERE key = 'revision'")
+        return stats
+
+    def _refresh_metrics(self, rl, batch):
+        """Re-parse every stored requirement's metric rows when req_lint changed since they were parsed."""
+        version = rl.ruleset_hash()
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'metrics'").fetchone()
+        if row is not None and row[0] == version:
+            return False
+        self.db.execute("DELETE FROM metrics")
+        docs, reparsed = self.db.execute("SELECT rid, doc FROM requirements"), False
+        while rows := docs.fetchmany(batch):
+            reparsed, metrics = True, []
+            for rid, doc in rows:
+                r = json.loads(doc)
+                scope = rl.requirement_scope(r)
+                metrics += [(rid, m, scope, v) for m, v in rl.metric_targets(r) if v is not None]
+            self.db.executemany("INSERT INTO metrics VALUES (?, ?, ?, ?)", metrics)
+        self.db.execute("INSERT OR REPLACE INTO meta VALUES ('metrics', ?)", (version,))
+        return reparsed
+
+    def _upsert_chunk(self, chunk, stats, rl):
+        latest = {}
+        for r in chunk:
+            if not isinstance(r.get("id"), str) or not r["id"]:
+                raise ValueError(f"requirement without an id: {str(r)[:80]}")
+            latest[r["id"]] = r  # a repeated id: the last one wins
+        known, ids = {}, list(latest)
+        for lo in range(0, len(ids), 500):
+            part = ids[lo:lo + 500]
+            known.update((i, (rid, h)) for rid, i, h in
+                         self.db.execute(f"SELECT rid, id, hash FROM requirements WHERE id IN ({','.join('?' * len(part))})", part))
+        new, changed, metrics = [], [], []
+        for i, r in latest.items():
+            doc = json.dumps(r, ensure_ascii=False, default=str)
+            h = hashlib.blake2b(doc.encode("utf-8"), digest_size=16).hexdigest()
+            old = known.get(i)
+            if old is not None and old[1] == h:
+                stats["unchanged"] += 1
+                continue
+            if old is None:
+                rid = self.next_rid; self.next_rid += 1
+            else:
+                rid = old[0]
+            (changed if old else new).append((i, r.get("type"), r.get("priority"), r.get("category"), r.get("text") or "",
+                                              len(r.get("acceptance") or ()), doc, h, rid))
+            scope = rl.requirement_scope(r)
+            metrics += [(rid, m, scope, v) for m, v in rl.metric_targets(r) if v is not None]
+        db = self.db
+        db.executemany("INSERT INTO requirements (id, type, priority, category, text, acceptance, doc, hash, rid)"
+                       " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", new)
+        db.executemany("UPDATE requirements SET id=?, type=?, priority=?, category=?, text=?, acceptance=?, doc=?, hash=? WHERE rid=?", changed)
+        db.executemany("DELETE FROM metrics WHERE req=?", [(row[-1],) for row in changed])
+        db.executemany("INSERT INTO metrics VALUES (?, ?, ?, ?)", metrics)
+        stats["added"] += len(new); stats["updated"] += len(changed)
+
+    def _where(self, match=None, type=None, priority=None, category=None, metrics=(), missing=()):
+        # row-id sets (metric ranges, then full-text) are intersected and drive the query; the column
+        # tests are then checked per row (unary +), or use their indexes when there is no set
+        sets, set_args, where, args = [], [], [], []
+        for metric, op, value in metrics:
+            if op not in OPS:
+                raise ValueError(f"unknown comparison {op!r} (one of {' '.join(OPS)})")
+            sets.append(f"SELECT req FROM metrics WHERE metric = ? AND value {op} ?"); set_args += [metric, value]
+        if match:
+            sets.append("SELECT rowid FROM req_fts WHERE req_fts MATCH ?"); set_args.append(match)
+        col = "+" if sets else ""
+        for name, v in (("type", type), ("priority", priority), ("category", category)):
+            if v is not None:
+                where.append(f"{col}{name} = ?"); args.append(v)
+        for field in missing:
+            if field == "acceptance":
+                where.append(f"{col}acceptance = 0")
+            else:  # absent, null or empty
+                where.append("coalesce(json_extract(doc, ?), '') IN ('', '[]', '{}')"); args.append(f'$."{field}"')
+        if sets:
+            where.insert(0, f"rid IN ({' INTERSECT '.join(sets)})"); args = set_args + args
+        return (" WHERE " + " AND ".join(where)) if where else "", args
+
+    def query(self, limit=None, **filters):
+        """Requirements (dicts, store order) matching every filter: match (an FTS5 query over text), type,
+        priority, category, metrics ((metric, op, value) triples, e.g. ("latency p95", "<", 200)) and
+        missing (fields that must be absent or empty)."""
+        where, args = self._where(**filters)
+        sql = f"SELECT doc FROM requirements{where} ORDER BY rid"
+        if limit is not None:
+            sql += " LIMIT ?"; args.append(limit)
+        for (doc,) in self.db.execute(sql, args):
+            yield json.loads(doc)
+
+    def count(self, **filters):
+        where, args = self._where(**filters)
+        return self.db.execute(f"SELECT COUNT(*) FROM requirements{where}", args).fetchone()[0]
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def main():
+    ap = argparse.ArgumentParser(description="Ingest requirement packages into a SQLite store (upsert by id)")
+    ap.add_argument("store", help="store file (.sqlite); created if missing")
+    ap.add_argument("packages", nargs="+", help="requirement packages (.yaml, .jsonl or .msgpack)")
+    instrument.add_arguments(ap)
+    a = ap.parse_args()
+    tm = instrument.from_args("req_store", a)
+    with RequirementStore(a.store) as st:
+        for pkg in a.packages:
+            with tm.stage("upsert"):
+                s = st.upsert(iter_package(pkg))
+            print(f"{pkg}: {s['added']} added, {s['updated']} updated, {s['unchanged']} unchanged", file=sys.stderr)
+        print(f"Wrote {a.store} ({len(st)} requirements)")
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,107 @@
 #!/usr/bin/env python
-import argparse, json, yaml, jsonschema, pathlib
+"""
+Schema validation for requirement packages.
+
+- The schema is checked and compiled once; every error is reported with its JSON path
+  (no stop-at-first-error).
+- Each requirement is validated on its own against the schema's item definition, so .jsonl
+  packages stream through one record at a time in constant memory.
+- --lint runs req_lint's rules and conflict index in the same pass over the file.
+Exit code: 1 if any schema error (or, with --lint, any lint issue) was found.
+"""
+import argparse, json, sys, pathlib
+from collections import defaultdict
+import instrument
+from req_io import iter_package, load_package, package_format
+
+def compile_validators(schema):
+    """(package validator, per-requirement validator) built once from the package schema."""
+    import jsonschema  # ~90 ms of imports; not paid by --help or argument errors
+    cls = jsonschema.validators.validator_for(schema)
+    cls.check_schema(schema)
+    item = schema.get("properties", {}).get("requirements", {}).get("items", {})
+    return cls(schema), cls(item)
+
+def _path(prefix, err):
+    return "/" + "/".join(str(p) for p in [*prefix, *err.absolute_path])
+
+def iter_records(p):
+    """Yield ("doc", error) for package-level problems, then ("req", requirement) for each record."""
+    if package_format(p) in ("jsonl", "sqlite"):  # streamed
+        yield from (("req", r) for r in iter_package(p))
+        return
+    yield from _records_from_data(load_package(p))
+
+def _records_from_data(data):
+    reqs = data.get("requirements") if isinstance(data, dict) else None
+    if isinstance(reqs, list):
+        yield "doc", {**data, "requirements": []}
+        yield from (("req", r) for r in reqs)
+    else:
+        yield "doc", data
+
+def validate_package(p, schema, on_record=None):
+    """Yield (path, message) for every schema error. on_record(r) sees each requirement that passed
+    the schema as it streams past (e.g., to lint it in the same pass)."""
+    return _validate_records(iter_records(p), schema, on_record)
+
+def validate_data(data, schema, on_record=None):
+    """validate_package() for a package dict already in memory."""
+    return _validate_records(_records_from_data(data), schema, on_record)
+
+def _validate_records(records, schema, on_record):
+    doc_v, item_v = compile_validators(schema)
+    i = 0
+    for kind, obj in records:
+        if kind == "doc":
+            for err in doc_v.iter_errors(obj):
+                yield _path((), err), err.message
+            continue
+        errors = sorted(item_v.iter_errors(obj), key=lambda e: list(map(str, e.absolute_path)))
+        for err in errors:
+            yield _path(("requirements", i), err), err.message
+        if on_record is not None and not errors:  # lint sees only records it can read (text a string, ...)
+            on_record(obj)
+        i += 1
+
 if __name__=="__main__":
     ap=argparse.ArgumentParser()
-    ap.add_argument("yaml_file"); ap.add_argument("--schema", default="tools/req_schema.json")
+    ap.add_argument("yaml_file", help="requirements package (.yaml, .jsonl or .msgpack)")
+    ap.add_argument("--schema", default="tools/req_schema.json")
+    ap.add_argument("--lint", action="store_true", help="also run req_lint rules in the same pass")
+    ap.add_argument("--max-errors", type=int, default=0, help="stop after N schema errors (0 = report all)")
+    instrument.add_arguments(ap)
     a=ap.parse_args()
-    schema=json.loads(pathlib.Path(a.schema).read_text())
-    data=yaml.safe_load(pathlib.Path(a.yaml_file).read_text())
-    jsonschema.validate(data, schema)
-    print("Schema validation: OK")
+    tm=instrument.from_args("req_validate", a)
+    with tm.stage("schema"):
+        schema=json.loads(pathlib.Path(a.schema).read_text())
+
+    on_record=None
+    if a.lint:
+        import req_lint as rl
+        if tm.enabled: rl.time_rules(tm)
+        results=[]; index=defaultdict(list)
+        def on_record(r):
+            issues=rl.lint_req(r, index)  # one scan feeds the rules and the conflict index
+            if issues: results.append((r.get("id","?"), issues))
+
+    n=0
+    with tm.stage("validate"):  # parsing, validation and --lint rules all happen in this one pass
+        for path, msg in validate_package(a.yaml_file, schema, on_record):
+            if n == 0: print("Schema validation: FAILED")
+            n+=1
+            print(f"- {path}: {msg}")
+            if a.max_errors and n >= a.max_errors:
+                print(f"(stopped after {n} errors)")
+                break
+    if n == 0:
+        print("Schema validation: OK")
+
+    lint_failed=False
+    if a.lint and not (a.max_errors and n >= a.max_errors):
+        with tm.stage("conflicts"):
+            conflicts=rl.conflicts_from_index(index)
+        lint_failed=bool(results or conflicts)
+        print(rl.render_text(results, conflicts) if lint_failed else "Lints: OK")
+    if n or lint_failed:
+        sys.exit(1)
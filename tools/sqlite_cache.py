@@ -0,0 +1,81 @@
+"""
+Small persistent key -> JSON cache on SQLite, shared by the lint tools.
+
+- LRU eviction: entries beyond max_entries are dropped oldest-used first (on close/evict()).
+- Optional TTL: entries older than ttl seconds count as misses.
+- hits/misses counters for reporting.
+- Safe to share between threads (one connection guarded by a lock).
+"""
+import json, pathlib, sqlite3, threading, time
+
+class SqliteCache:
+    def __init__(self, path, max_entries=100_000, ttl=None):
+        self.path = pathlib.Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = self.misses = 0
+        self.lock = threading.RLock()
+        self.db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                        "created REAL NOT NULL, used REAL NOT NULL)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS cache_used ON cache(used)")
+
+    def _fresh(self, created, now):
+        return self.ttl is None or now - created <= self.ttl
+
+    def get(self, key):
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys):
+        """Return {key: value} for keys present (and not expired); bumps their LRU stamp."""
+        keys = list(dict.fromkeys(keys))
+        now = time.time(); found = {}
+        with self.lock:
+            for i in range(0, len(keys), 500):
+                part = keys[i:i+500]
+                q = f"SELECT key, value, created FROM cache WHERE key IN ({','.join('?' * len(part))})"
+                for k, v, created in self.db.execute(q, part):
+                    if self._fresh(created, now):
+                        found[k] = json.loads(v)
+            if found:
+                self.db.executemany("UPDATE cache SET used=? WHERE key=?", [(now, k) for k in found])
+                self.db.commit()
+            self.hits += len(found); self.misses += len(keys) - len(found)
+        return found
+
+    def put(self, key, value):
+        self.put_many([(key, value)])
+
+    def put_many(self, items):
+        now = time.time()
+        rows = [(k, json.dumps(v, ensure_ascii=False), now, now) for k, v in items]
+        with self.lock:
+            self.db.executemany("INSERT OR REPLACE INTO cache(key, value, created, used) VALUES (?,?,?,?)", rows)
+            self.db.commit()
+
+    def __len__(self):
+        with self.lock:
+            return self.db.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def evict(self):
+        """Drop expired entries, then least-recently-used ones beyond max_entries."""
+        with self.lock:
+            if self.ttl is not None:
+                self.db.execute("DELETE FROM cache WHERE created < ?", (time.time() - self.ttl,))
+            extra = len(self) - self.max_entries
+            if extra > 0:
+                self.db.execute("DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY used LIMIT ?)", (extra,))
+            self.db.commit()
+
+    def close(self):
+        self.evict()
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()